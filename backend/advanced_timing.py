@@ -1,8 +1,83 @@
 import math
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import swisseph as swe
 
+from astrological_calculator import calculator_from_params
+from chart_sections import LazySections
+from date_chunks import split_range, map_chunks
+
+
+# Mahadasha rulers and years
+DASHA_SEQUENCE = [
+    ('ketu', 7), ('venus', 20), ('sun', 6), ('moon', 10),
+    ('mars', 7), ('rahu', 18), ('jupiter', 16), ('saturn', 19),
+    ('mercury', 17)
+]
+LAHIRI_AYANAMSA = 24.12  # Lahiri ayanamsa for 1988 (simplified)
+NAKSHATRA_SPAN = 13.333333
+
+
+def vimshottari_mahadashas(moon_tropical: float, birth_datetime: datetime, until: datetime) -> List[Dict[str, Any]]:
+    """Mahadasha timeline from the natal Moon's nakshatra, running past `until`"""
+    # Get Moon's position in sidereal zodiac
+    moon_sidereal = moon_tropical - LAHIRI_AYANAMSA
+    if moon_sidereal < 0:
+        moon_sidereal += 360
+
+    # Calculate nakshatra (27 lunar mansions)
+    nakshatra = int(moon_sidereal / NAKSHATRA_SPAN)
+    nakshatra_degree = moon_sidereal % NAKSHATRA_SPAN
+
+    # Starting dasha based on nakshatra
+    nakshatra_rulers = [ruler for ruler, _ in DASHA_SEQUENCE] * 3
+    starting_ruler = nakshatra_rulers[nakshatra]
+
+    # Calculate elapsed portion of first dasha
+    first_dasha_index = next(i for i, (ruler, _) in enumerate(DASHA_SEQUENCE)
+                            if ruler == starting_ruler)
+    first_dasha_years = DASHA_SEQUENCE[first_dasha_index][1]
+    elapsed_portion = nakshatra_degree / NAKSHATRA_SPAN
+    remaining_years = first_dasha_years * (1 - elapsed_portion)
+
+    # Build dasha timeline
+    dashas = []
+    current_dasha_end = birth_datetime + timedelta(days=remaining_years * 365.25)
+
+    dashas.append({
+        'mahadasha': starting_ruler,
+        'start': birth_datetime,
+        'end': current_dasha_end,
+        'years': remaining_years
+    })
+
+    # Add subsequent dashas
+    dasha_index = (first_dasha_index + 1) % 9
+    while current_dasha_end < until:
+        ruler, years = DASHA_SEQUENCE[dasha_index]
+        start = current_dasha_end
+        end = start + timedelta(days=years * 365.25)
+        dashas.append({
+            'mahadasha': ruler,
+            'start': start,
+            'end': end,
+            'years': years
+        })
+        current_dasha_end = end
+        dasha_index = (dasha_index + 1) % 9
+
+    return dashas
+
+
+@lru_cache(maxsize=32)
+def _timing_from_params(birth_params: tuple) -> 'AdvancedTimingTechniques':
+    return AdvancedTimingTechniques(calculator_from_params(birth_params))
+
+
+def _composite_chunk(birth_params: tuple, eclipses: List[Dict[str, Any]], dates: List[datetime]) -> List[Dict[str, Any]]:
+    return _timing_from_params(birth_params)._composite_days(dates, eclipses)
+
 
 class AdvancedTimingTechniques:
     """
@@ -90,10 +165,7 @@ class AdvancedTimingTechniques:
         planets = self.natal_planets
         houses = self.natal_houses
 
-        is_day_birth = planets['sun']['longitude'] > houses['asc'] or \
-                      planets['sun']['longitude'] < houses['asc'] - 180
-
-        if is_day_birth:
+        if self.calc.is_day_birth():
             spirit = houses['asc'] + planets['sun']['longitude'] - \
                     planets['moon']['longitude']
         else:
@@ -172,61 +244,8 @@ class AdvancedTimingTechniques:
         else:
             current_date = datetime.strptime(current_date, "%Y-%m-%d")
 
-        # Get Moon's position in sidereal zodiac
-        moon_tropical = self.natal_planets['moon']['longitude']
-        ayanamsa = 24.12  # Lahiri ayanamsa for 1988 (simplified)
-        moon_sidereal = moon_tropical - ayanamsa
-        if moon_sidereal < 0:
-            moon_sidereal += 360
-
-        # Calculate nakshatra (27 lunar mansions)
-        nakshatra = int(moon_sidereal / 13.333333)
-        nakshatra_degree = moon_sidereal % 13.333333
-
-        # Mahadasha rulers and years
-        dasha_sequence = [
-            ('ketu', 7), ('venus', 20), ('sun', 6), ('moon', 10),
-            ('mars', 7), ('rahu', 18), ('jupiter', 16), ('saturn', 19),
-            ('mercury', 17)
-        ]
-
-        # Starting dasha based on nakshatra
-        nakshatra_rulers = ['ketu', 'venus', 'sun', 'moon', 'mars', 'rahu',
-                           'jupiter', 'saturn', 'mercury'] * 3
-        starting_ruler = nakshatra_rulers[nakshatra]
-
-        # Calculate elapsed portion of first dasha
-        first_dasha_index = next(i for i, (ruler, _) in enumerate(dasha_sequence)
-                                if ruler == starting_ruler)
-        first_dasha_years = dasha_sequence[first_dasha_index][1]
-        elapsed_portion = nakshatra_degree / 13.333333
-        remaining_years = first_dasha_years * (1 - elapsed_portion)
-
-        # Build dasha timeline
-        dashas = []
-        current_dasha_end = self.calc.birth_datetime + timedelta(days=remaining_years * 365.25)
-
-        dashas.append({
-            'mahadasha': starting_ruler,
-            'start': self.calc.birth_datetime,
-            'end': current_dasha_end,
-            'years': remaining_years
-        })
-
-        # Add subsequent dashas
-        dasha_index = (first_dasha_index + 1) % 9
-        while current_dasha_end < current_date + timedelta(days=365*10):  # Next 10 years
-            ruler, years = dasha_sequence[dasha_index]
-            start = current_dasha_end
-            end = start + timedelta(days=years * 365.25)
-            dashas.append({
-                'mahadasha': ruler,
-                'start': start,
-                'end': end,
-                'years': years
-            })
-            current_dasha_end = end
-            dasha_index = (dasha_index + 1) % 9
+        dashas = vimshottari_mahadashas(self.natal_planets['moon']['longitude'], self.calc.birth_datetime,
+                                        current_date + timedelta(days=365*10))  # Next 10 years
 
         # Find current dasha and calculate antardasha
         current_dasha = None
@@ -238,13 +257,21 @@ class AdvancedTimingTechniques:
         # Calculate antardasha (sub-period)
         antardashas = self._calculate_antardasha(current_dasha, current_date)
 
-        return {
+        result = {
             'current_mahadasha': current_dasha,
             'current_antardasha': antardashas['current'],
             'next_antardashas': antardashas['upcoming'],
             'all_dashas': dashas
         }
 
+        if self.calc.tier['sub_period_timelines']:
+            # Every antardasha of every mahadasha
+            result['antardasha_timeline'] = [
+                {'mahadasha': dasha['mahadasha'], 'antardashas': self._calculate_antardasha(dasha, current_date)['all']}
+                for dasha in dashas
+            ]
+        return result
+
     def _calculate_antardasha(self, mahadasha, current_date):
         """Calculate sub-periods within mahadasha"""
         dasha_years = {
@@ -286,7 +313,8 @@ class AdvancedTimingTechniques:
 
         return {
             'current': current_antardasha,
-            'upcoming': upcoming
+            'upcoming': upcoming,
+            'all': antardashas
         }
 
     def calculate_chara_dasha(self):
@@ -318,10 +346,7 @@ class AdvancedTimingTechniques:
             current_date = datetime.strptime(current_date, "%Y-%m-%d")
 
         # Day or night birth determines sequence
-        is_day_birth = self.natal_planets['sun']['longitude'] > self.natal_houses['asc'] or \
-                      self.natal_planets['sun']['longitude'] < self.natal_houses['asc'] - 180
-
-        if is_day_birth:
+        if self.calc.is_day_birth():
             sequence = [
                 ('sun', 10), ('venus', 8), ('mercury', 13), ('moon', 9),
                 ('saturn', 11), ('jupiter', 12), ('mars', 7),
@@ -350,7 +375,7 @@ class AdvancedTimingTechniques:
                     planet, years, years_into_period
                 )
 
-                return {
+                result = {
                     'major_period': planet,
                     'years_in': years_into_period,
                     'years_remaining': years_remaining,
@@ -358,10 +383,38 @@ class AdvancedTimingTechniques:
                     'period_years': years,
                     'sequence': sequence
                 }
+
+                if self.calc.tier['sub_period_timelines']:
+                    result['timeline'] = self._firdaria_timeline(sequence)
+                return result
             current_years += years
 
         return None
 
+    def _firdaria_timeline(self, sequence):
+        """Dated major periods with all seven sub-periods (the nodes have none)"""
+        timeline = []
+        start_years = 0
+        for planet, years in sequence:
+            sub_periods = []
+            sub_count = 7 if planet not in ('north_node', 'south_node') else 0
+            for position in range(sub_count):
+                sub = self._calculate_firdaria_subperiod(planet, years, position * years / 7)
+                sub_start = start_years + position * years / 7
+                sub_periods.append({
+                    'ruler': sub['ruler'],
+                    'start': self.calc.birth_datetime + timedelta(days=sub_start * 365.25),
+                    'end': self.calc.birth_datetime + timedelta(days=(sub_start + years / 7) * 365.25)
+                })
+            timeline.append({
+                'major_period': planet,
+                'start': self.calc.birth_datetime + timedelta(days=start_years * 365.25),
+                'end': self.calc.birth_datetime + timedelta(days=(start_years + years) * 365.25),
+                'sub_periods': sub_periods
+            })
+            start_years += years
+        return timeline
+
     def _calculate_firdaria_subperiod(self, major_planet, total_years, years_in):
         """Each Firdaria divided into 7 sub-periods"""
         planets = ['sun', 'venus', 'mercury', 'moon', 'saturn', 'jupiter', 'mars']
@@ -616,39 +669,38 @@ class AdvancedTimingTechniques:
 
     def _is_aspect_applying(self, prog_data, natal_data, target_angle):
         """Check if progressed aspect is applying or separating"""
-        # Simplified - would need to calculate future positions
-        return True  # Placeholder
-
-    def composite_timing_analysis(self, date_range_start, date_range_end):
-        """
-        Combine multiple timing techniques for comprehensive analysis
-        Weight different factors for pattern recognition
-        """
-        start = datetime.strptime(date_range_start, "%Y-%m-%d")
-        end = datetime.strptime(date_range_end, "%Y-%m-%d")
-
+        # Natal points are fixed, so the orb shrinks when the progressed
+        # body's motion carries the separation towards the aspect angle
+        separation = (prog_data['longitude'] - natal_data['longitude'] + 180) % 360 - 180
+        deviation = abs(separation) - target_angle
+        rate = math.copysign(1, separation) * prog_data.get('speed', 0.0)
+        return deviation * rate < 0
+
+    def _composite_days(self, dates: List[datetime], eclipses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Timing factors and intensity score for each date, in order"""
+        profections = self.calculate_annual_profections()
         analysis = []
 
-        current = start
-        while current <= end:
+        for current in dates:
             date_str = current.strftime("%Y-%m-%d")
+            transits = self.calc.calculate_transits(date_str, self.natal_planets)
+            firdaria = self.calculate_firdaria(date_str)
 
             # Collect all timing factors
             factors = {
                 'date': date_str,
-                'transits': len(self.calc.calculate_transits(date_str)),
-                'profection_activated': self.calculate_annual_profections(),
+                'transits': len(transits),
+                'profection_activated': profections,
                 'progressions': len(self.calculate_progressed_angles(date_str)),
                 'dasha': self.calculate_vimshottari_dasha(date_str)['current_mahadasha']['mahadasha'],
-                'firdaria': self.calculate_firdaria(date_str)['major_period'] if self.calculate_firdaria(date_str) else None
+                'firdaria': firdaria['major_period'] if firdaria else None
             }
 
             # Calculate composite score
             score = 0
 
             # Weight hard transits heavily
-            hard_transits = [t for t in self.calc.calculate_transits(date_str)
-                            if t['aspect'] in ['square', 'opposition']]
+            hard_transits = [t for t in transits if t['aspect'] in ['square', 'opposition']]
             score += len(hard_transits) * 3
 
             # Add malefic time lords
@@ -659,7 +711,6 @@ class AdvancedTimingTechniques:
                 score += 4
 
             # Check for eclipse proximity
-            eclipses = self.calculate_eclipse_sensitivity()
             for eclipse in eclipses:
                 if abs((eclipse['date'] - current).days) < 30:
                     score += 10
@@ -667,12 +718,41 @@ class AdvancedTimingTechniques:
             factors['intensity_score'] = score
             analysis.append(factors)
 
-            current += timedelta(days=1)
+        return analysis
 
-        # Sort by intensity score
+    def composite_timing_analysis(self, date_range_start, date_range_end):
+        """
+        Combine multiple timing techniques for comprehensive analysis
+        Weight different factors for pattern recognition
+        """
+        start = datetime.strptime(date_range_start, "%Y-%m-%d")
+        end = datetime.strptime(date_range_end, "%Y-%m-%d")
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+        # Computed once here so every chunk scores against the same eclipse list
+        eclipses = self.calculate_eclipse_sensitivity()
+
+        # Days are independent: long ranges are scored in chunks across the worker pool;
+        # chunks come back in date order, so the merged list matches a serial run
+        analysis = []
+        for days in map_chunks(_composite_chunk, split_range(dates), self.calc.birth_params, eclipses):
+            analysis.extend(days)
+
+        # Sort by intensity score (stable: equal scores stay in date order)
         analysis.sort(key=lambda x: x['intensity_score'], reverse=True)
 
         return {
             'peak_intensity_dates': analysis[:10],  # Top 10 most intense
             'full_analysis': analysis
-        }
\ No newline at end of file
+        }
+
+    def analysis_sections(self, target_date: str) -> LazySections:
+        """Sections of the full advanced analysis, each computed only when requested"""
+        return (LazySections()
+                .add('annual_profections', self.calculate_annual_profections)
+                .add('zodiacal_releasing', lambda: self.calculate_zodiacal_releasing(target_date=target_date))
+                .add('vimshottari_dasha', lambda: self.calculate_vimshottari_dasha(target_date))
+                .add('firdaria', lambda: self.calculate_firdaria(target_date))
+                .add('saturn_returns', lambda: self.calculate_planetary_returns('saturn', 10))
+                .add('eclipse_sensitivity', lambda: self.calculate_eclipse_sensitivity(2))
+                .add('progressed_angles', lambda: self.calculate_progressed_angles(target_date)))
@@ -12,19 +12,33 @@ from chinese_zodiac_service import get_chinese_zodiac
 ephe_path = os.path.join(os.path.dirname(__file__), 'ephe')
 swe.set_ephe_path(ephe_path)
 
+# Bounds on the forensic scan: window length in days and aspect orb in degrees
+MAX_WINDOW_DAYS = 3650
+MAX_ORB = 10.0
+
 app = Flask(__name__)
 CORS(app)
 
- @app.route('/api/health', methods=['GET'])
+@app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({"status": "ok"})
 
- @app.route('/api/analysis', methods=['POST'])
+@app.route('/api/analysis', methods=['POST'])
 def get_analysis():
     data = request.get_json()
     if not data or 'date' not in data:
         return jsonify({"error": "Missing birth date"}), 400
 
+    try:
+        window_days = int(data.get('window_days', 365))
+        orb = float(data.get('orb', 5))
+    except (TypeError, ValueError):
+        return jsonify({"error": "window_days and orb must be numbers"}), 400
+    if not 1 <= window_days <= MAX_WINDOW_DAYS:
+        return jsonify({"error": f"window_days must be between 1 and {MAX_WINDOW_DAYS}"}), 400
+    if not 0 < orb <= MAX_ORB:
+        return jsonify({"error": f"orb must be greater than 0 and at most {MAX_ORB:g}"}), 400
+
     try:
         # Date and Time
         birth_date_str = data['date']
@@ -45,10 +59,10 @@ def get_analysis():
         life_path_number = calculate_life_path_number(year, month, day)
 
         # Chinese Zodiac Calculation
-        chinese_zodiac = get_chinese_zodiac(year)
+        chinese_zodiac = get_chinese_zodiac(year, month, day)
 
         # Forensic Astrology Calculation
-        forensic_analysis = calculate_forensic_astrology(jd)
+        forensic_analysis = calculate_forensic_astrology(jd, window_days, orb)
 
         # Combine results
         analysis = {
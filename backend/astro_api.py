@@ -1,15 +1,24 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime, timezone
-import pytz
+from typing import Optional, List, Union
 import swisseph as swe
 import os
+import threading
+
+from gazetteer import utc_offset_hours
 
 EPHE_PATH = os.getenv("EPHE_PATH", "./ephemeris")
 swe.set_ephe_path(EPHE_PATH)
 
+# Swiss Ephemeris settings are thread-local and sync endpoints run in a threadpool
+_thread_state = threading.local()
+
+def _use_ephe_path():
+    if getattr(_thread_state, "ephe_path", None) != EPHE_PATH:
+        swe.set_ephe_path(EPHE_PATH)
+        _thread_state.ephe_path = EPHE_PATH
+
 app = FastAPI(title="Fate Shift Ephemeris API")
 
 app.add_middleware(
@@ -28,39 +37,41 @@ class When(BaseModel):
     tz: Optional[str] = None  # e.g., "America/New_York"
 
 def to_ut_jd(w: When) -> float:
-    hour = int(w.hour)
-    minute = int(round((w.hour - hour) * 60))
     if w.tz:
-        tz = pytz.timezone(w.tz)
-        dt_local = tz.localize(datetime(w.year, w.month, w.day, hour, minute, 0))
-        dt_utc = dt_local.astimezone(timezone.utc)
-        ut_hour = dt_utc.hour + dt_utc.minute/60 + dt_utc.second/3600
-        return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, ut_hour)
+        # offsets come from a cached zoneinfo lookup; julday normalizes hours outside 0-24
+        hour = int(w.hour)
+        offset = utc_offset_hours(w.tz, w.year, w.month, w.day, min(hour, 23), int((w.hour - hour) * 60))
+        return swe.julday(w.year, w.month, w.day, w.hour - offset)
     else:
         # treat given hour as already UT
         return swe.julday(w.year, w.month, w.day, w.hour)
 
 FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED  # Swiss eph + speeds
 
+# Map common names
+NAME_MAP = {
+    "SUN": swe.SUN, "MOON": swe.MOON, "MERCURY": swe.MERCURY,
+    "VENUS": swe.VENUS, "MARS": swe.MARS, "JUPITER": swe.JUPITER,
+    "SATURN": swe.SATURN, "URANUS": swe.URANUS, "NEPTUNE": swe.NEPTUNE,
+    "PLUTO": swe.PLUTO, "CHIRON": swe.CHIRON, "CERES": swe.CERES,
+    "PALLAS": swe.PALLAS, "JUNO": swe.JUNO, "VESTA": swe.VESTA,
+}
+
+MAX_POSITIONS = 200_000  # bodies x times per /positions request
+COVERAGE_PROBE_YEARS = 600  # .se1 files each span 600 years
+
 @app.get("/health")
 def health():
     return {"status": "ok", "ephe_path": EPHE_PATH}
 
 @app.post("/planet/{name}")
 def planet(name: str, when: When):
+    _use_ephe_path()
     jd = to_ut_jd(when)
     name_upper = name.upper()
-    # Map common names
-    name_map = {
-        "SUN": swe.SUN, "MOON": swe.MOON, "MERCURY": swe.MERCURY,
-        "VENUS": swe.VENUS, "MARS": swe.MARS, "JUPITER": swe.JUPITER,
-        "SATURN": swe.SATURN, "URANUS": swe.URANUS, "NEPTUNE": swe.NEPTUNE,
-        "PLUTO": swe.PLUTO, "CHIRON": swe.CHIRON, "CERES": swe.CERES,
-        "PALLAS": swe.PALLAS, "JUNO": swe.JUNO, "VESTA": swe.VESTA,
-    }
-    if name_upper not in name_map:
+    if name_upper not in NAME_MAP:
         raise HTTPException(400, f"Unknown planet/asteroid name: {name}")
-    pos, _ = swe.calc_ut(jd, name_map[name_upper], FLAGS)
+    pos, _ = swe.calc_ut(jd, NAME_MAP[name_upper], FLAGS)
     return {"jd": jd, "name": name_upper, "lon": pos[0], "lat": pos[1], "dist": pos[2],
             "speed_lon": pos[3]}
 
@@ -68,6 +79,7 @@ def planet(name: str, when: When):
 def asteroid(minor_number: int, when: When):
     # Swiss Ephemeris uses SE_AST_OFFSET + minor number
     planet_id = swe.AST_OFFSET + minor_number
+    _use_ephe_path()
     jd = to_ut_jd(when)
     try:
         pos, _ = swe.calc_ut(jd, planet_id, FLAGS)
@@ -75,3 +87,79 @@ def asteroid(minor_number: int, when: When):
                 "dist": pos[2], "speed_lon": pos[3]}
     except Exception as e:
         raise HTTPException(500, f"Asteroid calc failed: {e}")
+
+class Positions(BaseModel):
+    bodies: List[Union[int, str]]  # planet names and/or minor planet numbers
+    times: Optional[List[When]] = None  # explicit times, or a start/end range
+    start: Optional[When] = None
+    end: Optional[When] = None
+    step_hours: float = Field(24.0, gt=0)
+
+def _resolve_body(body: Union[int, str]):
+    """(response key, Swiss Ephemeris id) for a planet name or minor planet number"""
+    if isinstance(body, int) or body.isdigit():
+        return str(int(body)), swe.AST_OFFSET + int(body)
+    if body.upper() not in NAME_MAP:
+        raise HTTPException(400, f"Unknown planet/asteroid name: {body}")
+    return body.upper(), NAME_MAP[body.upper()]
+
+def _time_grid(req: Positions) -> List[float]:
+    if req.times:
+        return [to_ut_jd(w) for w in req.times]
+    if req.start and req.end:
+        jd_start, jd_end = to_ut_jd(req.start), to_ut_jd(req.end)
+        if jd_end < jd_start:
+            raise HTTPException(400, "end must not be before start")
+        step = req.step_hours / 24.0
+        count = int((jd_end - jd_start) / step + 1e-9) + 1
+        if count * len(req.bodies) > MAX_POSITIONS:
+            raise HTTPException(400, f"Request exceeds {MAX_POSITIONS} positions")
+        return [jd_start + i * step for i in range(count)]
+    raise HTTPException(400, "Provide either times or start and end")
+
+def _coverage(planet_id: int, jds: List[float]) -> dict:
+    """
+    Probe the ends of the range (and each .se1 file span in between) before batching
+    Missing asteroid files raise; missing planet files silently fall back to Moshier
+    """
+    lo, hi = min(jds), max(jds)
+    step = COVERAGE_PROBE_YEARS * 365.25
+    probes = [lo] + [lo + k * step for k in range(1, int((hi - lo) / step) + 1)] + [hi]
+    source = "swieph"
+    for jd in probes:
+        try:
+            _, retflag = swe.calc_ut(jd, planet_id, FLAGS)
+        except swe.Error as e:
+            return {"available": False, "error": str(e)}
+        if not retflag & swe.FLG_SWIEPH:
+            source = "moshier"
+    return {"available": True, "source": source}
+
+@app.post("/positions")
+def positions(req: Positions):
+    """Many bodies at many times in one call, as columns (one array per quantity)"""
+    if not req.bodies:
+        raise HTTPException(400, "No bodies requested")
+    _use_ephe_path()
+    resolved = [_resolve_body(body) for body in req.bodies]
+    jds = _time_grid(req)
+    if len(jds) * len(resolved) > MAX_POSITIONS:
+        raise HTTPException(400, f"Request exceeds {MAX_POSITIONS} positions")
+
+    bodies, missing = {}, {}
+    for key, planet_id in resolved:
+        coverage = _coverage(planet_id, jds)
+        if not coverage["available"]:
+            missing[key] = coverage["error"]
+            continue
+        columns = {"lon": [], "lat": [], "dist": [], "speed_lon": []}
+        for jd in jds:
+            pos, _ = swe.calc_ut(jd, planet_id, FLAGS)
+            columns["lon"].append(pos[0])
+            columns["lat"].append(pos[1])
+            columns["dist"].append(pos[2])
+            columns["speed_lon"].append(pos[3])
+        columns["source"] = coverage["source"]
+        bodies[key] = columns
+
+    return {"jd": jds, "bodies": bodies, "missing": missing}
@@ -0,0 +1,300 @@
+import math
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+
+
+# Web maps stop short of the poles, and ASC/DSC lines diverge there anyway
+MAX_LATITUDE = 85.0
+
+ANGLES = ['AC', 'DC', 'MC', 'IC']
+
+# Sampling steps in degrees. Requests are snapped to one of these so the line
+# cache is keyed by a handful of values; finer than 0.1 costs seconds and
+# hundreds of MB for no visible difference on a map
+RESOLUTIONS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+MIN_RESOLUTION = RESOLUTIONS[0]
+
+
+def snap_resolution(resolution: float) -> float:
+    """Largest allowed step no larger than `resolution`; ValueError below MIN_RESOLUTION"""
+    if not resolution >= MIN_RESOLUTION:
+        raise ValueError(f"resolution must be at least {MIN_RESOLUTION} degrees")
+    return max(step for step in RESOLUTIONS if step <= resolution)
+
+
+def _wrap_longitude(values):
+    """Normalize geographic longitudes to [-180, 180)"""
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def _split_polyline(lats, lons) -> List[List[List[float]]]:
+    """
+    Break a sampled line into drawable segments
+    Segments end at undefined samples (circumpolar bodies) and wherever
+    the line wraps across the antimeridian
+    """
+    segments = []
+    current = []
+    previous_lon = None
+
+    for lat, lon in zip(lats.tolist(), lons.tolist()):
+        if math.isnan(lon):
+            if len(current) > 1:
+                segments.append(current)
+            current = []
+            previous_lon = None
+            continue
+
+        if previous_lon is not None and abs(lon - previous_lon) > 180:
+            if len(current) > 1:
+                segments.append(current)
+            current = []
+
+        current.append([round(lon, 4), round(lat, 4)])
+        previous_lon = lon
+
+    if len(current) > 1:
+        segments.append(current)
+
+    return segments
+
+
+def _line_feature(segments: List[List[List[float]]], properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap polyline segments as a GeoJSON feature"""
+    if len(segments) == 1:
+        geometry = {'type': 'LineString', 'coordinates': segments[0]}
+    else:
+        geometry = {'type': 'MultiLineString', 'coordinates': segments}
+
+    return {'type': 'Feature', 'geometry': geometry, 'properties': properties}
+
+
+def _feature_segments(feature: Dict[str, Any]) -> List[List[List[float]]]:
+    """Segments of a feature regardless of its geometry type"""
+    geometry = feature['geometry']
+    if geometry['type'] == 'LineString':
+        return [geometry['coordinates']]
+    return geometry['coordinates']
+
+
+@lru_cache(maxsize=256)
+def _trace_chart_lines(julian_day: float, lat: float, lon: float, resolution: float,
+                       include_parans: bool, include_local_space: bool) -> Dict[str, Any]:
+    """
+    Trace every astrocartography line for one birth moment and place
+    Results are memoized per chart so pans and zooms reuse the same lines
+    """
+    gst = swe.sidtime(julian_day) * 15.0  # Greenwich sidereal time in degrees
+
+    names = list(PLANET_IDS.keys())
+    equatorial = np.array([calc_body(julian_day, PLANET_IDS[name], swe.FLG_EQUATORIAL)[:2]
+                           for name in names])
+    ra = equatorial[:, 0]
+    dec = np.radians(equatorial[:, 1])
+
+    latitudes = np.arange(-MAX_LATITUDE, MAX_LATITUDE + resolution / 2, resolution)
+    latitudes = latitudes[latitudes <= MAX_LATITUDE]
+    phi = np.radians(latitudes)
+
+    # MC/IC lines are meridians: the body culminates where local sidereal time equals its RA
+    mc = _wrap_longitude(ra - gst)
+    ic = _wrap_longitude(ra - gst + 180.0)
+
+    # ASC/DSC from the semi-diurnal arc, cos(H0) = -tan(phi) tan(dec), over the whole grid
+    cos_h0 = -np.outer(np.tan(dec), np.tan(phi))
+    circumpolar = np.abs(cos_h0) > 1.0
+    h0 = np.degrees(np.arccos(np.clip(cos_h0, -1.0, 1.0)))
+    h0[circumpolar] = np.nan
+
+    lines = {
+        'AC': _wrap_longitude(ra[:, None] - h0 - gst),
+        'DC': _wrap_longitude(ra[:, None] + h0 - gst),
+        'MC': np.repeat(mc[:, None], len(latitudes), axis=1),
+        'IC': np.repeat(ic[:, None], len(latitudes), axis=1)
+    }
+
+    features = []
+    for angle in ANGLES:
+        for index, name in enumerate(names):
+            segments = _split_polyline(latitudes, lines[angle][index])
+            if segments:
+                features.append(_line_feature(segments, {
+                    'kind': 'angle',
+                    'planet': name,
+                    'type': angle
+                }))
+
+    if include_parans:
+        features.extend(_trace_parans(names, latitudes, lines))
+
+    if include_local_space:
+        features.extend(_trace_local_space(julian_day, lat, lon, resolution))
+
+    return {
+        'type': 'FeatureCollection',
+        'features': features,
+        'properties': {
+            'julian_day': julian_day,
+            'resolution': resolution,
+            'greenwich_sidereal_time': gst
+        }
+    }
+
+
+def _trace_parans(names: List[str], latitudes, lines: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Find latitudes where two bodies are angular at the same moment
+    Each paran is drawn as the parallel through the crossing of the two lines
+    """
+    stacked = []
+    labels = []
+    for angle in ANGLES:
+        for index, name in enumerate(names):
+            stacked.append(lines[angle][index])
+            labels.append((name, angle))
+    stacked = np.array(stacked)
+
+    first, second = np.triu_indices(len(labels), k=1)
+    keep = np.array([labels[a][0] != labels[b][0] and
+                     not (labels[a][1] in ('MC', 'IC') and labels[b][1] in ('MC', 'IC'))
+                     for a, b in zip(first, second)], dtype=bool)
+    first, second = first[keep], second[keep]
+
+    # Signed east-west separation of each line pair along the latitude grid
+    separation = _wrap_longitude(stacked[first] - stacked[second])
+    left, right = separation[:, :-1], separation[:, 1:]
+    with np.errstate(invalid='ignore'):
+        crossing = (left * right <= 0) & (np.abs(left - right) < 180.0)
+
+    features = []
+    for pair, step in zip(*np.nonzero(crossing)):
+        d0, d1 = separation[pair, step], separation[pair, step + 1]
+        fraction = d0 / (d0 - d1) if d0 != d1 else 0.0
+        paran_lat = latitudes[step] + fraction * (latitudes[step + 1] - latitudes[step])
+        lon0 = stacked[first[pair], step]
+        lon1 = stacked[first[pair], step + 1]
+        paran_lon = _wrap_longitude(lon0 + fraction * _wrap_longitude(lon1 - lon0))
+
+        (planet1, angle1), (planet2, angle2) = labels[first[pair]], labels[second[pair]]
+        features.append(_line_feature([[[-180.0, round(paran_lat, 4)], [180.0, round(paran_lat, 4)]]], {
+            'kind': 'paran',
+            'planet': planet1,
+            'type': angle1,
+            'planet2': planet2,
+            'type2': angle2,
+            'latitude': round(float(paran_lat), 4),
+            'crossing': [round(float(paran_lon), 4), round(float(paran_lat), 4)]
+        }))
+
+    return features
+
+
+def _trace_local_space(julian_day: float, lat: float, lon: float, resolution: float) -> List[Dict[str, Any]]:
+    """
+    Local space lines: great circles leaving the birthplace toward each
+    body's azimuth at the moment of birth
+    """
+    phi0 = math.radians(lat)
+    distances = np.radians(np.arange(0.0, 360.0 + resolution / 2, resolution))
+
+    features = []
+    for name, planet_id in PLANET_IDS.items():
+        pos = calc_body(julian_day, planet_id)
+        horizon = swe.azalt(julian_day, swe.ECL2HOR, (lon, lat, 0), 0, 0, (pos[0], pos[1], pos[2]))
+        # Swiss Ephemeris measures azimuth from the south, we want a compass bearing
+        azimuth = (horizon[0] + 180.0) % 360.0
+        bearing = math.radians(azimuth)
+
+        sin_phi = (math.sin(phi0) * np.cos(distances) +
+                   math.cos(phi0) * np.sin(distances) * math.cos(bearing))
+        path_lat = np.degrees(np.arcsin(np.clip(sin_phi, -1.0, 1.0)))
+        path_lon = lon + np.degrees(np.arctan2(math.sin(bearing) * np.sin(distances) * math.cos(phi0),
+                                               np.cos(distances) - math.sin(phi0) * sin_phi))
+        path_lon = _wrap_longitude(path_lon)
+        path_lon[np.abs(path_lat) > MAX_LATITUDE] = np.nan
+
+        segments = _split_polyline(path_lat, path_lon)
+        if segments:
+            features.append(_line_feature(segments, {
+                'kind': 'local_space',
+                'planet': name,
+                'azimuth': round(azimuth, 4),
+                'altitude': round(horizon[1], 4)
+            }))
+
+    return features
+
+
+def _clip_to_bbox(collection: Dict[str, Any], bbox: Tuple[float, float, float, float]) -> Dict[str, Any]:
+    """Keep only the parts of each line that fall inside a map tile"""
+    west, south, east, north = bbox
+
+    def inside(point):
+        point_lon, point_lat = point
+        in_lon = west <= point_lon <= east if west <= east else (point_lon >= west or point_lon <= east)
+        return in_lon and south <= point_lat <= north
+
+    clipped = []
+    for feature in collection['features']:
+        if feature['properties']['kind'] == 'paran':
+            paran_lat = feature['properties']['latitude']
+            if south <= paran_lat <= north:
+                clipped.append(feature)
+            continue
+
+        segments = []
+        for segment in _feature_segments(feature):
+            run = []
+            for point in segment:
+                if inside(point):
+                    run.append(point)
+                else:
+                    if len(run) > 1:
+                        segments.append(run)
+                    run = []
+            if len(run) > 1:
+                segments.append(run)
+
+        if segments:
+            clipped.append(_line_feature(segments, feature['properties']))
+
+    return {
+        'type': 'FeatureCollection',
+        'features': clipped,
+        'properties': dict(collection['properties'], bbox=list(bbox))
+    }
+
+
+class AstroCartographyEngine:
+    """
+    Astrocartography lines (ASC/DSC/MC/IC), parans and local space lines
+    for a natal chart, returned as GeoJSON
+    """
+
+    def __init__(self, natal_calculator):
+        """Initialize with a base AstrologicalCalculator instance"""
+        self.calc = natal_calculator
+
+    def generate_lines(self, resolution: float = 1.0, include_parans: bool = True,
+                       include_local_space: bool = True,
+                       bbox: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+        """
+        All lines for the chart sampled every `resolution` degrees (snapped to RESOLUTIONS)
+        bbox: (west, south, east, north) to clip the cached lines to a tile
+        """
+        collection = _trace_chart_lines(self.calc.julian_day, self.calc.lat, self.calc.lon,
+                                        snap_resolution(resolution), include_parans, include_local_space)
+
+        if bbox is not None:
+            return _clip_to_bbox(collection, bbox)
+        return collection
+
+    @staticmethod
+    def cache_info() -> Dict[str, int]:
+        """Hit/miss counters of the per-chart line cache"""
+        info = _trace_chart_lines.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
@@ -1,8 +1,62 @@
 import math
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import swisseph as swe
 
+from chart_sections import LazySections
+from date_chunks import split_range, map_chunks
+from depth_tiers import ASTEROID_IDS, HOUSE_SYSTEMS, depth_tier, resolve_depth
+
+
+# Bodies included in every natal chart, keyed by the names used in responses
+PLANET_IDS = {
+    'sun': swe.SUN,
+    'moon': swe.MOON,
+    'mercury': swe.MERCURY,
+    'venus': swe.VENUS,
+    'mars': swe.MARS,
+    'jupiter': swe.JUPITER,
+    'saturn': swe.SATURN,
+    'uranus': swe.URANUS,
+    'neptune': swe.NEPTUNE,
+    'pluto': swe.PLUTO,
+    'north_node': swe.TRUE_NODE,
+    'chiron': swe.CHIRON
+}
+
+
+def calc_body(julian_day: float, planet_id: int, flags: int = 0):
+    """
+    Position of one body at a UT Julian Day
+    Tries the Swiss Ephemeris files first and falls back to Moshier
+    """
+    try:
+        pos, _ = swe.calc_ut(julian_day, planet_id, swe.FLG_SWIEPH | flags)
+    except swe.Error:
+        pos, _ = swe.calc_ut(julian_day, planet_id, swe.FLG_MOSEPH | flags)
+    return pos
+
+
+def solar_altitude(julian_day: float, lat: float, lon: float) -> float:
+    """True (unrefracted) altitude of the Sun's centre above the horizon, degrees"""
+    pos = calc_body(julian_day, swe.SUN)
+    _, altitude, _ = swe.azalt(julian_day, swe.ECL2HOR, (lon, lat, 0.0), 0.0, 0.0, (pos[0], pos[1], pos[2]))
+    return altitude
+
+
+@lru_cache(maxsize=32)
+def calculator_from_params(birth_params: tuple) -> 'AstrologicalCalculator':
+    """
+    Calculator for AstrologicalCalculator.birth_params, cached so a worker
+    process builds each natal chart once however many chunks it scores
+    """
+    return AstrologicalCalculator(*birth_params)
+
+
+def _stress_chunk(birth_params: tuple, dates: List[str]) -> List[Dict[str, Any]]:
+    return calculator_from_params(birth_params)._stress_days(dates)
+
 
 class AstrologicalCalculator:
     """
@@ -10,25 +64,35 @@ class AstrologicalCalculator:
     transits, progressions, and multiple astrological systems
     """
 
-    def __init__(self, birth_date: str, birth_time: str, lat: float, lon: float, timezone_offset: int = -5):
+    def __init__(self, birth_date: str, birth_time: str, lat: float, lon: float, timezone_offset: int = -5,
+                 depth: str = 'Standard'):
         """
         Initialize with birth data
         birth_date: 'YYYY-MM-DD'
         birth_time: 'HH:MM:SS'
         lat, lon: decimal degrees (Sewickley, PA: 40.5387, -80.1844)
         timezone_offset: hours from UTC (EST = -5, EDT = -4)
+        depth: computation tier (Quick, Standard, Advanced / All systems), see depth_tiers
         """
         self.birth_datetime = datetime.strptime(f"{birth_date} {birth_time}",
                                                 "%Y-%m-%d %H:%M:%S")
         self.lat = lat
         self.lon = lon
         self.tz_offset = timezone_offset
+        self.depth = resolve_depth(depth)
+        self.tier = depth_tier(depth)
         self.julian_day = self.calculate_julian_day()
 
         # Initialize Swiss Ephemeris
         # Use built-in ephemeris for basic calculations
         swe.set_ephe_path('')  # Use built-in ephemeris
 
+    @property
+    def birth_params(self) -> tuple:
+        """Constructor arguments, for rebuilding this calculator in a worker process"""
+        return (self.birth_datetime.strftime("%Y-%m-%d"), self.birth_datetime.strftime("%H:%M:%S"),
+                self.lat, self.lon, self.tz_offset, self.depth)
+
     def calculate_julian_day(self) -> float:
         """Convert datetime to Julian Day for astronomical calculations"""
         dt = self.birth_datetime + timedelta(hours=-self.tz_offset)
@@ -50,31 +114,26 @@ class AstrologicalCalculator:
             'vertex': ascmc[3] # Vertex
         }
 
+    def is_day_birth(self) -> bool:
+        """Sect: a day chart has the Sun above the horizon at birth"""
+        return solar_altitude(self.julian_day, self.lat, self.lon) > 0
+
     def calculate_planets(self) -> Dict[str, Dict[str, Any]]:
         """Calculate positions of all planets"""
-        planets = {
-            'sun': swe.SUN,
-            'moon': swe.MOON,
-            'mercury': swe.MERCURY,
-            'venus': swe.VENUS,
-            'mars': swe.MARS,
-            'jupiter': swe.JUPITER,
-            'saturn': swe.SATURN,
-            'uranus': swe.URANUS,
-            'neptune': swe.NEPTUNE,
-            'pluto': swe.PLUTO,
-            'north_node': swe.TRUE_NODE,
-            'chiron': swe.CHIRON
-        }
-
         positions = {}
-        for name, planet_id in planets.items():
-            try:
-                # Try Swiss Ephemeris with built-in data first
-                pos, ret = swe.calc_ut(self.julian_day, planet_id, swe.FLG_SWIEPH)
-            except:
-                # Fallback to Moshier ephemeris (built-in)
-                pos, ret = swe.calc_ut(self.julian_day, planet_id, swe.FLG_MOSEPH)
+        bodies = {name: PLANET_IDS[name] for name in self.tier['bodies'] or PLANET_IDS}
+        if self.tier['asteroids']:
+            bodies.update(ASTEROID_IDS)
+        for name, planet_id in bodies.items():
+            if self.tier['ephemeris'] == 'moshier':
+                pos, _ = swe.calc_ut(self.julian_day, planet_id, swe.FLG_MOSEPH)
+            elif name in ASTEROID_IDS:
+                try:
+                    pos = calc_body(self.julian_day, planet_id)
+                except swe.Error:
+                    continue  # asteroid file (seas_*.se1) not installed
+            else:
+                pos = calc_body(self.julian_day, planet_id)
 
             positions[name] = {
                 'longitude': pos[0],  # Zodiacal longitude
@@ -87,22 +146,16 @@ class AstrologicalCalculator:
             }
         return positions
 
-    def get_zodiac_sign(self, longitude: float) -> str:
+    @staticmethod
+    def get_zodiac_sign(longitude: float) -> str:
         """Convert longitude to zodiac sign"""
         signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
                 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
-        return signs[int(longitude / 30)]
+        return signs[int(longitude / 30) % 12]
 
     def calculate_aspects(self, positions: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Calculate major aspects between planets"""
-        aspects = {
-            'conjunction': (0, 8),
-            'sextile': (60, 6),
-            'square': (90, 8),
-            'trine': (120, 8),
-            'opposition': (180, 8),
-            'quincunx': (150, 3)
-        }
+        """Calculate aspects between planets (the set depends on the depth tier)"""
+        aspects = self.tier['aspects']
 
         found_aspects = []
         planets = list(positions.keys())
@@ -128,12 +181,17 @@ class AstrologicalCalculator:
 
         return found_aspects
 
-    def calculate_transits(self, target_date: str) -> List[Dict[str, Any]]:
-        """Calculate current planetary transits to natal positions"""
+    def calculate_transits(self, target_date: str,
+                           natal_positions: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Calculate current planetary transits to natal positions
+        natal_positions: precomputed calculate_planets() output, reused across dates
+        """
         target_dt = datetime.strptime(target_date, "%Y-%m-%d")
         target_jd = swe.julday(target_dt.year, target_dt.month, target_dt.day, 12)
 
-        natal_positions = self.calculate_planets()
+        if natal_positions is None:
+            natal_positions = self.calculate_planets()
 
         # Calculate current positions
         current_positions = {}
@@ -179,13 +237,11 @@ class AstrologicalCalculator:
     def calculate_progressions(self, target_date: str) -> Dict[str, Dict[str, Any]]:
         """Secondary progressions (day-for-year)"""
         target_dt = datetime.strptime(target_date, "%Y-%m-%d")
-        years_elapsed = (target_dt - self.birth_datetime).days / 365.25
+        target_jd = swe.julday(target_dt.year, target_dt.month, target_dt.day, 12)
+        years_elapsed = (target_jd - self.julian_day) / 365.24219
 
-        # Progress the chart by days equal to years
-        progressed_dt = self.birth_datetime + timedelta(days=years_elapsed)
-        prog_jd = swe.julday(progressed_dt.year, progressed_dt.month,
-                             progressed_dt.day, progressed_dt.hour +
-                             progressed_dt.minute/60)
+        # Progress the chart by days equal to years, from the UT birth moment
+        prog_jd = self.julian_day + years_elapsed
 
         # Calculate progressed positions
         progressed = {}
@@ -193,14 +249,12 @@ class AstrologicalCalculator:
                   'venus': swe.VENUS, 'mars': swe.MARS}
 
         for name, planet_id in planets.items():
-            try:
-                pos, ret = swe.calc_ut(prog_jd, planet_id, swe.FLG_SWIEPH)
-            except:
-                pos, ret = swe.calc_ut(prog_jd, planet_id, swe.FLG_MOSEPH)
+            pos = calc_body(prog_jd, planet_id, swe.FLG_SPEED)
             progressed[name] = {
                 'longitude': pos[0],
                 'sign': self.get_zodiac_sign(pos[0]),
-                'degree': pos[0] % 30
+                'degree': pos[0] % 30,
+                'speed': pos[3]  # degrees per progressed year
             }
 
         return progressed
@@ -234,32 +288,20 @@ class AstrologicalCalculator:
     def calculate_bazi_pillars(self) -> Dict[str, str]:
         """
         Calculate Chinese Four Pillars (BaZi)
-        Simplified version - full implementation requires Chinese calendar
+        Year and month follow the solar terms, day and hour the 60-day cycle (see bazi.py)
         """
-        # This is a simplified framework
-        # Full BaZi requires complex Chinese calendar conversions
-
-        stems = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
-        branches = ['子', '丑', '寅', '卯', '辰', '巳',
-                   '午', '未', '申', '酉', '戌', '亥']
-
-        # Simplified calculation (proper BaZi needs lunar calendar)
-        year = self.birth_datetime.year
-        month = self.birth_datetime.month
-        day = self.birth_datetime.day
-        hour = self.birth_datetime.hour
-
-        year_stem = (year - 4) % 10
-        year_branch = (year - 4) % 12
+        # bazi builds on ephemeris_series, which imports this module
+        from bazi import get_bazi_engine, describe_pillar  # pylint: disable=import-outside-toplevel
 
+        local = self.birth_datetime
+        found = get_bazi_engine().pillars([local.strftime("%Y-%m-%d")],
+                                          [local.hour + local.minute / 60 + local.second / 3600], [self.tz_offset])
         return {
-            'year_pillar': f"{stems[year_stem]}{branches[year_branch]}",
-            'month_pillar': "Requires lunar calendar conversion",
-            'day_pillar': "Requires 60-day cycle calculation",
-            'hour_pillar': f"Based on {hour}:00"
+            f"{name}_pillar": describe_pillar(int(found[name][0]))['pillar']
+            for name in ('year', 'month', 'day', 'hour')
         }
 
-    def critical_degree_analysis(self) -> List[Dict[str, Any]]:
+    def critical_degree_analysis(self, planets: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Identify planets at critical degrees"""
         critical_degrees = {
             'cardinal': [0, 13, 26],  # Aries, Cancer, Libra, Capricorn
@@ -267,7 +309,7 @@ class AstrologicalCalculator:
             'mutable': [4, 17]         # Gemini, Virgo, Sagittarius, Pisces
         }
 
-        planets = self.calculate_planets()
+        planets = planets or self.calculate_planets()
         critical_planets = []
 
         for planet, data in planets.items():
@@ -293,17 +335,15 @@ class AstrologicalCalculator:
 
         return critical_planets
 
-    def calculate_arabic_parts(self) -> Dict[str, Any]:
+    def calculate_arabic_parts(self, planets: Optional[Dict[str, Dict[str, Any]]] = None,
+                               houses: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Calculate Arabic Parts/Lots"""
-        houses = self.calculate_houses()
-        planets = self.calculate_planets()
+        houses = houses or self.calculate_houses()
+        planets = planets or self.calculate_planets()
 
         # Part of Fortune = ASC + Moon - Sun (day birth)
         # Part of Fortune = ASC + Sun - Moon (night birth)
-        is_day_birth = planets['sun']['longitude'] > houses['asc'] or \
-                      planets['sun']['longitude'] < houses['asc'] - 180
-
-        if is_day_birth:
+        if self.is_day_birth():
             pof = houses['asc'] + planets['moon']['longitude'] - \
                   planets['sun']['longitude']
         else:
@@ -413,6 +453,62 @@ class AstrologicalCalculator:
             'dasha_sequence': dasha_sequence
         }
 
+    def _stress_days(self, dates: List[str]) -> List[Dict[str, Any]]:
+        """Stress score and contributing factors for each date, in order"""
+        natal_planets = self.calculate_planets()
+        # Natal critical degrees do not change from day to day
+        critical_planets = self.critical_degree_analysis(natal_planets)
+        return [self.score_stress_day(date, self.calculate_transits(date, natal_planets), critical_planets)
+                for date in dates]
+
+    def score_stress_day(self, date: str, transits: List[Dict[str, Any]],
+                         critical_planets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Stress score and contributing factors for one date
+        transits: calculate_transits() for the date; critical_planets: critical_degree_analysis()
+        """
+        daily_stress = 0
+        factors_today = []
+
+        # Weight different stress factors
+        for transit in transits:
+            weight = 0
+            factor_desc = f"{transit['transiting']} {transit['aspect']} natal {transit['natal']}"
+
+            # Hard aspects from malefics get higher weight
+            if transit['transiting'] in ['mars', 'saturn', 'pluto']:
+                if transit['aspect'] in ['square', 'opposition']:
+                    weight = 8
+                    factor_desc += " (Major stress aspect)"
+                elif transit['aspect'] == 'conjunction':
+                    weight = 6
+                    factor_desc += " (Intense conjunction)"
+
+            # Benefic aspects reduce stress
+            elif transit['transiting'] in ['venus', 'jupiter']:
+                if transit['aspect'] in ['trine', 'sextile']:
+                    weight = -2
+                    factor_desc += " (Supportive aspect)"
+
+            if weight != 0:
+                daily_stress += weight
+                factors_today.append({
+                    'factor': factor_desc,
+                    'weight': weight,
+                    'orb': transit['orb']
+                })
+
+        # Check for critical degrees
+        if critical_planets:
+            daily_stress += len(critical_planets) * 2
+            factors_today.append({
+                'factor': f"{len(critical_planets)} planets at critical degrees",
+                'weight': len(critical_planets) * 2,
+                'orb': 0
+            })
+
+        return {'date': date, 'stress_score': daily_stress, 'factors': factors_today}
+
     def analyze_stress_indicators(self, date_range: List[str]) -> Dict[str, Any]:
         """
         Analyze stress indicators over a date range
@@ -421,65 +517,24 @@ class AstrologicalCalculator:
         stress_analysis = {
             'overall_stress_score': 0,
             'peak_stress_dates': [],
+            'daily_scores': [],
             'stress_factors': [],
             'recommendations': []
         }
 
-        natal_planets = self.calculate_planets()
-
-        for date in date_range:
-            daily_stress = 0
-            factors_today = []
-
-            # Calculate transits for this date
-            transits = self.calculate_transits(date)
-
-            # Weight different stress factors
-            for transit in transits:
-                weight = 0
-                factor_desc = f"{transit['transiting']} {transit['aspect']} natal {transit['natal']}"
-
-                # Hard aspects from malefics get higher weight
-                if transit['transiting'] in ['mars', 'saturn', 'pluto']:
-                    if transit['aspect'] in ['square', 'opposition']:
-                        weight = 8
-                        factor_desc += " (Major stress aspect)"
-                    elif transit['aspect'] == 'conjunction':
-                        weight = 6
-                        factor_desc += " (Intense conjunction)"
-
-                # Benefic aspects reduce stress
-                elif transit['transiting'] in ['venus', 'jupiter']:
-                    if transit['aspect'] in ['trine', 'sextile']:
-                        weight = -2
-                        factor_desc += " (Supportive aspect)"
-
-                if weight != 0:
-                    daily_stress += weight
-                    factors_today.append({
-                        'factor': factor_desc,
-                        'weight': weight,
-                        'orb': transit['orb']
+        # Days are independent: long ranges are scored in chunks across the worker pool
+        chunks = split_range(date_range)
+        for days in map_chunks(_stress_chunk, chunks, self.birth_params):
+            for day in days:
+                if day['stress_score'] > 10:  # Threshold for peak stress
+                    stress_analysis['peak_stress_dates'].append({
+                        'date': day['date'],
+                        'stress_score': day['stress_score'],
+                        'factors': day['factors']
                     })
 
-            # Check for critical degrees
-            critical_planets = self.critical_degree_analysis()
-            if critical_planets:
-                daily_stress += len(critical_planets) * 2
-                factors_today.append({
-                    'factor': f"{len(critical_planets)} planets at critical degrees",
-                    'weight': len(critical_planets) * 2,
-                    'orb': 0
-                })
-
-            if daily_stress > 10:  # Threshold for peak stress
-                stress_analysis['peak_stress_dates'].append({
-                    'date': date,
-                    'stress_score': daily_stress,
-                    'factors': factors_today
-                })
-
-            stress_analysis['overall_stress_score'] += daily_stress
+                stress_analysis['daily_scores'].append({'date': day['date'], 'stress_score': day['stress_score']})
+                stress_analysis['overall_stress_score'] += day['stress_score']
 
         # Generate recommendations based on stress level
         avg_stress = stress_analysis['overall_stress_score'] / len(date_range)
@@ -561,25 +616,36 @@ class AstrologicalCalculator:
             'target_date': target_date
         }
 
-    def generate_full_natal_chart(self) -> Dict[str, Any]:
-        """Generate complete natal chart analysis"""
-        planets = self.calculate_planets()
-        houses = self.calculate_houses()
-        aspects = self.calculate_aspects(planets)
-        critical = self.critical_degree_analysis()
-        arabic_parts = self.calculate_arabic_parts()
-
-        return {
-            'planets': planets,
-            'houses': houses,
-            'aspects': aspects,
-            'critical_degrees': critical,
-            'arabic_parts': arabic_parts,
-            'birth_info': {
-                'date': self.birth_datetime.strftime('%Y-%m-%d'),
-                'time': self.birth_datetime.strftime('%H:%M:%S'),
-                'lat': self.lat,
-                'lon': self.lon,
-                'timezone_offset': self.tz_offset
-            }
-        }
\ No newline at end of file
+    def natal_sections(self) -> LazySections:
+        """Natal chart sections and what each one is computed from"""
+        return (LazySections()
+                .add('planets', self.calculate_planets)
+                .add('houses', self.calculate_houses)
+                .add('aspects', self.calculate_aspects, ['planets'])
+                .add('critical_degrees', self.critical_degree_analysis, ['planets'])
+                .add('arabic_parts', self.calculate_arabic_parts, ['planets', 'houses'])
+                .add('house_systems', self.calculate_house_systems))
+
+    def calculate_house_systems(self) -> Dict[str, Any]:
+        """Cusps, ASC and MC in every supported house system"""
+        return {name: self.calculate_houses(system) for name, system in HOUSE_SYSTEMS.items()}
+
+    def generate_full_natal_chart(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Generate complete natal chart analysis
+        fields: sections to include (default all); the others are not computed
+        """
+        sections = self.natal_sections()
+        if fields is None:
+            # tier default: house_systems only at deep
+            fields = [name for name in sections.names
+                      if name != 'house_systems' or self.tier['house_systems']]
+        result = sections.select(fields)
+        result['birth_info'] = {
+            'date': self.birth_datetime.strftime('%Y-%m-%d'),
+            'time': self.birth_datetime.strftime('%H:%M:%S'),
+            'lat': self.lat,
+            'lon': self.lon,
+            'timezone_offset': self.tz_offset
+        }
+        return result
\ No newline at end of file
@@ -1,5 +1,7 @@
 import swisseph as swe
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from forensic_scanner import ForensicScanner
 
 PLANETS = {
     'Sun': swe.SUN, 'Moon': swe.MOON, 'Mercury': swe.MERCURY, 'Venus': swe.VENUS, 'Mars': swe.MARS,
@@ -27,36 +29,30 @@ def calculate_planets(julian_day):
         planet_positions[name] = { 'longitude': pos[0] }
     return planet_positions
 
-def calculate_forensic_astrology(natal_jd):
+def calculate_forensic_astrology(natal_jd, window_days=365, orb=ORB):
     """
-    Calculates challenging transits for the next year.
-    This is a simplified example focusing on major hard aspects from outer planets.
+    Calculates challenging transits for the coming window (default one year).
+    Focuses on major hard aspects from outer planets; consecutive in-orb days
+    are merged into one period with start, exact and end dates.
     """
-    cautious_periods = []
     natal_positions = calculate_planets(natal_jd)
-    
+    natal_longitudes = {name: pos['longitude'] for name, pos in natal_positions.items()}
+
     today = datetime.utcnow()
-    for i in range(365): # Check for the next year
-        current_date = today + timedelta(days=i)
-        current_jd = get_julian_day(current_date.year, current_date.month, current_date.day)
-        transiting_positions = calculate_planets(current_jd)
-
-        for transiting_planet_name, transiting_planet_pos in transiting_positions.items():
-            if transiting_planet_name not in TRANSITING_PLANETS:
-                continue
-
-            for natal_planet_name, natal_planet_pos in natal_positions.items():
-                angle = abs(transiting_planet_pos['longitude'] - natal_planet_pos['longitude'])
-                angle = angle if angle <= 180 else 360 - angle
-
-                for aspect_angle, aspect_name in ASPECTS.items():
-                    if abs(angle - aspect_angle) < ORB:
-                        cautious_periods.append({
-                            "date": current_date.strftime('%Y-%m-%d'),
-                            "event": f"Transiting {transiting_planet_name} {aspect_name} Natal {natal_planet_name}",
-                            "description": f"A period requiring caution. The energies of {transiting_planet_name} and {natal_planet_name} are in a challenging alignment, which can bring tests or pressures related to their domains."
-                        })
-
-    # Deduplicate and format
-    unique_events = { (p['date'], p['event']): p for p in cautious_periods }
-    return list(unique_events.values())
\ No newline at end of file
+    start_jd = get_julian_day(today.year, today.month, today.day)
+
+    scanner = ForensicScanner(natal_longitudes, TRANSITING_PLANETS, ASPECTS)
+    cautious_periods = []
+    for period in scanner.scan(start_jd, window_days, orb):
+        cautious_periods.append({
+            "date": period['start_date'],
+            "start_date": period['start_date'],
+            "exact_date": period['exact_date'],
+            "exact_dates": period['exact_dates'],
+            "end_date": period['end_date'],
+            "min_orb": period['min_orb'],
+            "event": period['event'],
+            "description": f"A period requiring caution. The energies of {period['transiting']} and {period['natal']} are in a challenging alignment, which can bring tests or pressures related to their domains."
+        })
+
+    return cautious_periods
@@ -0,0 +1,245 @@
+import os
+from datetime import date
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+import swisseph as swe
+
+from ephemeris_series import body_positions, bisect_roots, boundary_crossings, wrap180
+from table_store import save_arrays, load_or_build
+
+
+SOLAR_TERMS_PATH = os.getenv("SOLAR_TERMS_PATH",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'solar_terms.npz'))
+
+TABLE_START_YEAR = 1900
+TABLE_END_YEAR = 2100
+
+# The 24 solar terms (jieqi), indexed by Sun longitude / 15
+SOLAR_TERMS = [
+    'Chunfen', 'Qingming', 'Guyu', 'Lixia', 'Xiaoman', 'Mangzhong',
+    'Xiazhi', 'Xiaoshu', 'Dashu', 'Liqiu', 'Chushu', 'Bailu',
+    'Qiufen', 'Hanlu', 'Shuangjiang', 'Lidong', 'Xiaoxue', 'Daxue',
+    'Dongzhi', 'Xiaohan', 'Dahan', 'Lichun', 'Yushui', 'Jingzhe'
+]
+LICHUN = SOLAR_TERMS.index('Lichun')  # 315 degrees: the BaZi year starts here
+TERM_EDGES = np.arange(0.0, 360.0, 15.0)
+
+STEMS = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
+STEM_NAMES = ['Jia', 'Yi', 'Bing', 'Ding', 'Wu', 'Ji', 'Geng', 'Xin', 'Ren', 'Gui']
+BRANCHES = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
+BRANCH_NAMES = ['Zi', 'Chou', 'Yin', 'Mao', 'Chen', 'Si', 'Wu', 'Wei', 'Shen', 'You', 'Xu', 'Hai']
+ANIMALS = ['Rat', 'Ox', 'Tiger', 'Rabbit', 'Dragon', 'Snake', 'Horse', 'Goat', 'Monkey', 'Rooster', 'Dog', 'Pig']
+
+STEM_ELEMENTS = ['wood', 'wood', 'fire', 'fire', 'earth', 'earth', 'metal', 'metal', 'water', 'water']
+BRANCH_ELEMENTS = ['water', 'earth', 'wood', 'wood', 'earth', 'fire', 'fire', 'earth', 'metal', 'metal', 'earth', 'water']
+
+# Hidden stems of each branch: main qi first, then middle and residual qi
+HIDDEN_STEMS = [
+    [9], [5, 9, 7], [0, 2, 4], [1], [4, 1, 9], [2, 6, 4],
+    [3, 5], [5, 3, 1], [6, 8, 4], [7], [4, 7, 3], [8, 0]
+]
+
+# Julian Day Number = date.toordinal() + this
+ORDINAL_TO_JDN = 1721425
+
+# Day 0 of the 60-day cycle (甲子) is every JDN with (JDN + 49) % 60 == 0
+DAY_CYCLE_OFFSET = 49
+
+LUCK_PILLARS = 8
+LUCK_PILLAR_YEARS = 10
+
+
+def cycle_index(stem: int, branch: int) -> int:
+    """Position (0 = 甲子) of a stem/branch pair in the 60 cycle"""
+    return (6 * stem - 5 * branch) % 60
+
+
+def describe_pillar(index: int) -> Dict[str, Any]:
+    stem, branch = index % 10, index % 12
+    return {
+        'pillar': f"{STEMS[stem]}{BRANCHES[branch]}",
+        'name': f"{STEM_NAMES[stem]} {BRANCH_NAMES[branch]}",
+        'stem': STEMS[stem],
+        'branch': BRANCHES[branch],
+        'element': STEM_ELEMENTS[stem],
+        'polarity': 'yang' if stem % 2 == 0 else 'yin',
+        'animal': ANIMALS[branch],
+        'hidden_stems': [{'stem': STEMS[s], 'element': STEM_ELEMENTS[s]} for s in HIDDEN_STEMS[branch]]
+    }
+
+
+class SolarTermTable:
+    """
+    Exact times of the 24 solar terms for 1900-2100 as sorted arrays; every
+    BaZi lookup afterwards is a binary search, with no ephemeris calls
+    """
+
+    def __init__(self, jd, term):
+        self.jd = jd
+        self.term = term
+        # the 12 "jie" terms (odd indices) open the BaZi months
+        self.jie = jd[term % 2 == 1]
+        self.lichun = jd[term == LICHUN]  # one per year from TABLE_START_YEAR, all in early February
+
+    @classmethod
+    def build(cls, start_year: int = TABLE_START_YEAR, end_year: int = TABLE_END_YEAR) -> 'SolarTermTable':
+        """Sun longitude sampled daily, each 15-degree crossing refined by bisection"""
+        # padded: births near either end need the neighbouring jie terms, and the
+        # lunisolar calendar needs the winter solstice closing its last year
+        jd_start = swe.julday(start_year - 1, 11, 1, 0.0)
+        jd_end = swe.julday(end_year + 2, 1, 1, 0.0)
+        grid = np.arange(jd_start, jd_end + 1.0, 1.0)
+        sun = swe.SUN
+
+        def longitude(jds):
+            return body_positions(sun, jds)[0]
+
+        lo, hi, boundary, entered = boundary_crossings(longitude(grid), grid, TERM_EDGES)
+        roots = bisect_roots(lambda jds: wrap180(longitude(jds) - boundary), lo, hi)
+        order = np.argsort(roots)
+        return cls(roots[order], entered[order].astype(np.int8))
+
+    def save(self, path: str = SOLAR_TERMS_PATH):
+        save_arrays(path, jd=self.jd, term=self.term)
+
+    @classmethod
+    def load(cls, path: str = SOLAR_TERMS_PATH) -> 'SolarTermTable':
+        with np.load(path) as data:
+            return cls(data['jd'], data['term'])
+
+    def terms(self, jd_start: float, jd_end: float) -> List[Dict[str, Any]]:
+        """Solar terms with jd_start <= jd < jd_end"""
+        first, last = np.searchsorted(self.jd, [jd_start, jd_end], side='left')
+        return [{'term': SOLAR_TERMS[t], 'sun_longitude': 15.0 * t, 'jd': float(j)}
+                for j, t in zip(self.jd[first:last], self.term[first:last])]
+
+
+class BaziEngine:
+    """
+    Four pillars from local civil birth times: year from Lichun, month from the
+    jie term in effect, day from the 60-day count, hour from the double hour
+    The day changes at 23:00 (start of the Zi hour)
+    """
+
+    def __init__(self, table: SolarTermTable):
+        self.table = table
+
+    def _check_range(self, jd_ut: np.ndarray):
+        """
+        BaZi years TABLE_START_YEAR..TABLE_END_YEAR, Lichun to Lichun: the padding
+        terms before the first Lichun only serve month and luck-pillar lookups
+        """
+        if len(jd_ut) and (jd_ut.min() < self.table.lichun[0] or jd_ut.max() >= self.table.lichun[-1]):
+            raise ValueError(f"BaZi covers births from Lichun {TABLE_START_YEAR} "
+                             f"to Lichun {TABLE_END_YEAR + 1} (early February)")
+
+    def pillars(self, local_dates: Sequence[str], local_hours: Sequence[float],
+                timezone_offsets: Sequence[float]) -> Dict[str, np.ndarray]:
+        """
+        60-cycle indices of the four pillars for many births at once
+        local_dates: 'YYYY-MM-DD'; local_hours: decimal hours; timezone_offsets: hours east of UTC
+        """
+        years, jdn = [], []
+        for text in local_dates:
+            day = date.fromisoformat(text)
+            years.append(day.year)
+            jdn.append(day.toordinal() + ORDINAL_TO_JDN)
+        years, jdn = np.array(years), np.array(jdn)
+        hours = np.asarray(local_hours, dtype=float)
+        jd_ut = jdn - 0.5 + (hours - np.asarray(timezone_offsets, dtype=float)) / 24.0
+        self._check_range(jd_ut)
+
+        # year: the Gregorian year, minus one before that year's Lichun
+        lichun_index = np.clip(years - TABLE_START_YEAR, 0, len(self.table.lichun) - 1)
+        solar_year = np.where(jd_ut < self.table.lichun[lichun_index], years - 1, years)
+        year_stem, year_branch = (solar_year - 4) % 10, (solar_year - 4) % 12
+
+        # month: count of jie terms since Lichun; the first month is always 寅
+        term = self.table.term[np.searchsorted(self.table.jd, jd_ut, side='right') - 1]
+        month = ((term.astype(int) - LICHUN) % 24) // 2
+        month_stem = (year_stem % 5 * 2 + 2 + month) % 10
+        month_branch = (month + 2) % 12
+
+        # day: the Zi hour from 23:00 already belongs to the next day
+        day_number = jdn + (hours >= 23.0)
+        day_index = (day_number + DAY_CYCLE_OFFSET) % 60
+
+        hour_branch = ((np.floor(hours).astype(int) + 1) // 2) % 12
+        hour_stem = (day_index % 10 % 5 * 2 + hour_branch) % 10
+
+        return {
+            'year': cycle_index(year_stem, year_branch),
+            'month': cycle_index(month_stem, month_branch),
+            'day': day_index,
+            'hour': cycle_index(hour_stem, hour_branch),
+            'jd_ut': jd_ut,
+            'year_stem': year_stem
+        }
+
+    def luck_pillars(self, jd_ut: float, month_index: int, year_stem: int, gender: str) -> Dict[str, Any]:
+        """
+        10-year luck pillars: forward from the month pillar for yang-year men and
+        yin-year women, backward otherwise; the distance to the neighbouring jie
+        term sets the starting age (3 days = 1 year)
+        """
+        forward = (year_stem % 2 == 0) == (gender == 'male')
+        position = np.searchsorted(self.table.jie, jd_ut, side='right')
+        days = self.table.jie[position] - jd_ut if forward else jd_ut - self.table.jie[position - 1]
+        start_age = days / 3.0
+        step = 1 if forward else -1
+        return {
+            'direction': 'forward' if forward else 'backward',
+            'start_age': round(float(start_age), 2),
+            'start_age_years': int(days // 3),
+            'start_age_months': int(round((days % 3) * 4)) % 12,
+            'pillars': [dict(describe_pillar((month_index + step * i) % 60),
+                             age_from=round(float(start_age) + LUCK_PILLAR_YEARS * (i - 1), 2),
+                             age_to=round(float(start_age) + LUCK_PILLAR_YEARS * i, 2))
+                        for i in range(1, LUCK_PILLARS + 1)]
+        }
+
+    def chart(self, local_date: str, local_hour: float, timezone_offset: float,
+              gender: Optional[str] = None, time_known: bool = True) -> Dict[str, Any]:
+        """
+        Four pillars with stems, branches and hidden stems, element balance and (with gender) luck pillars
+        Without a known birth time the hour pillar is left out
+        """
+        found = self.pillars([local_date], [local_hour], [timezone_offset])
+        names = ('year', 'month', 'day', 'hour') if time_known else ('year', 'month', 'day')
+        indices = {name: int(found[name][0]) for name in names}
+        pillars = {name: describe_pillar(index) for name, index in indices.items()}
+
+        balance = {element: 0 for element in ('wood', 'fire', 'earth', 'metal', 'water')}
+        for index in indices.values():
+            balance[STEM_ELEMENTS[index % 10]] += 1
+            balance[BRANCH_ELEMENTS[index % 12]] += 1
+
+        result = {
+            'pillars': pillars,
+            'day_master': {'stem': STEMS[indices['day'] % 10], 'element': STEM_ELEMENTS[indices['day'] % 10],
+                           'polarity': pillars['day']['polarity']},
+            'element_balance': balance
+        }
+        if gender:
+            if gender not in ('male', 'female'):
+                raise ValueError("gender must be 'male' or 'female'")
+            result['luck_pillars'] = self.luck_pillars(float(found['jd_ut'][0]), indices['month'],
+                                                       int(found['year_stem'][0]), gender)
+        return result
+
+
+_engine: Optional[BaziEngine] = None
+
+
+def get_bazi_engine() -> BaziEngine:
+    """Shared engine; the solar-term table is loaded from disk (built and saved first if missing)"""
+    global _engine  # pylint: disable=global-statement
+    if _engine is None:
+        _engine = BaziEngine(load_or_build(SOLAR_TERMS_PATH, SolarTermTable.load, SolarTermTable.build))
+    return _engine
+
+
+if __name__ == '__main__':
+    built = SolarTermTable.build()
+    built.save(SOLAR_TERMS_PATH)
+    print(f"Saved {len(built.jd)} solar terms to {SOLAR_TERMS_PATH}")
@@ -0,0 +1,95 @@
+"""
+Latency benchmark for the BirthData.depth tiers
+
+Times the natal chart and the full advanced analysis for a spread of birth
+charts at each tier and compares the median against the tier's
+latency_budget_ms (depth_tiers.DEPTH_TIERS). Exits non-zero when a budget
+is exceeded, so it can gate deploys.
+
+Usage:
+    python benchmark_depth.py
+    python benchmark_depth.py --charts 100 --tiers fast standard
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Any
+
+from astrological_calculator import AstrologicalCalculator
+from advanced_timing import AdvancedTimingTechniques
+from depth_tiers import DEPTH_TIERS
+
+
+# (lat, lon, timezone offset) spread across latitudes, including a high one
+SAMPLE_LOCATIONS = [
+    (40.71, -74.01, -5), (51.51, -0.13, 0), (35.68, 139.69, 9), (-33.87, 151.21, 10),
+    (19.43, -99.13, -6), (64.15, -21.94, 0), (-23.55, -46.63, -3), (28.61, 77.21, 5.5)
+]
+
+
+def _sample_charts(count: int) -> List[tuple]:
+    """Deterministic birth data spread over 1930-2020 and the sample locations"""
+    charts = []
+    for i in range(count):
+        lat, lon, offset = SAMPLE_LOCATIONS[i % len(SAMPLE_LOCATIONS)]
+        year = 1930 + (i * 7) % 90
+        month = 1 + (i * 5) % 12
+        day = 1 + (i * 11) % 28
+        hour, minute = (i * 13) % 24, (i * 17) % 60
+        charts.append((f"{year:04d}-{month:02d}-{day:02d}", f"{hour:02d}:{minute:02d}:00", lat, lon, offset))
+    return charts
+
+
+def _time_ms(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000.0
+
+
+def benchmark_tier(tier: str, charts: List[tuple], target_date: str) -> Dict[str, Any]:
+    timings = {'natal_chart': [], 'full_advanced_analysis': []}
+    for birth_date, birth_time, lat, lon, offset in charts:
+        calculator = AstrologicalCalculator(birth_date, birth_time, lat, lon, offset, depth=tier)
+        timings['natal_chart'].append(_time_ms(calculator.generate_full_natal_chart))
+
+        def advanced():
+            AdvancedTimingTechniques(calculator).analysis_sections(target_date).select()
+        timings['full_advanced_analysis'].append(_time_ms(advanced))
+
+    budgets = DEPTH_TIERS[tier]['latency_budget_ms']
+    results = {}
+    for name, samples in timings.items():
+        samples.sort()
+        median = statistics.median(samples)
+        results[name] = {
+            'median_ms': round(median, 2),
+            'p95_ms': round(samples[int(0.95 * (len(samples) - 1))], 2),
+            'budget_ms': budgets[name],
+            'within_budget': median <= budgets[name]
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check depth tier latencies against their budgets")
+    parser.add_argument('--charts', type=int, default=40, help="Sample charts per tier")
+    parser.add_argument('--tiers', nargs='+', default=list(DEPTH_TIERS), choices=list(DEPTH_TIERS))
+    parser.add_argument('--target-date', default=datetime.now().strftime("%Y-%m-%d"))
+    args = parser.parse_args()
+
+    charts = _sample_charts(args.charts)
+    # warm-up: ephemeris file handles and caches are opened on first use
+    benchmark_tier('deep', charts[:2], args.target_date)
+
+    report = {tier: benchmark_tier(tier, charts, args.target_date) for tier in args.tiers}
+    print(json.dumps(report, indent=2))
+
+    if not all(result['within_budget'] for tier in report.values() for result in tier.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
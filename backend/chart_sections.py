@@ -0,0 +1,164 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
+
+
+# Seconds each section may run once it has started; client-supplied timeouts are clamped to the maximum
+SECTION_TIMEOUT_SECONDS = 10.0
+MAX_SECTION_TIMEOUT_SECONDS = 60.0
+
+# Threads per select_concurrent call. Each call gets its own executor: a
+# timed-out section keeps its thread until it finishes, and on a shared pool
+# those threads would leave other requests' sections queued behind them
+SECTION_WORKERS = 8
+
+OK = 'ok'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+SKIPPED = 'skipped'
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated `fields` query parameter; None means every section"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+class LazySections:
+    """
+    Response sections evaluated on demand
+    Each section names the sections it needs; values are memoized, so an input
+    shared by several requested sections (natal planets, houses) is computed once
+    and sections nobody asked for are never computed
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, tuple] = {}
+        self._values: Dict[str, Any] = {}
+        self._resolving: List[str] = []
+        self.computed: List[str] = []
+
+    def add(self, name: str, provider: Callable, depends: Sequence[str] = (), public: bool = True):
+        """provider receives the values of `depends`, in order; private sections are inputs only"""
+        self._providers[name] = (provider, tuple(depends), public)
+        return self
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, (_, _, public) in self._providers.items() if public]
+
+    def get(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        if name in self._resolving:
+            raise ValueError(f"Circular section dependency: {' -> '.join(self._resolving + [name])}")
+
+        provider, depends, _ = self._providers[name]
+        self._resolving.append(name)
+        try:
+            value = provider(*[self.get(dependency) for dependency in depends])
+        finally:
+            self._resolving.pop()
+        self._values[name] = value
+        self.computed.append(name)
+        return value
+
+    def has(self, name: str) -> bool:
+        """Whether a section has already been computed (never triggers evaluation)"""
+        return name in self._values
+
+    def _requested(self, fields: Optional[Sequence[str]]) -> List[str]:
+        names = self.names
+        if fields is not None:
+            unknown = [field for field in fields if field not in names]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(names)}")
+            names = [name for name in names if name in fields]
+        return names
+
+    def select(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """The requested public sections (all when fields is None), in declaration order"""
+        return {name: self.get(name) for name in self._requested(fields)}
+
+    def _closure(self, names: Sequence[str]) -> List[str]:
+        """Requested sections plus everything they depend on, dependencies first"""
+        order: List[str] = []
+
+        def visit(name, path):
+            if name in order:
+                return
+            if name in path:
+                raise ValueError(f"Circular section dependency: {' -> '.join(path + [name])}")
+            for dependency in self._providers[name][1]:
+                visit(dependency, path + [name])
+            order.append(name)
+
+        for name in names:
+            visit(name, [])
+        return order
+
+    def select_concurrent(self, fields: Optional[Sequence[str]] = None,
+                          timeout: float = SECTION_TIMEOUT_SECONDS) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        select() with independent sections running concurrently on a per-call executor
+        Each section gets `timeout` seconds (clamped to MAX_SECTION_TIMEOUT_SECONDS)
+        from the moment its provider starts. A section that times out or raises is
+        reported in the status map (and sections depending on it are skipped)
+        instead of failing the whole response
+        Returns (values of the sections that completed, status per requested section)
+        """
+        timeout = min(max(timeout, 0.0), MAX_SECTION_TIMEOUT_SECONDS)
+        requested = self._requested(fields)
+        pending = [name for name in self._closure(requested) if name not in self._values]
+        status = {name: OK for name in self._values}
+        running: Dict[Any, str] = {}
+        started: Dict[str, float] = {}  # written by the worker thread as the provider starts
+
+        def run(name, provider, *args):
+            started[name] = time.monotonic()
+            return provider(*args)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(SECTION_WORKERS, len(pending))),
+                                      thread_name_prefix='chart-section')
+        try:
+            while pending or running:
+                # submit every section whose inputs are all available
+                for name in list(pending):
+                    depends = self._providers[name][1]
+                    if any(status.get(dependency) not in (None, OK) for dependency in depends):
+                        status[name] = SKIPPED
+                        pending.remove(name)
+                    elif all(status.get(dependency) == OK for dependency in depends):
+                        provider = self._providers[name][0]
+                        future = executor.submit(run, name, provider, *[self._values[d] for d in depends])
+                        running[future] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+
+                # queued sections have no deadline yet; poll until the next running one's
+                deadlines = [started[name] + timeout for name in running.values() if name in started]
+                wait_for = min(deadlines) - time.monotonic() if deadlines else timeout
+                done, _ = wait(list(running), timeout=min(max(wait_for, 0), timeout),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self._values[name] = future.result()
+                        self.computed.append(name)
+                        status[name] = OK
+                    except Exception as e:
+                        status[name] = f"{ERROR}: {e}"
+                now = time.monotonic()
+                for future, name in list(running.items()):
+                    if name in started and started[name] + timeout <= now:
+                        # the thread cannot be interrupted; its result is simply discarded
+                        running.pop(future)
+                        status[name] = TIMEOUT
+        finally:
+            # do not wait for timed-out sections still running
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        values = {name: self._values[name] for name in requested if status.get(name) == OK}
+        return values, {name: status[name] for name in requested}
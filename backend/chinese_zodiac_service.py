@@ -1,9 +1,17 @@
-def get_chinese_zodiac(year):
-    """Determines the Chinese Zodiac sign for a given year."""
-    animals = [
-        'Monkey', 'Rooster', 'Dog', 'Pig', 'Rat', 'Ox', 
-        'Tiger', 'Rabbit', 'Dragon', 'Snake', 'Horse', 'Goat'
-    ]
-    
-    start_year = 1900  # Year of the Rat
-    return animals[(year - start_year) % 12]
\ No newline at end of file
+from lunisolar import get_lunisolar_calendar, year_sign
+
+
+def get_chinese_zodiac(year, month=None, day=None):
+    """
+    Determines the Chinese Zodiac sign for a birth date.
+    The sign changes at Chinese New Year, so January and early-February births
+    belong to the previous year's animal; month and day are needed to tell.
+    Without them, or outside the 1900-2100 calendar table, the animal of the
+    lunar year beginning in `year` is returned.
+    """
+    if month is not None and day is not None:
+        try:
+            year = get_lunisolar_calendar().to_lunar(f"{year:04d}-{month:02d}-{day:02d}")['lunar_year']
+        except ValueError:
+            pass
+    return year_sign(year)['animal']
@@ -0,0 +1,59 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Any, Optional, Sequence
+
+
+def _available_cores() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))  # honours container CPU pinning
+    return os.cpu_count() or 1
+
+
+# Worker processes for range analyses; defaults to one per available core
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", "0")) or _available_cores()
+
+# Ranges shorter than this many days per chunk run in the calling process:
+# below it, shipping work to the pool costs more than it saves
+MIN_CHUNK_DAYS = 60
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def chunk_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every range analysis, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the API process runs threads (request threadpool,
+            # section pool) whose locks fork would copy mid-state
+            _pool = ProcessPoolExecutor(CHUNK_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def split_range(items: Sequence, workers: int = CHUNK_WORKERS, min_size: int = MIN_CHUNK_DAYS) -> List[list]:
+    """
+    Contiguous chunks in order, about two per worker so a slow chunk does not
+    leave the other workers idle; a single chunk when the range is short or
+    there is only one worker
+    """
+    items = list(items)
+    count = max(1, min(workers * 2, len(items) // min_size)) if workers > 1 else 1
+    size = math.ceil(len(items) / count) if items else 1
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def map_chunks(func: Callable, chunks: List[list], *args) -> List[Any]:
+    """
+    func(*args, chunk) for every chunk, across the pool when there is more than
+    one; results come back in chunk order whatever order the workers finish in
+    func must be a module-level function (it is pickled by name)
+    """
+    if len(chunks) <= 1:
+        return [func(*args, chunk) for chunk in chunks]
+    pool = chunk_pool()
+    futures = [pool.submit(func, *args, chunk) for chunk in chunks]
+    return [future.result() for future in futures]
@@ -0,0 +1,96 @@
+from typing import Dict, Any, Optional
+import swisseph as swe
+
+
+# ============= BODIES =============
+
+MAJOR_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn',
+                'uranus', 'neptune', 'pluto', 'north_node']
+
+ASTEROID_IDS = {
+    'ceres': swe.CERES,
+    'pallas': swe.PALLAS,
+    'juno': swe.JUNO,
+    'vesta': swe.VESTA
+}
+
+# ============= ASPECTS (angle, orb) =============
+
+MAJOR_ASPECTS = {
+    'conjunction': (0, 8),
+    'sextile': (60, 6),
+    'square': (90, 8),
+    'trine': (120, 8),
+    'opposition': (180, 8)
+}
+
+STANDARD_ASPECTS = dict(MAJOR_ASPECTS, quincunx=(150, 3))
+
+MINOR_ASPECTS = {
+    'semisextile': (30, 2),
+    'semisquare': (45, 2),
+    'quintile': (72, 2),
+    'sesquiquadrate': (135, 2),
+    'biquintile': (144, 2)
+}
+
+HOUSE_SYSTEMS = {
+    'placidus': 'P',
+    'koch': 'K',
+    'regiomontanus': 'R',
+    'campanus': 'C',
+    'equal': 'E',
+    'whole_sign': 'W'
+}
+
+# ============= TIERS =============
+# latency_budget_ms: median wall time per chart, checked by benchmark_depth.py
+
+DEPTH_TIERS = {
+    'fast': {
+        'ephemeris': 'moshier',  # analytic, no .se1 file reads
+        'bodies': MAJOR_BODIES,
+        'asteroids': False,
+        'aspects': MAJOR_ASPECTS,
+        'house_systems': False,
+        'sub_period_timelines': False,
+        'latency_budget_ms': {'natal_chart': 2, 'full_advanced_analysis': 15}
+    },
+    'standard': {
+        'ephemeris': 'swiss',
+        'bodies': None,  # every body in PLANET_IDS
+        'asteroids': False,
+        'aspects': STANDARD_ASPECTS,
+        'house_systems': False,
+        'sub_period_timelines': False,
+        'latency_budget_ms': {'natal_chart': 3, 'full_advanced_analysis': 20}
+    },
+    'deep': {
+        'ephemeris': 'swiss',
+        'bodies': None,
+        'asteroids': True,
+        'aspects': dict(STANDARD_ASPECTS, **MINOR_ASPECTS),
+        'house_systems': True,
+        'sub_period_timelines': True,
+        'latency_budget_ms': {'natal_chart': 5, 'full_advanced_analysis': 25}
+    }
+}
+
+# BirthData.depth values (as sent by the frontend) -> tier
+DEPTH_ALIASES = {
+    'quick': 'fast',
+    'fast': 'fast',
+    'standard': 'standard',
+    'advanced': 'deep',
+    'all systems (deep dive)': 'deep',
+    'deep': 'deep'
+}
+
+
+def resolve_depth(depth: Optional[str]) -> str:
+    """Tier name for a BirthData.depth value; unrecognised values get the standard tier"""
+    return DEPTH_ALIASES.get((depth or 'standard').strip().lower(), 'standard')
+
+
+def depth_tier(depth: Optional[str]) -> Dict[str, Any]:
+    return DEPTH_TIERS[resolve_depth(depth)]
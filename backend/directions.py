@@ -0,0 +1,225 @@
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+from ephemeris_series import body_positions
+from forensic_scanner import jd_to_date
+from progressions import TROPICAL_YEAR_DAYS, SAMPLES_PER_YEAR
+
+
+DIRECTED_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+NATAL_POINTS = DIRECTED_BODIES + ['asc', 'mc']
+
+DIRECTION_ASPECTS = {
+    'conjunction': 0, 'sextile': 60, 'square': 90, 'trine': 120, 'opposition': 180
+}
+
+# Degrees of primary arc per year of life
+TIME_KEYS = {
+    'naibod': 0.98564733,   # mean daily motion of the Sun
+    'ptolemy': 1.0
+}
+
+
+def _equatorial(longitudes, obliquity: float):
+    """RA and declination of ecliptic longitudes (latitude 0), degrees"""
+    lam = np.radians(longitudes)
+    eps = np.radians(obliquity)
+    ra = np.degrees(np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam))) % 360.0
+    dec = np.degrees(np.arcsin(np.sin(eps) * np.sin(lam)))
+    return ra, dec
+
+
+def _semi_arcs(dec, lat: float):
+    """Diurnal and nocturnal semi-arcs; circumpolar points are clamped just inside the horizon"""
+    tangent = np.clip(np.tan(np.radians(dec)) * np.tan(np.radians(lat)), -1.0, 1.0)
+    ascensional_difference = np.degrees(np.arcsin(tangent))
+    diurnal = np.clip(90.0 + ascensional_difference, 1e-6, 180.0 - 1e-6)
+    return diurnal, 180.0 - diurnal
+
+
+def _mundane_position(hour_angle, diurnal, nocturnal):
+    """
+    Placidian proportional position: hour angle rescaled so the semi-arcs
+    become 90° (MC 0, DSC +90, IC ±180, ASC -90)
+    """
+    upper = 90.0 * hour_angle / diurnal
+    west = 90.0 + 90.0 * (hour_angle - diurnal) / nocturnal
+    east = -90.0 - 90.0 * (-hour_angle - diurnal) / nocturnal
+    return np.where(np.abs(hour_angle) <= diurnal, upper, np.where(hour_angle > 0, west, east))
+
+
+def _hour_angle_at(mundane, diurnal, nocturnal):
+    """Inverse of _mundane_position for a point with the given semi-arcs"""
+    upper = mundane * diurnal / 90.0
+    west = diurnal + (mundane - 90.0) * nocturnal / 90.0
+    east = -diurnal - (-mundane - 90.0) * nocturnal / 90.0
+    return np.where(np.abs(mundane) <= 90.0, upper, np.where(mundane > 0, west, east))
+
+
+class DirectionsEngine:
+    """
+    Solar arc and primary (Placidus semi-arc) directions over a lifetime
+    Every directed aspect to every natal point is solved in closed form
+    on arrays, so the full list comes from a single call
+    """
+
+    def __init__(self, natal_calculator, house_system: str = 'P'):
+        """Initialize with a base AstrologicalCalculator instance"""
+        self.calc = natal_calculator
+        self.natal_jd = self.calc.julian_day
+        self.natal_planets = self.calc.calculate_planets()
+        houses = self.calc.calculate_houses(house_system)
+
+        self.natal = {name: self.natal_planets[name]['longitude'] for name in DIRECTED_BODIES}
+        self.natal['asc'] = houses['asc']
+        self.natal['mc'] = houses['mc']
+        self.armc = houses['armc']
+
+        nutation, _ = swe.calc_ut(self.natal_jd, swe.ECL_NUT)
+        self.obliquity = nutation[0]
+
+    def _aspect_targets(self, aspects: Dict[str, float]):
+        """Every (natal point, aspect, target longitude offset) combination, as arrays"""
+        names, aspect_names, offsets = [], [], []
+        for natal_name in NATAL_POINTS:
+            for aspect_name, angle in aspects.items():
+                for offset in sorted({angle % 360.0, -angle % 360.0}):
+                    names.append(natal_name)
+                    aspect_names.append(aspect_name)
+                    offsets.append(offset)
+        return names, aspect_names, np.array(offsets)
+
+    def _reference_age(self, reference_date: Optional[str]) -> float:
+        reference = datetime.strptime(reference_date, "%Y-%m-%d") if reference_date else datetime.now()
+        reference_jd = swe.julday(reference.year, reference.month, reference.day, 12)
+        return (reference_jd - self.natal_jd) / TROPICAL_YEAR_DAYS
+
+    def _event(self, technique: str, age: float, age_now: float, arc: float, arc_now: float,
+               **details) -> Dict[str, Any]:
+        # directed arcs only grow with time, so anything still ahead is applying
+        event = {
+            'technique': technique,
+            'date': jd_to_date(self.natal_jd + age * TROPICAL_YEAR_DAYS),
+            'age': round(age, 3),
+            'arc': arc,
+            'status': 'applying' if age > age_now else 'separating',
+            'orb': abs(arc - arc_now)
+        }
+        event.update(details)
+        return event
+
+    # ============= SOLAR ARC =============
+
+    def _solar_arc_curve(self, years: int):
+        """Solar arc (unwrapped progressed Sun minus natal Sun) sampled monthly"""
+        ages = np.arange(years * SAMPLES_PER_YEAR + 1) / SAMPLES_PER_YEAR
+        sun, _ = body_positions(swe.SUN, self.natal_jd + ages)
+        arcs = np.degrees(np.unwrap(np.radians(sun))) - sun[0]
+        return ages, arcs
+
+    def solar_arc_directions(self, years: int = 100, reference_date: Optional[str] = None,
+                             aspects: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """
+        Every point moved by the solar arc, aspecting every natal point
+        The arc grows monotonically, so each exact date is an inversion of the arc curve
+        """
+        aspects = aspects if aspects is not None else DIRECTION_ASPECTS
+        ages, arcs = self._solar_arc_curve(years)
+        age_now = self._reference_age(reference_date)
+        arc_now = float(np.interp(age_now, ages, arcs))
+
+        natal_names, aspect_names, offsets = self._aspect_targets(aspects)
+        natal_lons = np.array([self.natal[name] for name in natal_names])
+        directed_lons = np.array([self.natal[name] for name in NATAL_POINTS])
+
+        # arc needed for directed point i to reach target j, shape (directed, targets)
+        needed = (natal_lons[None, :] + offsets[None, :] - directed_lons[:, None]) % 360.0
+        reachable = (needed > 1e-6) & (needed <= arcs[-1])
+        rows, cols = np.nonzero(reachable)
+        exact_ages = np.interp(needed[rows, cols], arcs, ages)
+
+        return [self._event('solar_arc', float(age), age_now, float(needed[row, col]), arc_now,
+                            directed=NATAL_POINTS[row], natal=natal_names[col], aspect=aspect_names[col])
+                for row, col, age in zip(rows, cols, exact_ages)]
+
+    # ============= PRIMARY DIRECTIONS =============
+
+    def _significators(self):
+        """RA, declination and hour angle of every natal point"""
+        ra, dec = _equatorial(np.array([self.natal[name] for name in NATAL_POINTS]), self.obliquity)
+        for index, name in enumerate(DIRECTED_BODIES):
+            pos = calc_body(self.natal_jd, PLANET_IDS[name], swe.FLG_EQUATORIAL)
+            ra[index], dec[index] = pos[0], pos[1]
+        ra[NATAL_POINTS.index('mc')] = self.armc
+        hour_angle = (self.armc - ra + 180.0) % 360.0 - 180.0
+        return ra, dec, hour_angle
+
+    def _primary_key_curve(self, key: str, years: int):
+        """Primary arc as a function of age for a time key, sampled monthly"""
+        ages = np.arange(years * SAMPLES_PER_YEAR + 1) / SAMPLES_PER_YEAR
+        if key == 'solar_arc':
+            # arc of the progressed Sun in right ascension
+            sun, _ = body_positions(swe.SUN, self.natal_jd + ages)
+            ra, _ = _equatorial(sun, self.obliquity)
+            return ages, np.degrees(np.unwrap(np.radians(ra))) - ra[0]
+        return ages, ages * TIME_KEYS[key]
+
+    def primary_directions(self, years: int = 100, reference_date: Optional[str] = None,
+                           key: str = 'naibod', aspects: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """
+        Direct Placidus (semi-arc) directions of zodiacal aspect points, without
+        latitude, to every natal point in mundo
+        key: 'naibod', 'ptolemy' or 'solar_arc' (arc to years)
+        """
+        if key not in TIME_KEYS and key != 'solar_arc':
+            raise ValueError(f"Unknown time key: {key}")
+        aspects = aspects if aspects is not None else DIRECTION_ASPECTS
+        latitude = self.calc.lat
+
+        _, sig_dec, sig_hour_angle = self._significators()
+        sig_diurnal, sig_nocturnal = _semi_arcs(sig_dec, latitude)
+        sig_mundane = _mundane_position(sig_hour_angle, sig_diurnal, sig_nocturnal)
+
+        # promissors: each body's zodiacal aspect points
+        promissors, aspect_names, points = [], [], []
+        for name in DIRECTED_BODIES:
+            for aspect_name, angle in aspects.items():
+                for offset in sorted({angle % 360.0, -angle % 360.0}):
+                    promissors.append(name)
+                    aspect_names.append(aspect_name)
+                    points.append((self.natal[name] + offset) % 360.0)
+        pro_ra, pro_dec = _equatorial(np.array(points), self.obliquity)
+        pro_hour_angle = (self.armc - pro_ra + 180.0) % 360.0 - 180.0
+        pro_diurnal, pro_nocturnal = _semi_arcs(pro_dec, latitude)
+
+        # hour angle each promissor needs to share the significator's proportional place,
+        # shape (promissors, significators); primary motion only increases hour angles
+        target_hour_angle = _hour_angle_at(sig_mundane[None, :], pro_diurnal[:, None], pro_nocturnal[:, None])
+        arcs = (target_hour_angle - pro_hour_angle[:, None]) % 360.0
+
+        curve_ages, curve_arcs = self._primary_key_curve(key, years)
+        ages = np.interp(arcs, curve_arcs, curve_ages, right=np.inf)
+        age_now = self._reference_age(reference_date)
+        arc_now = float(np.interp(age_now, curve_ages, curve_arcs))
+
+        self_conjunction = np.array([[promissor == significator and aspect == 'conjunction'
+                                      for significator in NATAL_POINTS]
+                                     for promissor, aspect in zip(promissors, aspect_names)])
+        valid = (ages <= years) & (arcs > 1e-6) & ~self_conjunction
+        rows, cols = np.nonzero(valid)
+
+        return [self._event('primary', float(ages[row, col]), age_now, float(arcs[row, col]), arc_now,
+                            promissor=promissors[row], significator=NATAL_POINTS[col],
+                            aspect=aspect_names[row], key=key)
+                for row, col in zip(rows, cols)]
+
+    def lifetime_directions(self, years: int = 100, reference_date: Optional[str] = None,
+                            key: str = 'naibod') -> List[Dict[str, Any]]:
+        """Solar arc and primary directions merged into one dated list"""
+        events = (self.solar_arc_directions(years, reference_date) +
+                  self.primary_directions(years, reference_date, key))
+        events.sort(key=lambda event: event['age'])
+        return events
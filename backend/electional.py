@@ -0,0 +1,282 @@
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+from ephemeris_series import body_positions, bisect_roots, wrap180
+from event_catalog import get_event_catalog, jd_to_iso, EventCatalog, SIGNS, LUNATION_NAMES, STATION_BODIES
+
+
+ELECTION_ASPECTS = {
+    'conjunction': 0, 'sextile': 60, 'square': 90, 'trine': 120, 'opposition': 180
+}
+
+ANGULAR_HOUSES = [1, 4, 7, 10]
+
+# Sampling used to bracket boundaries before bisection
+ASPECT_STEP_DAYS = 1.0 / 24
+HOUSE_STEP_DAYS = 10.0 / 1440
+
+MAX_WINDOW_DAYS = 366
+
+
+# ============= INTERVAL ARITHMETIC =============
+# Interval sets are sorted, non-overlapping lists of (start_jd, end_jd)
+
+def _intersect(a: List[Tuple[float, float]], b: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _complement(intervals: List[Tuple[float, float]], jd_start: float, jd_end: float) -> List[Tuple[float, float]]:
+    result = []
+    cursor = jd_start
+    for start, end in intervals:
+        if start > cursor:
+            result.append((cursor, min(start, jd_end)))
+        cursor = max(cursor, end)
+    if cursor < jd_end:
+        result.append((cursor, jd_end))
+    return result
+
+
+def _union(intervals: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _total(intervals: List[Tuple[float, float]]) -> float:
+    return sum(end - start for start, end in intervals)
+
+
+def _true_runs(jds, flags, boundary_func=None) -> List[Tuple[float, float]]:
+    """
+    Intervals where a sampled boolean is true; each edge is refined by
+    bisection on boundary_func (positive inside) when given
+    """
+    padded = np.concatenate([[False], flags, [False]]).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.nonzero(edges == 1)[0]
+    ends = np.nonzero(edges == -1)[0] - 1
+
+    start_jds = jds[starts]
+    end_jds = jds[ends]
+    if boundary_func is not None:
+        inner = starts > 0
+        start_jds[inner] = bisect_roots(boundary_func, jds[starts[inner] - 1], jds[starts[inner]])
+        inner = ends < len(jds) - 1
+        end_jds[inner] = bisect_roots(boundary_func, jds[ends[inner]], jds[ends[inner] + 1])
+    return [(float(s), float(e)) for s, e in zip(start_jds, end_jds) if e > s]
+
+
+class ElectionalSearch:
+    """
+    Finds time windows satisfying a declarative set of astrological constraints
+    Location-free constraints are read off the event catalog as interval sets
+    and intersected first; location-dependent (house) constraints are then
+    evaluated only inside the surviving candidate windows
+    """
+
+    def __init__(self, lat: float, lon: float, house_system: str = 'P',
+                 catalog: Optional[EventCatalog] = None):
+        self.lat = lat
+        self.lon = lon
+        self.house_system = house_system
+        self.catalog = catalog or get_event_catalog()
+
+    def search(self, jd_start: float, jd_end: float, constraints: Sequence[Dict[str, Any]],
+               min_duration_minutes: float = 30.0, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked windows where every required constraint holds
+        Optional constraints (required=False) add weight x fraction of the window they cover
+        """
+        if jd_end <= jd_start:
+            raise ValueError("end must be after start")
+        if jd_end - jd_start > MAX_WINDOW_DAYS:
+            raise ValueError(f"search window is limited to {MAX_WINDOW_DAYS} days")
+
+        required = [c for c in constraints if c.get('required', True)]
+        optional = [c for c in constraints if not c.get('required', True)]
+
+        # cheap catalog/ephemeris constraints first, house constraints last
+        required.sort(key=lambda c: c['type'] in ('house', 'angular'))
+        candidates = [(jd_start, jd_end)]
+        for constraint in required:
+            if not candidates:
+                break
+            candidates = self._apply(constraint, candidates, jd_start, jd_end)
+
+        min_duration = min_duration_minutes / 1440.0
+        windows = []
+        for start, end in candidates:
+            if end - start < min_duration:
+                continue
+            score = 0.0
+            satisfied = []
+            for constraint in optional:
+                covered = _total(self._apply(constraint, [(start, end)], start, end)) / (end - start)
+                score += constraint.get('weight', 1.0) * covered
+                if covered > 0:
+                    satisfied.append({'constraint': constraint, 'coverage': round(covered, 3)})
+            windows.append({
+                'start_jd': start,
+                'end_jd': end,
+                'start': jd_to_iso(start),
+                'end': jd_to_iso(end),
+                'duration_minutes': round((end - start) * 1440.0, 1),
+                'score': round(score, 3),
+                'optional_satisfied': satisfied
+            })
+
+        windows.sort(key=lambda w: (-w['score'], -w['duration_minutes'], w['start_jd']))
+        return windows[:limit]
+
+    def _apply(self, constraint: Dict[str, Any], candidates: List[Tuple[float, float]],
+               jd_start: float, jd_end: float) -> List[Tuple[float, float]]:
+        """Restrict candidate windows to where one constraint holds (or fails, if negated)"""
+        handlers = {
+            'direct': self._motion_intervals,
+            'retrograde': self._motion_intervals,
+            'void_of_course': self._void_intervals,
+            'sign': self._sign_intervals,
+            'lunar_phase': self._phase_intervals,
+            'aspect': self._aspect_intervals,
+            'house': self._house_intervals,
+            'angular': self._house_intervals
+        }
+        if constraint['type'] not in handlers:
+            raise ValueError(f"Unknown constraint type: {constraint['type']}")
+
+        if constraint['type'] in ('house', 'angular'):
+            # location-dependent: evaluated only within the candidates
+            holds = []
+            for start, end in candidates:
+                holds += handlers[constraint['type']](constraint, start, end)
+        else:
+            holds = handlers[constraint['type']](constraint, jd_start, jd_end)
+
+        if constraint.get('negate', False):
+            holds = _complement(holds, jd_start, jd_end)
+        return _intersect(candidates, holds)
+
+    # ============= CATALOG CONSTRAINTS =============
+
+    def _segments(self, jd_start: float, jd_end: float, initial, changes: List[Tuple[float, Any]]):
+        """Split [jd_start, jd_end) into (start, end, state) runs from a state and its change events"""
+        segments = []
+        cursor, state = jd_start, initial
+        for jd, new_state in changes:
+            if jd >= jd_end:
+                break
+            if jd > cursor:
+                segments.append((cursor, jd, state))
+            cursor, state = max(cursor, jd), new_state
+        segments.append((cursor, jd_end, state))
+        return segments
+
+    def _motion_intervals(self, constraint, jd_start, jd_end):
+        body = constraint['body']
+        if body not in STATION_BODIES:
+            # Sun and Moon never station
+            return [(jd_start, jd_end)] if constraint['type'] == 'direct' else []
+
+        stations = self.catalog.query(jd_start, jd_end, ['station'], [body])
+        changes = [(event['jd'], event['station'] == 'retrograde') for event in stations]
+        segments = self._segments(jd_start, jd_end, self.catalog.is_retrograde(body, jd_start), changes)
+        want_retrograde = constraint['type'] == 'retrograde'
+        return [(s, e) for s, e, retrograde in segments if retrograde == want_retrograde]
+
+    def _void_intervals(self, constraint, jd_start, jd_end):
+        return [(max(p['start_jd'], jd_start), min(p['end_jd'], jd_end))
+                for p in self.catalog.void_of_course(jd_start, jd_end)]
+
+    def _sign_intervals(self, constraint, jd_start, jd_end):
+        body = constraint['body']
+        signs = set(constraint.get('signs') or [])
+        initial = SIGNS[int(calc_body(jd_start, PLANET_IDS[body])[0] / 30) % 12]
+        ingresses = self.catalog.query(jd_start, jd_end, ['ingress'], [body])
+        segments = self._segments(jd_start, jd_end, initial, [(e['jd'], e['sign']) for e in ingresses])
+        return [(s, e) for s, e, sign in segments if sign in signs]
+
+    def _phase_intervals(self, constraint, jd_start, jd_end):
+        """
+        phases: any of new_moon, first_quarter, full_moon, last_quarter (the quarter
+        that begins with that lunation), or waxing / waning
+        """
+        wanted = set()
+        for phase in constraint.get('phases') or []:
+            if phase == 'waxing':
+                wanted.update(['new_moon', 'first_quarter'])
+            elif phase == 'waning':
+                wanted.update(['full_moon', 'last_quarter'])
+            else:
+                wanted.add(phase)
+
+        elongation = (calc_body(jd_start, swe.MOON)[0] - calc_body(jd_start, swe.SUN)[0]) % 360.0
+        initial = LUNATION_NAMES[int(elongation / 90) % 4]
+        lunations = self.catalog.query(jd_start, jd_end, ['lunation'])
+        segments = self._segments(jd_start, jd_end, initial, [(e['jd'], e['phase']) for e in lunations])
+        return [(s, e) for s, e, phase in segments if phase in wanted]
+
+    # ============= EPHEMERIS CONSTRAINTS =============
+
+    def _aspect_intervals(self, constraint, jd_start, jd_end):
+        """Where body and body2 are within orb of any of the listed aspects"""
+        first, second = PLANET_IDS[constraint['body']], PLANET_IDS[constraint['body2']]
+        orb = constraint.get('orb', 3.0)
+        angles = [ELECTION_ASPECTS[name] for name in constraint.get('aspects') or ELECTION_ASPECTS]
+
+        jds = np.arange(jd_start, jd_end + ASPECT_STEP_DAYS, ASPECT_STEP_DAYS)
+        jds[-1] = min(jds[-1], jd_end)
+
+        intervals = []
+        for angle in angles:
+            def margin(t, angle=angle):
+                separation = np.abs(wrap180(body_positions(first, t)[0] - body_positions(second, t)[0]))
+                return orb - np.abs(separation - angle)
+            intervals += _true_runs(jds, margin(jds) >= 0, margin)
+        return _union(intervals)
+
+    def _house_intervals(self, constraint, jd_start, jd_end):
+        """Where a body sits in one of the listed houses at this location"""
+        houses = set(ANGULAR_HOUSES if constraint['type'] == 'angular' else constraint.get('houses') or [])
+        planet_id = PLANET_IDS[constraint['body']]
+        system = bytes(self.house_system, 'utf-8')
+
+        def house_of(t):
+            positions = np.empty(len(t))
+            for i, jd in enumerate(np.atleast_1d(t)):
+                armc = (swe.sidtime(float(jd)) * 15.0 + self.lon) % 360.0
+                obliquity = swe.calc_ut(float(jd), swe.ECL_NUT)[0][0]
+                pos = calc_body(float(jd), planet_id)
+                positions[i] = swe.house_pos(armc, self.lat, obliquity, (pos[0], pos[1]), system)
+            return positions
+
+        jds = np.arange(jd_start, jd_end + HOUSE_STEP_DAYS, HOUSE_STEP_DAYS)
+        jds[-1] = min(jds[-1], jd_end)
+        inside = np.isin(np.floor(house_of(jds)).astype(int), list(houses))
+
+        # boundary: signed distance (in house units) to the nearest cusp, positive inside
+        def margin(t):
+            position = house_of(t)
+            number = np.floor(position).astype(int)
+            fraction = position - number
+            distance = np.minimum(fraction, 1.0 - fraction)
+            return np.where(np.isin(number, list(houses)), distance, -distance)
+
+        return _true_runs(jds, inside, margin)
@@ -0,0 +1,133 @@
+from functools import lru_cache
+from typing import Callable, Tuple
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+
+
+# Knot spacing in days for each body; positions between knots come from
+# cubic Hermite interpolation on longitude and speed (error far below 0.01°)
+KNOT_STEP_DAYS = {
+    swe.MOON: 0.5,
+    swe.SUN: 1.0,
+    swe.MERCURY: 1.0,
+    swe.VENUS: 1.0,
+    swe.MARS: 2.0,
+    swe.JUPITER: 4.0,
+    swe.SATURN: 4.0,
+    swe.URANUS: 8.0,
+    swe.NEPTUNE: 8.0,
+    swe.PLUTO: 8.0,
+    swe.TRUE_NODE: 1.0,
+    swe.CHIRON: 4.0
+}
+
+# Knots are fetched in aligned blocks so overlapping requests share the cache
+KNOT_BLOCK = 256
+
+# Halvings applied to a bracketed root; 24 narrows a one-day bracket to ~5 ms
+BISECTION_STEPS = 24
+
+
+@lru_cache(maxsize=1024)
+def _knot_block(planet_id: int, block: int, step: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ephemeris samples (jd, longitude, speed) for one aligned block of knots"""
+    jds = (np.arange(KNOT_BLOCK + 1) + block * KNOT_BLOCK) * step
+    lons = np.empty(len(jds))
+    speeds = np.empty(len(jds))
+    for i, jd in enumerate(jds):
+        pos = calc_body(float(jd), planet_id, swe.FLG_SPEED)
+        lons[i], speeds[i] = pos[0], pos[3]
+    return jds, lons, speeds
+
+
+def body_knots(planet_id: int, jd_start: float, jd_end: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ephemeris knots covering [jd_start, jd_end]
+    Longitudes are unwrapped (continuous across 0° Aries)
+    """
+    step = KNOT_STEP_DAYS.get(planet_id, 1.0)
+    first = int(np.floor(jd_start / step)) // KNOT_BLOCK
+    last = int(np.floor(jd_end / step)) // KNOT_BLOCK
+
+    blocks = [_knot_block(planet_id, block, step) for block in range(first, last + 1)]
+    jds = np.concatenate([b[0][:-1] for b in blocks] + [blocks[-1][0][-1:]])
+    lons = np.concatenate([b[1][:-1] for b in blocks] + [blocks[-1][1][-1:]])
+    speeds = np.concatenate([b[2][:-1] for b in blocks] + [blocks[-1][2][-1:]])
+    return jds, np.degrees(np.unwrap(np.radians(lons))), speeds
+
+
+def body_positions(planet_id: int, jds) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Longitude (0-360) and speed of a body at many UT Julian Days in one batch
+    """
+    jds = np.asarray(jds, dtype=float)
+    knot_jds, knot_lons, knot_speeds = body_knots(planet_id, float(jds.min()), float(jds.max()))
+    step = knot_jds[1] - knot_jds[0]
+
+    index = np.clip(np.searchsorted(knot_jds, jds, side='right') - 1, 0, len(knot_jds) - 2)
+    s = (jds - knot_jds[index]) / step
+    p0, p1 = knot_lons[index], knot_lons[index + 1]
+    m0, m1 = knot_speeds[index] * step, knot_speeds[index + 1] * step
+
+    s2, s3 = s * s, s * s * s
+    lons = ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * m0 +
+            (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * m1)
+    speeds = ((6 * s2 - 6 * s) * p0 + (3 * s2 - 4 * s + 1) * m0 +
+              (-6 * s2 + 6 * s) * p1 + (3 * s2 - 2 * s) * m1) / step
+
+    return lons % 360.0, speeds
+
+
+def named_positions(name: str, jds) -> Tuple[np.ndarray, np.ndarray]:
+    """body_positions() by the body names used in chart responses"""
+    return body_positions(PLANET_IDS[name], jds)
+
+
+def julian_day_range(jd_start: float, count: int, step: float = 1.0) -> np.ndarray:
+    """`count` UT Julian Days from jd_start, `step` days apart"""
+    return jd_start + np.arange(count) * step
+
+
+# ============= ROOT FINDING =============
+
+def wrap180(values):
+    """Angles folded into [-180, 180)"""
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def bisect_roots(func: Callable, lo, hi, steps: int = BISECTION_STEPS):
+    """
+    Vectorized bisection for many bracketed roots at once
+    func maps an array of JDs to values whose sign differs between lo and hi
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    if len(lo) == 0:
+        return lo
+    f_lo = func(lo)
+    for _ in range(steps):
+        mid = (lo + hi) / 2.0
+        f_mid = func(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+    return (lo + hi) / 2.0
+
+
+def boundary_crossings(values, grid, boundaries):
+    """
+    Brackets where a sampled 0-360 quantity moves from one band of the sorted
+    `boundaries` into a neighbouring one (either direction)
+    Returns (lo, hi, boundary crossed, band index entered)
+    """
+    count = len(boundaries)
+    # values below the first boundary belong to the last band (wrapping past 360)
+    band = (np.searchsorted(boundaries, values, side='right') - 1) % count
+    changed = np.nonzero(band[1:] != band[:-1])[0]
+
+    forward = (band[changed + 1] - band[changed]) % count == 1
+    crossed = np.where(forward, band[changed + 1], band[changed])
+    return grid[changed], grid[changed + 1], boundaries[crossed], band[changed + 1]
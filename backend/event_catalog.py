@@ -0,0 +1,257 @@
+import os
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS
+from ephemeris_series import body_positions, bisect_roots, boundary_crossings, wrap180
+from table_store import save_arrays, load_or_build
+
+
+CATALOG_PATH = os.getenv("EVENT_CATALOG_PATH",
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'event_catalog.npz'))
+
+CATALOG_START_YEAR = 1900
+CATALOG_END_YEAR = 2100
+CATALOG_JD_START = swe.julday(CATALOG_START_YEAR, 1, 1, 0.0)
+CATALOG_JD_END = swe.julday(CATALOG_END_YEAR + 1, 1, 1, 0.0)
+
+# Bodies covered by the catalog, indexed by position in this list
+CATALOG_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+STATION_BODIES = ['mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+VOC_BODIES = ['sun', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+# Event kinds and the meaning of their `value` column
+STATION = 0     # value: 0 = stations retrograde, 1 = stations direct
+INGRESS = 1     # value: sign index entered (0 = Aries)
+LUNATION = 2    # value: 0 new, 1 first quarter, 2 full, 3 last quarter
+KIND_NAMES = {STATION: 'station', INGRESS: 'ingress', LUNATION: 'lunation'}
+LUNATION_NAMES = ['new_moon', 'first_quarter', 'full_moon', 'last_quarter']
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+SIGN_EDGES = np.arange(0.0, 360.0, 30.0)
+QUARTER_EDGES = np.arange(0.0, 360.0, 90.0)
+
+# Ptolemaic aspects as Moon-to-body elongations, for void-of-course periods
+MOON_ASPECT_ELONGATIONS = np.array([0.0, 60.0, 90.0, 120.0, 180.0, 240.0, 270.0, 300.0])
+
+# Years processed per pass while building; keeps the ephemeris knot cache warm
+BUILD_SPAN_DAYS = 3653.0
+
+
+def _longitude(name: str):
+    planet_id = PLANET_IDS[name]
+    return lambda jds: body_positions(planet_id, jds)[0]
+
+
+def _speed(name: str):
+    planet_id = PLANET_IDS[name]
+    return lambda jds: body_positions(planet_id, jds)[1]
+
+
+def _elongation(name: str):
+    """Moon minus body, 0-360"""
+    moon, body = PLANET_IDS['moon'], PLANET_IDS[name]
+    return lambda jds: (body_positions(moon, jds)[0] - body_positions(body, jds)[0]) % 360.0
+
+
+class EventCatalog:
+    """
+    Precomputed stations, sign ingresses, lunations and void-of-course
+    Moon periods for 1900-2100, held as sorted arrays so a date range is
+    a binary search and a slice
+    """
+
+    def __init__(self, jd, kind, body, value, voc_start, voc_end):
+        self.jd = jd
+        self.kind = kind
+        self.body = body
+        self.value = value
+        self.voc_start = voc_start
+        self.voc_end = voc_end
+
+    # ============= BUILD / STORAGE =============
+
+    @classmethod
+    def build(cls, start_year: int = CATALOG_START_YEAR, end_year: int = CATALOG_END_YEAR) -> 'EventCatalog':
+        """Find every event by sampling then bisecting on the interpolated ephemeris"""
+        jd_start = swe.julday(start_year, 1, 1, 0.0)
+        jd_end = swe.julday(end_year + 1, 1, 1, 0.0)
+
+        columns = {'jd': [], 'kind': [], 'body': [], 'value': []}
+        moon_aspects = []
+
+        def add(jds, kind, body, values):
+            columns['jd'].append(jds)
+            columns['kind'].append(np.full(len(jds), kind, dtype=np.int8))
+            columns['body'].append(np.full(len(jds), body, dtype=np.int8))
+            columns['value'].append(np.asarray(values, dtype=np.int8))
+
+        span_start = jd_start
+        while span_start < jd_end:
+            span_end = min(span_start + BUILD_SPAN_DAYS, jd_end)
+            daily = np.arange(span_start, span_end + 1.0, 1.0)
+            half_daily = np.arange(span_start, span_end + 0.5, 0.5)
+
+            for body_index, name in enumerate(CATALOG_BODIES):
+                grid = half_daily if name == 'moon' else daily
+                longitude = _longitude(name)
+                lo, hi, boundary, entered = boundary_crossings(longitude(grid), grid, SIGN_EDGES)
+                keep = lo < span_end
+                lo, hi, boundary, entered = lo[keep], hi[keep], boundary[keep], entered[keep]
+                roots = bisect_roots(lambda jds, b=boundary: wrap180(longitude(jds) - b), lo, hi)
+                add(roots, INGRESS, body_index, entered)
+
+                if name in STATION_BODIES:
+                    speed = _speed(name)(daily)
+                    flips = np.nonzero(np.sign(speed[1:]) != np.sign(speed[:-1]))[0]
+                    flips = flips[daily[flips] < span_end]
+                    roots = bisect_roots(_speed(name), daily[flips], daily[flips + 1])
+                    direct = speed[flips] < 0  # slowing from retrograde motion
+                    add(roots, STATION, body_index, direct.astype(int))
+
+            # lunations: Moon-Sun elongation crossing each quarter
+            elongation = _elongation('sun')
+            lo, hi, boundary, entered = boundary_crossings(elongation(half_daily), half_daily, QUARTER_EDGES)
+            keep = lo < span_end
+            roots = bisect_roots(lambda jds, b=boundary[keep]: wrap180(elongation(jds) - b), lo[keep], hi[keep])
+            add(roots, LUNATION, CATALOG_BODIES.index('moon'), entered[keep])
+
+            # exact Moon aspects, only needed to bound void-of-course periods
+            for name in VOC_BODIES:
+                elongation = _elongation(name)
+                lo, hi, boundary, _ = boundary_crossings(elongation(half_daily), half_daily, MOON_ASPECT_ELONGATIONS)
+                keep = lo < span_end
+                moon_aspects.append(bisect_roots(lambda jds, b=boundary[keep], f=elongation: wrap180(f(jds) - b),
+                                                  lo[keep], hi[keep]))
+
+            span_start = span_end
+
+        jd = np.concatenate(columns['jd'])
+        order = np.argsort(jd, kind='stable')
+        kind = np.concatenate(columns['kind'])[order]
+        body = np.concatenate(columns['body'])[order]
+        value = np.concatenate(columns['value'])[order]
+        jd = jd[order]
+
+        voc_start, voc_end = cls._void_of_course(jd, kind, body, np.sort(np.concatenate(moon_aspects)))
+        return cls(jd, kind, body, value, voc_start, voc_end)
+
+    @staticmethod
+    def _void_of_course(jd, kind, body, moon_aspects):
+        """From the Moon's last exact aspect in a sign until its next ingress"""
+        moon = CATALOG_BODIES.index('moon')
+        ingresses = jd[(kind == INGRESS) & (body == moon)]
+        if len(ingresses) < 2:
+            return np.empty(0), np.empty(0)
+
+        previous, current = ingresses[:-1], ingresses[1:]
+        last_aspect_index = np.searchsorted(moon_aspects, current, side='left') - 1
+        last_aspect = np.where(last_aspect_index >= 0, moon_aspects[np.maximum(last_aspect_index, 0)], -np.inf)
+        # no aspect at all while in the sign: void for the whole passage
+        start = np.where(last_aspect > previous, last_aspect, previous)
+        return start, current
+
+    def save(self, path: str = CATALOG_PATH):
+        save_arrays(path, jd=self.jd, kind=self.kind, body=self.body, value=self.value,
+                            voc_start=self.voc_start, voc_end=self.voc_end)
+
+    @classmethod
+    def load(cls, path: str = CATALOG_PATH) -> 'EventCatalog':
+        with np.load(path) as data:
+            return cls(data['jd'], data['kind'], data['body'], data['value'],
+                       data['voc_start'], data['voc_end'])
+
+    # ============= QUERIES =============
+
+    @staticmethod
+    def check_range(jd_start: float, jd_end: float):
+        """Queries outside the catalog years would silently find nothing"""
+        if jd_start < CATALOG_JD_START or jd_end > CATALOG_JD_END:
+            raise ValueError(f"Event catalog covers {CATALOG_START_YEAR}-01-01 to {CATALOG_END_YEAR + 1}-01-01")
+
+    def query(self, jd_start: float, jd_end: float, kinds: Optional[Sequence[str]] = None,
+              bodies: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Events with jd_start <= jd < jd_end, optionally filtered by kind and body"""
+        self.check_range(jd_start, jd_end)
+        first = np.searchsorted(self.jd, jd_start, side='left')
+        last = np.searchsorted(self.jd, jd_end, side='left')
+        jd, kind, body, value = (self.jd[first:last], self.kind[first:last],
+                                 self.body[first:last], self.value[first:last])
+
+        mask = np.ones(len(jd), dtype=bool)
+        if kinds:
+            codes = [code for code, name in KIND_NAMES.items() if name in kinds]
+            mask &= np.isin(kind, codes)
+        if bodies:
+            mask &= np.isin(body, [CATALOG_BODIES.index(name) for name in bodies])
+
+        return [self._describe(float(j), int(k), int(b), int(v))
+                for j, k, b, v in zip(jd[mask], kind[mask], body[mask], value[mask])]
+
+    def void_of_course(self, jd_start: float, jd_end: float) -> List[Dict[str, Any]]:
+        """Void-of-course Moon periods overlapping [jd_start, jd_end)"""
+        self.check_range(jd_start, jd_end)
+        first = np.searchsorted(self.voc_end, jd_start, side='right')
+        last = np.searchsorted(self.voc_start, jd_end, side='left')
+        return [{'start_jd': float(s), 'end_jd': float(e), 'start': jd_to_iso(s), 'end': jd_to_iso(e)}
+                for s, e in zip(self.voc_start[first:last], self.voc_end[first:last])]
+
+    def is_void_of_course(self, julian_day: float) -> bool:
+        index = np.searchsorted(self.voc_start, julian_day, side='right') - 1
+        return bool(index >= 0 and julian_day < self.voc_end[index])
+
+    def is_retrograde(self, body: str, julian_day: float) -> bool:
+        """Retrograde if the body's last station before julian_day was a retrograde one"""
+        if body not in STATION_BODIES:
+            return False
+        stations = (self.kind == STATION) & (self.body == CATALOG_BODIES.index(body))
+        station_jds = self.jd[stations]
+        index = np.searchsorted(station_jds, julian_day, side='right') - 1
+        if index < 0:
+            return False
+        return bool(self.value[stations][index] == 0)
+
+    def _describe(self, jd: float, kind: int, body: int, value: int) -> Dict[str, Any]:
+        event = {
+            'jd': jd,
+            'datetime': jd_to_iso(jd),
+            'kind': KIND_NAMES[kind],
+            'body': CATALOG_BODIES[body]
+        }
+        if kind == STATION:
+            event['station'] = 'direct' if value == 1 else 'retrograde'
+        elif kind == INGRESS:
+            event['sign'] = SIGNS[value]
+        else:
+            event['phase'] = LUNATION_NAMES[value]
+        return event
+
+
+def jd_to_iso(julian_day: float) -> str:
+    """UT Julian Day to an ISO-8601 UTC timestamp (minute precision)"""
+    year, month, day, hours = swe.revjul(float(julian_day))
+    minutes = int(round(hours * 60))
+    if minutes >= 24 * 60:
+        year, month, day, _ = swe.revjul(float(julian_day) + 0.5 / 1440)
+        minutes = 0
+    return f"{year:04d}-{month:02d}-{day:02d}T{minutes // 60:02d}:{minutes % 60:02d}Z"
+
+
+_catalog: Optional[EventCatalog] = None
+
+
+def get_event_catalog() -> EventCatalog:
+    """Shared catalog, loaded from disk (built and saved first if missing)"""
+    global _catalog  # pylint: disable=global-statement
+    if _catalog is None:
+        _catalog = load_or_build(CATALOG_PATH, EventCatalog.load, EventCatalog.build)
+    return _catalog
+
+
+if __name__ == '__main__':
+    built = EventCatalog.build()
+    built.save(CATALOG_PATH)
+    print(f"Saved {len(built.jd)} events and {len(built.voc_start)} void-of-course periods to {CATALOG_PATH}")
@@ -0,0 +1,102 @@
+from typing import Dict, List, Any
+import numpy as np
+import swisseph as swe
+
+from ephemeris_series import body_positions, julian_day_range
+
+
+def jd_to_date(julian_day: float) -> str:
+    """UT Julian Day to a YYYY-MM-DD string"""
+    year, month, day, _ = swe.revjul(julian_day)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+class ForensicScanner:
+    """
+    Transit-to-natal aspect scanner over a date window
+    Only the requested transiting bodies are computed, in one batch per
+    body, and consecutive in-orb days are merged into intervals with
+    start, exact and end dates
+    """
+
+    def __init__(self, natal_longitudes: Dict[str, float], transiting: Dict[str, int],
+                 aspects: Dict[float, str]):
+        """
+        natal_longitudes: natal point name -> longitude
+        transiting: transiting body name -> Swiss Ephemeris id
+        aspects: aspect angle -> aspect name
+        """
+        self.natal_names = list(natal_longitudes.keys())
+        self.natal = np.array([natal_longitudes[name] for name in self.natal_names])
+        self.transiting = transiting
+
+        # Every target offset from a natal point: +angle and -angle (once for 0 and 180)
+        self.offsets = []
+        self.offset_names = []
+        for angle, name in aspects.items():
+            for offset in sorted({angle % 360, -angle % 360}):
+                self.offsets.append(offset)
+                self.offset_names.append(name)
+        self.offsets = np.array(self.offsets, dtype=float)
+
+    def scan(self, jd_start: float, days: int, orb: float, step: float = 1.0) -> List[Dict[str, Any]]:
+        """Aspect intervals between jd_start and jd_start + days"""
+        jds = julian_day_range(jd_start, int(days / step), step=step)
+        if len(jds) == 0:
+            return []
+
+        intervals = []
+        for body_name, planet_id in self.transiting.items():
+            lons, _ = body_positions(planet_id, jds)
+            # signed deviation from exact aspect, shape (natal points, offsets, samples)
+            deviation = (lons[None, None, :] - self.natal[:, None, None] - self.offsets[None, :, None]
+                         + 180.0) % 360.0 - 180.0
+            intervals.extend(self._merge_runs(body_name, jds, deviation, orb, step))
+
+        intervals.sort(key=lambda interval: (interval['start_jd'], interval['event']))
+        return intervals
+
+    def _merge_runs(self, body_name: str, jds, deviation, orb: float, step: float) -> List[Dict[str, Any]]:
+        """Collapse consecutive in-orb samples into intervals and locate exact hits"""
+        in_orb = np.abs(deviation) < orb
+        padded = np.pad(in_orb, ((0, 0), (0, 0), (1, 1))).astype(np.int8)
+        edges = np.diff(padded, axis=2)
+        starts = np.argwhere(edges == 1)
+        ends = np.argwhere(edges == -1)
+
+        # exact hits: sign changes of the deviation inside the orb
+        left, right = deviation[:, :, :-1], deviation[:, :, 1:]
+        crossing = (left * right <= 0) & (np.abs(left - right) < 180.0) & in_orb[:, :, :-1]
+        exact_hits = {}
+        for natal_index, offset_index, sample in np.argwhere(crossing):
+            d0 = left[natal_index, offset_index, sample]
+            d1 = right[natal_index, offset_index, sample]
+            fraction = d0 / (d0 - d1) if d0 != d1 else 0.0
+            exact_jd = jds[sample] + fraction * step
+            exact_hits.setdefault((natal_index, offset_index), []).append((sample, float(exact_jd)))
+
+        intervals = []
+        for (natal_index, offset_index, first), (_, _, stop) in zip(starts, ends):
+            last = stop - 1
+            run = np.abs(deviation[natal_index, offset_index, first:stop])
+            exact_jds = [jd for sample, jd in exact_hits.get((natal_index, offset_index), [])
+                         if first <= sample <= last]
+
+            natal_name = self.natal_names[natal_index]
+            aspect_name = self.offset_names[offset_index]
+            intervals.append({
+                'transiting': body_name,
+                'natal': natal_name,
+                'aspect': aspect_name,
+                'event': f"Transiting {body_name} {aspect_name} Natal {natal_name}",
+                'start_jd': float(jds[first]),
+                'start_date': jd_to_date(jds[first]),
+                'end_date': jd_to_date(jds[last]),
+                'exact_date': jd_to_date(exact_jds[0]) if exact_jds else None,
+                'exact_dates': [jd_to_date(jd) for jd in exact_jds],
+                'min_orb': float(run.min()),
+                'in_orb_at_window_start': bool(first == 0),
+                'in_orb_at_window_end': bool(last == len(jds) - 1)
+            })
+
+        return intervals
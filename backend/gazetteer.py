@@ -0,0 +1,274 @@
+import argparse
+import bisect
+import csv
+import heapq
+import math
+import os
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+# Bundled cities: GeoNames cities15000 (every city over 15,000 people, with
+# populations) plus the principal city of every tz database zone. A GeoNames
+# dump (cities1000.txt etc.) can be used directly instead
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cities.csv'))
+
+EARTH_RADIUS_KM = 6371.0
+
+# ISO 3166 code -> names accepted as a country qualifier ("London, United Kingdom")
+COUNTRY_NAMES = {
+    'US': ['united states', 'united states of america', 'usa'],
+    'GB': ['united kingdom', 'uk', 'great britain', 'britain', 'england', 'scotland', 'wales'],
+    'CA': ['canada'], 'AU': ['australia'], 'NZ': ['new zealand'], 'IE': ['ireland'],
+    'FR': ['france'], 'DE': ['germany'], 'IT': ['italy'], 'ES': ['spain'], 'PT': ['portugal'],
+    'NL': ['netherlands', 'holland'], 'BE': ['belgium'], 'CH': ['switzerland'], 'AT': ['austria'],
+    'SE': ['sweden'], 'NO': ['norway'], 'DK': ['denmark'], 'FI': ['finland'], 'PL': ['poland'],
+    'GR': ['greece'], 'TR': ['turkey', 'turkiye'], 'RU': ['russia'], 'UA': ['ukraine'],
+    'JP': ['japan'], 'CN': ['china'], 'HK': ['hong kong'], 'TW': ['taiwan'], 'KR': ['south korea', 'korea'],
+    'IN': ['india'], 'PK': ['pakistan'], 'SG': ['singapore'], 'TH': ['thailand'], 'PH': ['philippines'],
+    'ID': ['indonesia'], 'IL': ['israel'], 'AE': ['united arab emirates', 'uae'], 'EG': ['egypt'],
+    'ZA': ['south africa'], 'NG': ['nigeria'], 'KE': ['kenya'], 'MX': ['mexico'], 'BR': ['brazil'],
+    'AR': ['argentina'], 'CL': ['chile'], 'CO': ['colombia'], 'PE': ['peru']
+}
+
+# Region names accepted as an admin1 qualifier ("Springfield, Illinois"), keyed
+# by the codes kept in the admin1 column
+REGION_NAMES = {
+    'US': {
+        'AL': 'alabama', 'AK': 'alaska', 'AZ': 'arizona', 'AR': 'arkansas', 'CA': 'california',
+        'CO': 'colorado', 'CT': 'connecticut', 'DE': 'delaware', 'DC': 'district of columbia',
+        'FL': 'florida', 'GA': 'georgia', 'HI': 'hawaii', 'ID': 'idaho', 'IL': 'illinois', 'IN': 'indiana',
+        'IA': 'iowa', 'KS': 'kansas', 'KY': 'kentucky', 'LA': 'louisiana', 'ME': 'maine', 'MD': 'maryland',
+        'MA': 'massachusetts', 'MI': 'michigan', 'MN': 'minnesota', 'MS': 'mississippi', 'MO': 'missouri',
+        'MT': 'montana', 'NE': 'nebraska', 'NV': 'nevada', 'NH': 'new hampshire', 'NJ': 'new jersey',
+        'NM': 'new mexico', 'NY': 'new york', 'NC': 'north carolina', 'ND': 'north dakota', 'OH': 'ohio',
+        'OK': 'oklahoma', 'OR': 'oregon', 'PA': 'pennsylvania', 'RI': 'rhode island', 'SC': 'south carolina',
+        'SD': 'south dakota', 'TN': 'tennessee', 'TX': 'texas', 'UT': 'utah', 'VT': 'vermont', 'VA': 'virginia',
+        'WA': 'washington', 'WV': 'west virginia', 'WI': 'wisconsin', 'WY': 'wyoming'
+    },
+    'CA': {
+        'AB': 'alberta', 'BC': 'british columbia', 'MB': 'manitoba', 'NB': 'new brunswick',
+        'NL': 'newfoundland and labrador', 'NS': 'nova scotia', 'ON': 'ontario', 'PE': 'prince edward island',
+        'QC': 'quebec', 'SK': 'saskatchewan', 'YT': 'yukon', 'NT': 'northwest territories', 'NU': 'nunavut'
+    },
+    'AU': {
+        'ACT': 'australian capital territory', 'NSW': 'new south wales', 'NT': 'northern territory',
+        'QLD': 'queensland', 'SA': 'south australia', 'TAS': 'tasmania', 'VIC': 'victoria',
+        'WA': 'western australia'
+    },
+    'GB': {'ENG': 'england', 'SCT': 'scotland', 'WLS': 'wales', 'NIR': 'northern ireland'}
+}
+
+# GeoNames uses numeric admin1 codes for these countries; the usual abbreviations replace them
+GEONAMES_ADMIN1 = {
+    'CA': {'01': 'AB', '02': 'BC', '03': 'MB', '04': 'NB', '05': 'NL', '07': 'NS', '08': 'ON',
+           '09': 'PE', '10': 'QC', '11': 'SK', '12': 'YT', '13': 'NT', '14': 'NU'},
+    'AU': {'01': 'ACT', '02': 'NSW', '03': 'NT', '04': 'QLD', '05': 'SA', '06': 'TAS', '07': 'VIC', '08': 'WA'}
+}
+
+
+def normalize(text: str) -> str:
+    """Lower case, accents and punctuation removed: 'São Paulo' -> 'sao paulo'"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r'[^a-z0-9]+', ' ', text).strip()
+
+
+def _geonames_admin1(country: str, code: str) -> str:
+    """Readable admin1 code from a GeoNames one; other numeric codes mean nothing to users and are dropped"""
+    code = GEONAMES_ADMIN1.get(country, {}).get(code, code)
+    return code if code.isalpha() else ''
+
+
+def _read_places(path: str) -> List[Dict[str, Any]]:
+    """Bundled CSV, or a GeoNames tab-separated dump when the file ends in .txt"""
+    places = []
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith('.txt'):
+            for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                places.append({'name': row[1], 'country': row[8], 'admin1': _geonames_admin1(row[8], row[10]),
+                               'lat': float(row[4]), 'lon': float(row[5]), 'timezone': row[17],
+                               'population': int(row[14] or 0)})
+        else:
+            for row in csv.DictReader(f):
+                places.append({'name': row['name'], 'country': row['country'], 'admin1': row['admin1'],
+                               'lat': float(row['lat']), 'lon': float(row['lon']), 'timezone': row['timezone'],
+                               'population': int(row['population'] or 0)})
+    return places
+
+
+def _unit_vector(lat: float, lon: float) -> tuple:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+class _KDTree:
+    """
+    3-d tree over points on the unit sphere: nearest by chord length is nearest
+    by great-circle distance, and there is no seam at the antimeridian
+    """
+
+    def __init__(self, points: Sequence[tuple]):
+        self.points = points
+        self.root = self._build(list(range(len(points))), 0)
+
+    def _build(self, indices: List[int], depth: int):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        middle = len(indices) // 2
+        return (indices[middle], axis,
+                self._build(indices[:middle], depth + 1), self._build(indices[middle + 1:], depth + 1))
+
+    def nearest(self, target: tuple, k: int = 1) -> List[tuple]:
+        """[(chord_length, index)] of the k nearest points, closest first"""
+        heap: List[tuple] = []  # (-squared distance, index), the worst kept candidate on top
+
+        def visit(node):
+            if node is None:
+                return
+            index, axis, left, right = node
+            point = self.points[index]
+            distance = sum((a - b) ** 2 for a, b in zip(point, target))
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance, index))
+            elif distance < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance, index))
+            delta = target[axis] - point[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or delta * delta < -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return [(math.sqrt(-d), i) for d, i in sorted(heap, reverse=True)]
+
+
+class Gazetteer:
+    """
+    Offline place lookup: a sorted name index answers prefix searches with two
+    bisects, a KD-tree answers nearest-place queries
+    """
+
+    def __init__(self, places: List[Dict[str, Any]]):
+        self.places = places
+        keys = sorted((normalize(place['name']), i) for i, place in enumerate(places))
+        self._keys = [key for key, _ in keys]
+        self._order = [i for _, i in keys]
+        self._tree = _KDTree([_unit_vector(place['lat'], place['lon']) for place in places])
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> 'Gazetteer':
+        return cls(_read_places(path))
+
+    def _qualifies(self, place: Dict[str, Any], qualifiers: List[str]) -> bool:
+        """Every qualifier names the place's country (code or name) or its admin1 region"""
+        accepted = {place['country'].lower(), normalize(place['admin1'])}
+        accepted.update(COUNTRY_NAMES.get(place['country'], []))
+        region = REGION_NAMES.get(place['country'], {}).get(place['admin1'])
+        if region:
+            accepted.add(region)
+        return all(qualifier in accepted for qualifier in qualifiers)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Places whose name starts with the query, exact names first, then by population
+        'Portland, OR' / 'London, UK': parts after the first comma filter by region or country
+        """
+        name, *qualifiers = [normalize(part) for part in query.split(',')]
+        qualifiers = [q for q in qualifiers if q]
+        if not name:
+            return []
+        lo = bisect.bisect_left(self._keys, name)
+        hi = bisect.bisect_left(self._keys, name + '\x7f')
+        matches = [self.places[self._order[i]] for i in range(lo, hi)]
+        matches = [place for place in matches if self._qualifies(place, qualifiers)]
+        matches.sort(key=lambda place: (normalize(place['name']) != name, -place['population'], place['name']))
+        return matches[:limit]
+
+    def resolve(self, query: str) -> Optional[Dict[str, Any]]:
+        """Best match for a free-text birth place, or None"""
+        found = self.search(query, limit=1)
+        return found[0] if found else None
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Dict[str, Any]]:
+        """The k places closest to a coordinate, with their great-circle distance"""
+        results = []
+        for chord, index in self._tree.nearest(_unit_vector(lat, lon), k):
+            distance = 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+            results.append(dict(self.places[index], distance_km=round(distance, 3)))
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> Gazetteer:
+    """The process-wide gazetteer, loaded on first use"""
+    return Gazetteer.load()
+
+
+@lru_cache(maxsize=65536)
+def resolve_place(query: str) -> Optional[Dict[str, Any]]:
+    """Cached Gazetteer.resolve: bulk imports repeat the same birth places"""
+    return get_gazetteer().resolve(query)
+
+
+# ============= HISTORICAL UTC OFFSETS =============
+
+@lru_cache(maxsize=1024)
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+@lru_cache(maxsize=65536)
+def utc_offset_hours(tz_name: str, year: int, month: int, day: int, hour: int = 12, minute: int = 0) -> float:
+    """
+    UTC offset (hours east) in effect at a local wall time, from the zone's
+    transition history: DST rules of the day, half-hour zones, and local mean
+    time before standard time was adopted
+    """
+    local = datetime(year, month, day, hour, minute, tzinfo=_zone(tz_name))
+    return local.utcoffset().total_seconds() / 3600
+
+
+def local_utc_offset(tz_name: str, date: str, time: Optional[str] = None) -> float:
+    """utc_offset_hours for 'YYYY-MM-DD' and 'HH:MM[:SS]' strings; no time means noon"""
+    year, month, day = (int(part) for part in date.split('-'))
+    hour, minute = (int(part) for part in (time or '12:00').split(':')[:2])
+    return utc_offset_hours(tz_name, year, month, day, hour, minute)
+
+
+def write_bundled_csv(dump_path: str, path: str = GAZETTEER_PATH):
+    """
+    Regenerate the bundled CSV from a GeoNames dump, keeping bundled places the
+    dump lacks (zone cities under its population cut-off, Antarctic stations)
+    """
+    places = _read_places(dump_path)
+    def key(place):
+        return normalize(place['name']), place['country'], place['timezone']
+
+    known = {key(place) for place in places}
+    places += [place for place in _read_places(path) if key(place) not in known]
+    places.sort(key=lambda place: (place['country'], normalize(place['name'])))
+    fields = ['name', 'country', 'admin1', 'lat', 'lon', 'timezone', 'population']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+        for place in places:
+            writer.writerow({field: place[field] for field in fields})
+    return len(places)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuild cities.csv from a GeoNames dump")
+    parser.add_argument('dump', help="GeoNames cities*.txt (https://download.geonames.org/export/dump/)")
+    args = parser.parse_args()
+    print(f"Wrote {write_bundled_csv(args.dump)} places to {GAZETTEER_PATH}")
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import math
+import traceback
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+from astrological_calculator import AstrologicalCalculator, PLANET_IDS
+from progressions import LUNAR_PHASES
+
+
+# Seconds between frames; the Moon moves about 0.5' per minute
+SKY_TICK_SECONDS = 60.0
+
+# Frames buffered per subscriber; when full the oldest is dropped (latest frame wins)
+SUBSCRIBER_QUEUE_SIZE = 2
+
+# A subscriber that misses this many frames in a row is disconnected
+MAX_CONSECUTIVE_DROPS = 30
+
+
+def compute_sky(moment: datetime) -> Dict[str, Any]:
+    """Positions, aspects and Moon phase at a UTC moment"""
+    calculator = AstrologicalCalculator(moment.strftime("%Y-%m-%d"), moment.strftime("%H:%M:%S"), 0.0, 0.0, 0)
+    positions = calculator.calculate_planets()
+    elongation = (positions['moon']['longitude'] - positions['sun']['longitude']) % 360.0
+    return {
+        'timestamp': moment.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        'julian_day': calculator.julian_day,
+        'positions': positions,
+        'aspects': calculator.calculate_aspects(positions),
+        'moon_phase': {
+            'phase': LUNAR_PHASES[int(elongation / 45) % 8],
+            'elongation': elongation,
+            'illumination': (1 - math.cos(math.radians(elongation))) / 2
+        }
+    }
+
+
+def _filter_key(bodies: Optional[List[str]], aspects: bool) -> Tuple:
+    return (tuple(sorted(bodies)) if bodies else None, aspects)
+
+
+def check_bodies(bodies: Optional[List[str]]):
+    """ValueError naming any requested bodies the stream does not carry"""
+    unknown = [body for body in bodies or [] if body not in PLANET_IDS]
+    if unknown:
+        raise ValueError(f"Unknown bodies: {unknown}")
+
+
+class Subscriber:
+    """One connected client: its filter and a small bounded queue of serialized frames"""
+
+    def __init__(self, bodies: Optional[List[str]] = None, aspects: bool = True):
+        check_bodies(bodies)
+        self.key = _filter_key(bodies, aspects)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+        self.consecutive_drops = 0
+        self.closed = False
+
+    def offer(self, frame: str):
+        """Enqueue without waiting; a slow consumer loses its oldest frame, never blocks the tick"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.consecutive_drops += 1
+            if self.consecutive_drops >= MAX_CONSECUTIVE_DROPS:
+                self.closed = True
+        else:
+            self.consecutive_drops = 0
+        self.queue.put_nowait(frame)
+
+    def close(self):
+        """Stop the subscriber; a pending frames() wakes up and ends"""
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def frames(self):
+        while True:
+            frame = await self.queue.get()
+            if frame is None:
+                return
+            yield frame
+
+
+class SkyBroadcaster:
+    """
+    Computes the current sky once per tick in a background task and fans the
+    serialized frame out to every subscriber; frames are serialized once per
+    distinct filter, not once per client
+    """
+
+    def __init__(self, tick_seconds: float = SKY_TICK_SECONDS):
+        self.tick_seconds = tick_seconds
+        self.subscribers: List[Subscriber] = []
+        self.latest: Optional[Dict[str, Any]] = None
+        self._encoded: Dict[Tuple, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _encode(self, key: Tuple) -> str:
+        if key not in self._encoded:
+            bodies, include_aspects = key
+            frame = dict(self.latest)
+            if bodies:
+                frame['positions'] = {name: pos for name, pos in frame['positions'].items() if name in bodies}
+                frame['aspects'] = [a for a in frame['aspects'] if a['planet1'] in bodies and a['planet2'] in bodies]
+            if not include_aspects:
+                del frame['aspects']
+            self._encoded[key] = json.dumps(frame)
+        return self._encoded[key]
+
+    def publish(self, sky: Dict[str, Any]):
+        self.latest = sky
+        self._encoded = {}
+        for subscriber in list(self.subscribers):
+            subscriber.offer(self._encode(subscriber.key))
+            if subscriber.closed:
+                self.unsubscribe(subscriber)
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                sky = await asyncio.to_thread(compute_sky, datetime.now(timezone.utc))
+                self.publish(sky)
+            except Exception:
+                # a failed tick must not stop the feed for everyone
+                traceback.print_exc()
+            await asyncio.sleep(self.tick_seconds)
+
+    def subscribe(self, bodies: Optional[List[str]] = None, aspects: bool = True) -> Subscriber:
+        """Register a subscriber; it gets the latest frame at once, then one per tick"""
+        subscriber = Subscriber(bodies, aspects)
+        self.subscribers.append(subscriber)
+        if self._task is None or self._task.done():
+            # idle broadcaster: the last frame is stale, the new task computes one now
+            self._task = asyncio.create_task(self._run())
+        elif self.latest is not None:
+            subscriber.offer(self._encode(subscriber.key))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscriber.close()
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'subscribers': len(self.subscribers),
+            'distinct_filters': len({s.key for s in self.subscribers}),
+            'dropped_frames': sum(s.dropped for s in self.subscribers),
+            'tick_seconds': self.tick_seconds,
+            'latest': self.latest['timestamp'] if self.latest else None
+        }
+
+
+sky_broadcaster = SkyBroadcaster()
@@ -0,0 +1,213 @@
+import os
+from datetime import date
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+import swisseph as swe
+
+from bazi import get_bazi_engine, ANIMALS, STEMS, BRANCHES, STEM_ELEMENTS, ORDINAL_TO_JDN, SOLAR_TERMS
+from ephemeris_series import body_positions, bisect_roots, boundary_crossings, wrap180
+from table_store import save_arrays, load_or_build
+
+
+LUNISOLAR_PATH = os.getenv("LUNISOLAR_PATH",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'lunisolar.npz'))
+
+TABLE_START_YEAR = 1900
+TABLE_END_YEAR = 2100
+
+# The calendar is reckoned in China Standard Time: a month starts on the civil
+# day (UTC+8) of its new moon
+CALENDAR_UTC_OFFSET = 8.0
+
+DONGZHI = SOLAR_TERMS.index('Dongzhi')  # winter solstice, always in month 11
+# Moon-Sun elongation bands; entering band 0 is a new moon
+NEW_MOON_EDGES = np.array([0.0, 180.0])
+
+
+def _civil_day(jd_ut: np.ndarray) -> np.ndarray:
+    """Julian Day Number of the UTC+8 calendar day containing each instant"""
+    return np.floor(jd_ut + 0.5 + CALENDAR_UTC_OFFSET / 24.0).astype(np.int64)
+
+
+def _to_jdn(dates: Sequence[str]) -> np.ndarray:
+    return np.array([date.fromisoformat(text).toordinal() + ORDINAL_TO_JDN for text in dates], dtype=np.int64)
+
+
+def _from_jdn(jdn: int) -> str:
+    return date.fromordinal(int(jdn) - ORDINAL_TO_JDN).isoformat()
+
+
+def year_sign(lunar_year: int) -> Dict[str, Any]:
+    """Animal, element and stem-branch name of a lunar year"""
+    stem, branch = (lunar_year - 4) % 10, (lunar_year - 4) % 12
+    return {
+        'animal': ANIMALS[branch],
+        'element': STEM_ELEMENTS[stem],
+        'polarity': 'yang' if stem % 2 == 0 else 'yin',
+        'stem_branch': f"{STEMS[stem]}{BRANCHES[branch]}"
+    }
+
+
+class LunisolarCalendar:
+    """
+    Chinese lunisolar months for 1900-2100 as sorted arrays: the first civil day
+    of each month, its number (1-12), leap flag and lunar year. Conversions in
+    either direction are binary searches
+    """
+
+    def __init__(self, month_start, month_number, leap, lunar_year):
+        self.month_start = month_start
+        self.month_number = month_number
+        self.leap = leap
+        self.lunar_year = lunar_year
+        # sorted, since months run 1, (leap 1), 2, ... within a year
+        self._keys = lunar_year.astype(np.int64) * 32 + month_number * 2 + leap
+        new_year = (month_number == 1) & ~leap
+        self.new_year_years = lunar_year[new_year]
+        self.new_year_days = month_start[new_year]
+
+    # ============= BUILD / STORAGE =============
+
+    @classmethod
+    def build(cls, start_year: int = TABLE_START_YEAR, end_year: int = TABLE_END_YEAR) -> 'LunisolarCalendar':
+        """
+        New moons found by bisecting the Moon-Sun elongation, then the standard
+        rules: month 11 holds the winter solstice, and in a solstice-to-solstice
+        span of 13 months the first month without a principal term is the leap month
+        Solar terms come from the BaZi solar-term table
+        """
+        terms = get_bazi_engine().table
+        # solstices from December of the year before start_year through end_year + 1 bound every span needed
+        solstices = terms.jd[terms.term == DONGZHI]
+        solstices = solstices[(solstices >= swe.julday(start_year - 1, 12, 1, 0.0))
+                              & (solstices < swe.julday(end_year + 2, 1, 1, 0.0))]
+        if len(solstices) != end_year - start_year + 3:
+            raise ValueError(f"Solar-term table does not cover {start_year - 1}-{end_year + 1}; "
+                             f"rebuild it with python bazi.py")
+        principal = _civil_day(terms.jd[terms.term % 2 == 0])
+        solstices = _civil_day(solstices)
+
+        jd_start = swe.julday(start_year - 2, 10, 1, 0.0)
+        jd_end = swe.julday(end_year + 2, 4, 1, 0.0)
+        grid = np.arange(jd_start, jd_end + 0.5, 0.5)
+        moon, sun = swe.MOON, swe.SUN
+
+        def elongation(jds):
+            return (body_positions(moon, jds)[0] - body_positions(sun, jds)[0]) % 360.0
+
+        lo, hi, _, entered = boundary_crossings(elongation(grid), grid, NEW_MOON_EDGES)
+        lo, hi = lo[entered == 0], hi[entered == 0]
+        new_moons = _civil_day(np.sort(bisect_roots(lambda jds: wrap180(elongation(jds)), lo, hi)))
+
+        starts, numbers, leaps, years = [], [], [], []
+        for solstice_year, (solstice, next_solstice) in enumerate(zip(solstices[:-1], solstices[1:]),
+                                                                    start=start_year - 1):
+            if solstice_year > end_year:
+                break
+            first = np.searchsorted(new_moons, solstice, side='right') - 1
+            last = np.searchsorted(new_moons, next_solstice, side='right') - 1
+            span = new_moons[first:last + 1]  # month 11 through the next month 11 (excluded below)
+            leap_index = None
+            if len(span) - 1 == 13:
+                for i in range(1, len(span) - 1):
+                    has_principal = np.searchsorted(principal, span[i], side='left') < \
+                        np.searchsorted(principal, span[i + 1], side='left')
+                    if not has_principal:
+                        leap_index = i
+                        break
+
+            number = 11
+            for i, start in enumerate(span[:-1]):
+                leap = i == leap_index
+                if i > 0 and not leap:
+                    number = number % 12 + 1
+                starts.append(start)
+                numbers.append(number)
+                leaps.append(leap)
+                # months 11 and 12 close the lunar year that began before this solstice
+                years.append(solstice_year if number >= 11 else solstice_year + 1)
+
+        return cls(np.array(starts, dtype=np.int64), np.array(numbers, dtype=np.int8),
+                   np.array(leaps, dtype=bool), np.array(years, dtype=np.int16))
+
+    def save(self, path: str = LUNISOLAR_PATH):
+        save_arrays(path, month_start=self.month_start, month_number=self.month_number,
+                            leap=self.leap, lunar_year=self.lunar_year)
+
+    @classmethod
+    def load(cls, path: str = LUNISOLAR_PATH) -> 'LunisolarCalendar':
+        with np.load(path) as data:
+            return cls(data['month_start'], data['month_number'], data['leap'], data['lunar_year'])
+
+    # ============= CONVERSIONS =============
+
+    def to_lunar_many(self, dates: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Vectorized Gregorian -> lunar: columns lunar_year, month, day, leap"""
+        jdn = _to_jdn(dates)
+        if len(jdn) and (jdn.min() < self.month_start[0] or jdn.max() >= self.month_start[-1]):
+            raise ValueError(f"Lunar calendar covers {_from_jdn(self.month_start[0])} "
+                             f"to {_from_jdn(self.month_start[-1] - 1)}")
+        index = np.searchsorted(self.month_start, jdn, side='right') - 1
+        return {
+            'lunar_year': self.lunar_year[index],
+            'month': self.month_number[index],
+            'day': (jdn - self.month_start[index] + 1).astype(np.int8),
+            'leap': self.leap[index]
+        }
+
+    def to_lunar(self, gregorian: str) -> Dict[str, Any]:
+        found = self.to_lunar_many([gregorian])
+        lunar_year = int(found['lunar_year'][0])
+        # dates before the first New Year in the table still belong to lunar year start - 1
+        known_year = lunar_year >= self.new_year_years[0]
+        return dict({
+            'gregorian': gregorian,
+            'lunar_year': lunar_year,
+            'month': int(found['month'][0]),
+            'day': int(found['day'][0]),
+            'leap_month': bool(found['leap'][0]),
+            'chinese_new_year': self.chinese_new_year(lunar_year) if known_year else None
+        }, **year_sign(lunar_year))
+
+    def to_gregorian(self, lunar_year: int, month: int, day: int, leap: bool = False) -> str:
+        key = lunar_year * 32 + month * 2 + int(leap)
+        index = int(np.searchsorted(self._keys, key))
+        if index >= len(self._keys) or self._keys[index] != key:
+            raise ValueError(f"No {'leap ' if leap else ''}month {month} in lunar year {lunar_year}")
+        length = self.month_length(index)
+        if not 1 <= day <= length:
+            raise ValueError(f"Lunar month {month} of {lunar_year} has {length} days")
+        return _from_jdn(self.month_start[index] + day - 1)
+
+    def month_length(self, index: int) -> int:
+        return int(self.month_start[index + 1] - self.month_start[index])
+
+    def chinese_new_year(self, lunar_year: int) -> str:
+        index = int(np.searchsorted(self.new_year_years, lunar_year))
+        if index >= len(self.new_year_years) or self.new_year_years[index] != lunar_year:
+            raise ValueError(f"Lunar year {lunar_year} is outside the calendar table")
+        return _from_jdn(self.new_year_days[index])
+
+    def year_months(self, lunar_year: int) -> List[Dict[str, Any]]:
+        """Months of a lunar year with their first day and length; a leap month follows its namesake"""
+        first, last = np.searchsorted(self._keys, [lunar_year * 32, (lunar_year + 1) * 32])
+        return [{'month': int(self.month_number[i]), 'leap_month': bool(self.leap[i]),
+                 'start': _from_jdn(self.month_start[i]), 'days': self.month_length(i)}
+                for i in range(first, last)]
+
+
+_calendar: Optional[LunisolarCalendar] = None
+
+
+def get_lunisolar_calendar() -> LunisolarCalendar:
+    """Shared calendar, loaded from disk (built and saved first if missing)"""
+    global _calendar  # pylint: disable=global-statement
+    if _calendar is None:
+        _calendar = load_or_build(LUNISOLAR_PATH, LunisolarCalendar.load, LunisolarCalendar.build)
+    return _calendar
+
+
+if __name__ == '__main__':
+    built = LunisolarCalendar.build()
+    built.save(LUNISOLAR_PATH)
+    print(f"Saved {len(built.month_start)} lunar months to {LUNISOLAR_PATH}")
@@ -1,12 +1,33 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from fastapi.responses import StreamingResponse, Response
+from pydantic import BaseModel, model_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+import json
 import traceback
 
-from astrological_calculator import AstrologicalCalculator
+from astrological_calculator import AstrologicalCalculator, PLANET_IDS
 from advanced_timing import AdvancedTimingTechniques
+from astrocartography import AstroCartographyEngine, snap_resolution
+from relocation import RelocationGrid, check_request, grid_locations
+from synastry import SynastryEngine, chart_longitudes
+from natal_index import NatalPointIndex, MAJOR_ASPECTS, julian_day_for
+from event_catalog import get_event_catalog, CATALOG_BODIES, KIND_NAMES
+from progressions import ProgressionEngine
+from directions import DirectionsEngine, TIME_KEYS
+from electional import ElectionalSearch
+from rectification import RectificationEngine
+from time_unknown import BirthDayEnvelope
+from planetary_hours import PlanetaryHours
+from time_series import TimeSeries, POINT_TYPES, SAMPLE
+from live_sky import check_bodies, sky_broadcaster
+from chart_sections import LazySections, parse_fields, SECTION_TIMEOUT_SECONDS
+from single_flight import coalesce, single_flight
+from gazetteer import get_gazetteer, resolve_place, local_utc_offset
+from bazi import get_bazi_engine, describe_pillar
+from lunisolar import get_lunisolar_calendar
+from midpoints import MidpointEngine, DIALS, TRANSIT_BODIES as MIDPOINT_TRANSIT_BODIES
 
 app = FastAPI(title="Astrological Calculation API", version="1.0.0")
 
@@ -23,13 +44,30 @@ app.add_middleware(
 class BirthData(BaseModel):
     date: str  # YYYY-MM-DD
     time: Optional[str] = "12:00:00"  # HH:MM:SS, default to noon
-    place: Optional[str] = None
-    timezone: Optional[str] = None
+    place: Optional[str] = None  # "City" or "City, region/country"; sets lat/lon when they are not given
+    timezone: Optional[str] = None  # IANA zone; sets timezone_offset (with DST history) when it is not given
     lat: float = 40.5387  # Default to Sewickley, PA
     lon: float = -80.1844
-    timezone_offset: int = -5  # Default to EST
+    timezone_offset: float = -5  # Hours from UTC, default EST
     tradition: str = "Western"
-    depth: str = "Standard"
+    depth: str = "Standard"  # Quick, Standard, Advanced or "All systems (Deep Dive)"; see depth_tiers
+    time_known: bool = True  # False: report hits against the whole birth day
+
+    @model_validator(mode='after')
+    def resolve_place_and_offset(self):
+        """
+        Coordinates from the gazetteer and the historical UTC offset, unless given explicitly
+        A place the gazetteer does not know keeps the default coordinates, as before places were resolved
+        """
+        explicit = self.model_fields_set
+        found = resolve_place(self.place) if self.place and not {'lat', 'lon'} & explicit else None
+        if found is not None:
+            self.lat, self.lon = found['lat'], found['lon']
+            if self.timezone is None:
+                self.timezone = found['timezone']
+        if self.timezone and 'timezone_offset' not in explicit:
+            self.timezone_offset = local_utc_offset(self.timezone, self.date, self.time)
+        return self
 
 
 class TransitRequest(BaseModel):
@@ -37,53 +75,85 @@ class TransitRequest(BaseModel):
     target_date: str  # YYYY-MM-DD
 
 
+def _calculator_for(birth_data: BirthData) -> AstrologicalCalculator:
+    """Build a calculator from request birth data"""
+    return AstrologicalCalculator(
+        birth_date=birth_data.date,
+        birth_time=birth_data.time,
+        lat=birth_data.lat,
+        lon=birth_data.lon,
+        timezone_offset=birth_data.timezone_offset,
+        depth=birth_data.depth
+    )
+
+
+def _time_unknown_envelope(birth_data: BirthData) -> Optional[BirthDayEnvelope]:
+    """Birth-day position envelopes when the birth time is unknown, else None"""
+    if birth_data.time_known:
+        return None
+    return BirthDayEnvelope(birth_data.date, birth_data.lat, birth_data.lon, birth_data.timezone_offset)
+
+
 @app.get("/")
 async def root():
     return {"message": "Astrological Calculation API is running"}
 
 
 @app.post("/calculate/natal-chart")
-async def calculate_natal_chart(birth_data: BirthData) -> Dict[str, Any]:
-    """Calculate complete natal chart"""
+@coalesce
+async def calculate_natal_chart(birth_data: BirthData, fields: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Calculate complete natal chart
+    fields: optional comma-separated sections (planets, houses, aspects, critical_degrees, arabic_parts)
+    """
     try:
         calculator = AstrologicalCalculator(
             birth_date=birth_data.date,
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
-        result = calculator.generate_full_natal_chart()
+        result = calculator.generate_full_natal_chart(parse_fields(fields))
 
         # Add metadata
         result['metadata'] = {
             'tradition': birth_data.tradition,
             'depth': birth_data.depth,
+            'tier': calculator.depth,
             'calculation_type': 'natal_chart'
         }
 
         return result
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Calculation error: {str(e)}")
 
 
 @app.post("/calculate/transits")
+@coalesce
 async def calculate_transits(request: TransitRequest) -> Dict[str, Any]:
-    """Calculate transits for a specific date"""
+    """
+    Calculate transits for a specific date
+    No fields parameter: transits are the one computed section (time_unknown is opt-in via time_known)
+    """
     try:
         calculator = AstrologicalCalculator(
             birth_date=request.birth_data.date,
             birth_time=request.birth_data.time,
             lat=request.birth_data.lat,
             lon=request.birth_data.lon,
-            timezone_offset=request.birth_data.timezone_offset
+            timezone_offset=request.birth_data.timezone_offset,
+            depth=request.birth_data.depth
         )
 
         transits = calculator.calculate_transits(request.target_date)
 
-        return {
+        result = {
             'transits': transits,
             'target_date': request.target_date,
             'birth_info': {
@@ -92,11 +162,20 @@ async def calculate_transits(request: TransitRequest) -> Dict[str, Any]:
             }
         }
 
+        envelope = _time_unknown_envelope(request.birth_data)
+        if envelope:
+            result['time_unknown'] = {
+                'transits': envelope.transits(request.target_date),
+                'envelopes': envelope.envelopes
+            }
+        return result
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transit calculation error: {str(e)}")
 
 
 @app.post("/calculate/progressions")
+@coalesce
 async def calculate_progressions(request: TransitRequest) -> Dict[str, Any]:
     """Calculate secondary progressions for a specific date"""
     try:
@@ -105,7 +184,8 @@ async def calculate_progressions(request: TransitRequest) -> Dict[str, Any]:
             birth_time=request.birth_data.time,
             lat=request.birth_data.lat,
             lon=request.birth_data.lon,
-            timezone_offset=request.birth_data.timezone_offset
+            timezone_offset=request.birth_data.timezone_offset,
+            depth=request.birth_data.depth
         )
 
         progressions = calculator.calculate_progressions(request.target_date)
@@ -123,16 +203,58 @@ async def calculate_progressions(request: TransitRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Progression calculation error: {str(e)}")
 
 
+class ProgressionTimelineRequest(BaseModel):
+    birth_data: BirthData
+    years: int = 100
+    target_date: Optional[str] = None
+    house_system: str = 'P'
+
+
+@app.post("/calculate/progression-timeline")
+@coalesce
+async def progression_timeline(request: ProgressionTimelineRequest) -> Dict[str, Any]:
+    """
+    Lifetime secondary progression timeline: sign/house ingresses, exact aspects
+    to natal points, stations and lunar phases, plus the progressed chart
+    (with ASC/MC) for target_date
+    """
+    try:
+        if not 1 <= request.years <= 120:
+            raise HTTPException(status_code=400, detail="years must be between 1 and 120")
+
+        engine = ProgressionEngine(_calculator_for(request.birth_data), request.house_system)
+
+        return {
+            'progressed_chart': engine.chart_at(request.target_date),
+            'timeline': engine.timeline(request.years),
+            'years': request.years,
+            'birth_info': {
+                'date': request.birth_data.date,
+                'time': request.birth_data.time
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Progression timeline error: {str(e)}")
+
+
 @app.post("/calculate/solar-return")
+@coalesce
 async def calculate_solar_return(birth_data: BirthData, year: int) -> Dict[str, Any]:
-    """Calculate solar return for a specific year"""
+    """
+    Calculate solar return for a specific year
+    No fields parameter: the return moment is a single computed value
+    """
     try:
         calculator = AstrologicalCalculator(
             birth_date=birth_data.date,
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         solar_return = calculator.calculate_solar_return(year)
@@ -150,65 +272,114 @@ async def calculate_solar_return(birth_data: BirthData, year: int) -> Dict[str,
         raise HTTPException(status_code=500, detail=f"Solar return calculation error: {str(e)}")
 
 
+class BaziBatchRequest(BaseModel):
+    births: List[BirthData]
+
+
+def _local_hour(birth_data: BirthData) -> float:
+    hour, minute, *second = (int(part) for part in (birth_data.time or "12:00:00").split(':'))
+    return hour + minute / 60 + (second[0] if second else 0) / 3600
+
+
 @app.post("/calculate/bazi")
-async def calculate_bazi(birth_data: BirthData) -> Dict[str, Any]:
-    """Calculate Chinese BaZi Four Pillars"""
+@coalesce
+async def calculate_bazi(birth_data: BirthData, gender: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Calculate Chinese BaZi Four Pillars
+    gender ('male' / 'female') adds the 10-year luck pillars, whose direction depends on it
+    """
     try:
-        calculator = AstrologicalCalculator(
-            birth_date=birth_data.date,
-            birth_time=birth_data.time,
-            lat=birth_data.lat,
-            lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
-        )
-
-        bazi = calculator.calculate_bazi_pillars()
+        bazi = get_bazi_engine().chart(birth_data.date, _local_hour(birth_data), birth_data.timezone_offset,
+                                       gender, birth_data.time_known)
 
         return {
-            'bazi_pillars': bazi,
+            'bazi_pillars': {f"{name}_pillar": pillar['pillar'] for name, pillar in bazi['pillars'].items()},
+            'bazi': bazi,
             'birth_info': {
                 'date': birth_data.date,
                 'time': birth_data.time
             }
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid BaZi request: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"BaZi calculation error: {str(e)}")
+
+
+@app.post("/calculate/bazi/batch")
+async def calculate_bazi_batch(request: BaziBatchRequest) -> Dict[str, Any]:
+    """Four pillars for many births in one vectorized pass over the solar-term table"""
+    try:
+        found = get_bazi_engine().pillars([b.date for b in request.births],
+                                          [_local_hour(b) for b in request.births],
+                                          [b.timezone_offset for b in request.births])
+        results = []
+        for i, birth in enumerate(request.births):
+            names = ('year', 'month', 'day', 'hour') if birth.time_known else ('year', 'month', 'day')
+            results.append({
+                'date': birth.date,
+                'time': birth.time,
+                'bazi_pillars': {f"{name}_pillar": describe_pillar(int(found[name][i]))['pillar'] for name in names}
+            })
+        return {'results': results, 'count': len(results)}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid BaZi request: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"BaZi calculation error: {str(e)}")
 
 
 @app.post("/analyze/critical-periods")
-async def analyze_critical_periods(birth_data: BirthData) -> Dict[str, Any]:
-    """Analyze critical degrees and periods"""
+@coalesce
+async def analyze_critical_periods(birth_data: BirthData, fields: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze critical degrees and periods
+    fields: optional comma-separated sections (critical_degrees, current_transits); the natal
+    planets they share are computed once, and time_unknown covers only the sections returned
+    """
     try:
         calculator = AstrologicalCalculator(
             birth_date=birth_data.date,
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
-        critical_degrees = calculator.critical_degree_analysis()
-
-        # Calculate current transits for additional context
+        # Current transits give additional context
         today = datetime.now().strftime("%Y-%m-%d")
-        current_transits = calculator.calculate_transits(today)
-
-        return {
-            'critical_degrees': critical_degrees,
-            'current_transits': current_transits,
-            'analysis_date': today,
-            'birth_info': {
-                'date': birth_data.date,
-                'time': birth_data.time
-            }
+        sections = (LazySections()
+                    .add('planets', calculator.calculate_planets, public=False)
+                    .add('critical_degrees', calculator.critical_degree_analysis, ['planets'])
+                    .add('current_transits', lambda planets: calculator.calculate_transits(today, planets),
+                         ['planets']))
+
+        result = sections.select(parse_fields(fields))
+        result['analysis_date'] = today
+        result['birth_info'] = {
+            'date': birth_data.date,
+            'time': birth_data.time
         }
 
+        envelope = _time_unknown_envelope(birth_data)
+        if envelope:
+            result['time_unknown'] = {}
+            if 'critical_degrees' in result:
+                result['time_unknown']['critical_degrees'] = envelope.critical_degrees()
+            if 'current_transits' in result:
+                result['time_unknown']['current_transits'] = envelope.transits(today)
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Critical period analysis error: {str(e)}")
 
 
 @app.post("/analyze/forensic-timing")
+@coalesce
 async def forensic_timing_analysis(birth_data: BirthData, target_date: str) -> Dict[str, Any]:
     """Dr. Celestine Starweaver's forensic timing analysis"""
     try:
@@ -217,7 +388,8 @@ async def forensic_timing_analysis(birth_data: BirthData, target_date: str) -> D
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         analysis = calculator.forensic_timing_analysis(target_date)
@@ -237,6 +409,7 @@ async def forensic_timing_analysis(birth_data: BirthData, target_date: str) -> D
 
 
 @app.post("/calculate/zodiacal-releasing")
+@coalesce
 async def calculate_zodiacal_releasing(birth_data: BirthData, target_date: str) -> Dict[str, Any]:
     """Calculate Hellenistic zodiacal releasing periods"""
     try:
@@ -245,7 +418,8 @@ async def calculate_zodiacal_releasing(birth_data: BirthData, target_date: str)
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         zr_analysis = calculator.calculate_zodiacal_releasing(target_date)
@@ -264,6 +438,7 @@ async def calculate_zodiacal_releasing(birth_data: BirthData, target_date: str)
 
 
 @app.post("/calculate/annual-profections")
+@coalesce
 async def calculate_annual_profections(birth_data: BirthData, current_age: int) -> Dict[str, Any]:
     """Calculate annual profections for current age"""
     try:
@@ -272,7 +447,8 @@ async def calculate_annual_profections(birth_data: BirthData, current_age: int)
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         profections = calculator.calculate_annual_profections(current_age)
@@ -296,6 +472,7 @@ class StressAnalysisRequest(BaseModel):
 
 
 @app.post("/analyze/stress-indicators")
+@coalesce
 async def analyze_stress_indicators(request: StressAnalysisRequest) -> Dict[str, Any]:
     """Analyze stress indicators over a date range"""
     try:
@@ -304,7 +481,8 @@ async def analyze_stress_indicators(request: StressAnalysisRequest) -> Dict[str,
             birth_time=request.birth_data.time,
             lat=request.birth_data.lat,
             lon=request.birth_data.lon,
-            timezone_offset=request.birth_data.timezone_offset
+            timezone_offset=request.birth_data.timezone_offset,
+            depth=request.birth_data.depth
         )
 
         stress_analysis = calculator.analyze_stress_indicators(request.date_range)
@@ -323,6 +501,7 @@ async def analyze_stress_indicators(request: StressAnalysisRequest) -> Dict[str,
 
 
 @app.post("/calculate/planetary-periods")
+@coalesce
 async def calculate_planetary_periods(birth_data: BirthData) -> Dict[str, Any]:
     """Calculate Vimshottari Dasha periods"""
     try:
@@ -331,7 +510,8 @@ async def calculate_planetary_periods(birth_data: BirthData) -> Dict[str, Any]:
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         periods = calculator.calculate_planetary_periods()
@@ -351,6 +531,7 @@ async def calculate_planetary_periods(birth_data: BirthData) -> Dict[str, Any]:
 # ============= ADVANCED TIMING ENDPOINTS =============
 
 @app.post("/timing/zodiacal-releasing")
+@coalesce
 async def zodiacal_releasing_analysis(birth_data: BirthData, starting_lot: str = "fortune", target_date: Optional[str] = None) -> Dict[str, Any]:
     """Hellenistic Zodiacal Releasing periods analysis"""
     try:
@@ -359,7 +540,8 @@ async def zodiacal_releasing_analysis(birth_data: BirthData, starting_lot: str =
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -380,6 +562,7 @@ async def zodiacal_releasing_analysis(birth_data: BirthData, starting_lot: str =
 
 
 @app.post("/timing/vimshottari-dasha")
+@coalesce
 async def vimshottari_dasha_analysis(birth_data: BirthData, current_date: Optional[str] = None) -> Dict[str, Any]:
     """Vedic Vimshottari Dasha periods analysis"""
     try:
@@ -388,13 +571,14 @@ async def vimshottari_dasha_analysis(birth_data: BirthData, current_date: Option
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
         dasha_analysis = timing.calculate_vimshottari_dasha(current_date)
 
-        return {
+        result = {
             'vimshottari_dasha': dasha_analysis,
             'current_date': current_date or datetime.now().strftime("%Y-%m-%d"),
             'birth_info': {
@@ -403,11 +587,17 @@ async def vimshottari_dasha_analysis(birth_data: BirthData, current_date: Option
             }
         }
 
+        envelope = _time_unknown_envelope(birth_data)
+        if envelope:
+            result['time_unknown'] = {'vimshottari': envelope.vimshottari(current_date)}
+        return result
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Vimshottari Dasha analysis error: {str(e)}")
 
 
 @app.post("/timing/firdaria")
+@coalesce
 async def firdaria_analysis(birth_data: BirthData, current_date: Optional[str] = None) -> Dict[str, Any]:
     """Medieval/Persian Firdaria periods analysis"""
     try:
@@ -416,7 +606,8 @@ async def firdaria_analysis(birth_data: BirthData, current_date: Optional[str] =
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -436,6 +627,7 @@ async def firdaria_analysis(birth_data: BirthData, current_date: Optional[str] =
 
 
 @app.post("/timing/planetary-returns")
+@coalesce
 async def planetary_returns_analysis(birth_data: BirthData, planet: str = "saturn", years_ahead: int = 5) -> Dict[str, Any]:
     """Calculate planetary returns (Saturn, Jupiter, etc.)"""
     try:
@@ -444,7 +636,8 @@ async def planetary_returns_analysis(birth_data: BirthData, planet: str = "satur
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -465,6 +658,7 @@ async def planetary_returns_analysis(birth_data: BirthData, planet: str = "satur
 
 
 @app.post("/timing/eclipse-sensitivity")
+@coalesce
 async def eclipse_sensitivity_analysis(birth_data: BirthData, years_range: int = 2) -> Dict[str, Any]:
     """Find eclipses hitting sensitive natal points"""
     try:
@@ -473,7 +667,8 @@ async def eclipse_sensitivity_analysis(birth_data: BirthData, years_range: int =
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -493,6 +688,7 @@ async def eclipse_sensitivity_analysis(birth_data: BirthData, years_range: int =
 
 
 @app.post("/timing/progressed-angles")
+@coalesce
 async def progressed_angles_analysis(birth_data: BirthData, target_date: Optional[str] = None) -> Dict[str, Any]:
     """Secondary progressed angles to natal/transiting planets"""
     try:
@@ -501,7 +697,8 @@ async def progressed_angles_analysis(birth_data: BirthData, target_date: Optiona
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -520,6 +717,152 @@ async def progressed_angles_analysis(birth_data: BirthData, target_date: Optiona
         raise HTTPException(status_code=500, detail=f"Progressed angles analysis error: {str(e)}")
 
 
+class DirectionsRequest(BaseModel):
+    birth_data: BirthData
+    years: int = 100
+    target_date: Optional[str] = None  # reference date for applying/separating
+    key: str = 'naibod'  # naibod, ptolemy or solar_arc
+
+
+@app.post("/timing/directions")
+@coalesce
+async def directions_analysis(request: DirectionsRequest) -> Dict[str, Any]:
+    """Lifetime solar arc and primary (Placidus semi-arc) directions to natal points"""
+    try:
+        if not 1 <= request.years <= 120:
+            raise HTTPException(status_code=400, detail="years must be between 1 and 120")
+        if request.key not in TIME_KEYS and request.key != 'solar_arc':
+            raise HTTPException(status_code=400, detail=f"Unknown time key: {request.key}")
+
+        engine = DirectionsEngine(_calculator_for(request.birth_data))
+        directions = engine.lifetime_directions(request.years, request.target_date, request.key)
+
+        return {
+            'directions': directions,
+            'years': request.years,
+            'key': request.key,
+            'target_date': request.target_date or datetime.now().strftime("%Y-%m-%d"),
+            'birth_info': {
+                'date': request.birth_data.date,
+                'time': request.birth_data.time
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Directions analysis error: {str(e)}")
+
+
+class MidpointRequest(BaseModel):
+    birth_data: BirthData
+    dial: float = 90.0  # 90 or 45
+    orb: float = 1.5
+
+
+@app.post("/calculate/midpoints")
+@coalesce
+async def calculate_midpoints(request: MidpointRequest) -> Dict[str, Any]:
+    """Midpoint tree and the sorted midpoint dial"""
+    try:
+        if request.dial not in DIALS:
+            raise HTTPException(status_code=400, detail=f"dial must be one of {DIALS}")
+
+        engine = MidpointEngine(_calculator_for(request.birth_data), request.dial)
+
+        return {
+            'midpoint_tree': engine.midpoint_tree(request.orb),
+            'dial': engine.sorted_dial(),
+            'dial_size': request.dial,
+            'orb': request.orb,
+            'birth_info': {
+                'date': request.birth_data.date,
+                'time': request.birth_data.time
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Midpoint calculation error: {str(e)}")
+
+
+class MidpointTransitRequest(BaseModel):
+    birth_data: BirthData
+    start_date: str  # YYYY-MM-DD
+    days: int = 365
+    bodies: Optional[List[str]] = None
+    dial: float = 90.0
+    orb: float = 1.0
+
+
+@app.post("/analyze/midpoint-transits")
+@coalesce
+async def midpoint_transits(request: MidpointTransitRequest) -> Dict[str, Any]:
+    """Daily scan of transits to natal midpoints, merged into dated intervals"""
+    try:
+        if request.dial not in DIALS:
+            raise HTTPException(status_code=400, detail=f"dial must be one of {DIALS}")
+        if not 1 <= request.days <= 3660:
+            raise HTTPException(status_code=400, detail="days must be between 1 and 3660")
+        bodies = request.bodies or MIDPOINT_TRANSIT_BODIES
+        unknown = [body for body in bodies if body not in PLANET_IDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown bodies: {unknown}")
+
+        engine = MidpointEngine(_calculator_for(request.birth_data), request.dial)
+        hits = engine.scan_transits(request.start_date, request.days, bodies, request.orb)
+
+        return {
+            'midpoint_transits': hits,
+            'start_date': request.start_date,
+            'days': request.days,
+            'dial_size': request.dial,
+            'birth_info': {
+                'date': request.birth_data.date,
+                'time': request.birth_data.time
+            }
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Midpoint transit error: {str(e)}")
+
+
+class HarmonicRequest(BaseModel):
+    birth_data: BirthData
+    harmonics: List[int] = [5, 7, 9]
+    orb: float = 3.0
+
+
+@app.post("/calculate/harmonics")
+@coalesce
+async def calculate_harmonics(request: HarmonicRequest) -> Dict[str, Any]:
+    """Harmonic charts (longitude x n) and the aspects within each"""
+    try:
+        if not request.harmonics or any(not 1 <= n <= 360 for n in request.harmonics):
+            raise HTTPException(status_code=400, detail="harmonics must be between 1 and 360")
+
+        engine = MidpointEngine(_calculator_for(request.birth_data))
+
+        return {
+            'harmonics': engine.harmonic_charts(request.harmonics, request.orb),
+            'orb': request.orb,
+            'birth_info': {
+                'date': request.birth_data.date,
+                'time': request.birth_data.time
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Harmonic chart error: {str(e)}")
+
+
 class CompositeTimingRequest(BaseModel):
     birth_data: BirthData
     date_range_start: str  # YYYY-MM-DD
@@ -527,6 +870,7 @@ class CompositeTimingRequest(BaseModel):
 
 
 @app.post("/timing/composite-analysis")
+@coalesce
 async def composite_timing_analysis(request: CompositeTimingRequest) -> Dict[str, Any]:
     """Comprehensive multi-system timing analysis"""
     try:
@@ -535,7 +879,8 @@ async def composite_timing_analysis(request: CompositeTimingRequest) -> Dict[str
             birth_time=request.birth_data.time,
             lat=request.birth_data.lat,
             lon=request.birth_data.lon,
-            timezone_offset=request.birth_data.timezone_offset
+            timezone_offset=request.birth_data.timezone_offset,
+            depth=request.birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -561,15 +906,24 @@ async def composite_timing_analysis(request: CompositeTimingRequest) -> Dict[str
 
 
 @app.post("/timing/full-advanced-analysis")
-async def full_advanced_timing_analysis(birth_data: BirthData, target_date: Optional[str] = None) -> Dict[str, Any]:
-    """Complete advanced timing analysis combining all techniques"""
+@coalesce
+async def full_advanced_timing_analysis(birth_data: BirthData, target_date: Optional[str] = None,
+                                        fields: Optional[str] = None,
+                                        section_timeout: float = SECTION_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """
+    Complete advanced timing analysis combining all techniques
+    fields: optional comma-separated techniques; the others are not computed
+    Techniques run concurrently once the natal chart is ready; one that exceeds
+    section_timeout seconds (clamped to 60) or fails is reported in section_status, not as a 500
+    """
     try:
         calculator = AstrologicalCalculator(
             birth_date=birth_data.date,
             birth_time=birth_data.time,
             lat=birth_data.lat,
             lon=birth_data.lon,
-            timezone_offset=birth_data.timezone_offset
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
         )
 
         timing = AdvancedTimingTechniques(calculator)
@@ -577,46 +931,661 @@ async def full_advanced_timing_analysis(birth_data: BirthData, target_date: Opti
         if not target_date:
             target_date = datetime.now().strftime("%Y-%m-%d")
 
-        # Get all timing analyses
-        profections = timing.calculate_annual_profections()
-        zr = timing.calculate_zodiacal_releasing(target_date=target_date)
-        dasha = timing.calculate_vimshottari_dasha(target_date)
-        firdaria = timing.calculate_firdaria(target_date)
-        returns = timing.calculate_planetary_returns('saturn', 10)
-        eclipses = timing.calculate_eclipse_sensitivity(2)
-        progressed = timing.calculate_progressed_angles(target_date)
+        # Get the requested timing analyses
+        sections = timing.analysis_sections(target_date)
+        analysis, section_status = sections.select_concurrent(parse_fields(fields), section_timeout)
 
-        return {
-            'full_advanced_analysis': {
-                'annual_profections': profections,
-                'zodiacal_releasing': zr,
-                'vimshottari_dasha': dasha,
-                'firdaria': firdaria,
-                'saturn_returns': returns,
-                'eclipse_sensitivity': eclipses,
-                'progressed_angles': progressed
-            },
-            'target_date': target_date,
-            'analysis_summary': {
+        # Summary of whatever was computed
+        summary = {}
+        if 'annual_profections' in analysis:
+            profections = analysis['annual_profections']
+            summary.update({
                 'profected_house': profections['profected_house'],
                 'profected_sign': profections['profected_sign'],
-                'time_lord': profections['time_lord'],
-                'current_dasha': dasha['current_mahadasha']['mahadasha'] if dasha['current_mahadasha'] else None,
-                'current_antardasha': dasha['current_antardasha']['planet'] if dasha['current_antardasha'] else None,
-                'firdaria_lord': firdaria['major_period'] if firdaria else None,
-                'upcoming_eclipses': len([e for e in eclipses if e['date'] > datetime.strptime(target_date, "%Y-%m-%d")]),
-                'active_progressions': len(progressed)
-            },
+                'time_lord': profections['time_lord']
+            })
+        if 'vimshottari_dasha' in analysis:
+            dasha = analysis['vimshottari_dasha']
+            summary['current_dasha'] = dasha['current_mahadasha']['mahadasha'] if dasha['current_mahadasha'] else None
+            summary['current_antardasha'] = dasha['current_antardasha']['planet'] if dasha['current_antardasha'] else None
+        if 'firdaria' in analysis:
+            summary['firdaria_lord'] = analysis['firdaria']['major_period'] if analysis['firdaria'] else None
+        if 'eclipse_sensitivity' in analysis:
+            summary['upcoming_eclipses'] = len([e for e in analysis['eclipse_sensitivity']
+                                                if e['date'] > datetime.strptime(target_date, "%Y-%m-%d")])
+        if 'progressed_angles' in analysis:
+            summary['active_progressions'] = len(analysis['progressed_angles'])
+
+        return {
+            'full_advanced_analysis': analysis,
+            'section_status': section_status,
+            'complete': all(state == 'ok' for state in section_status.values()),
+            'target_date': target_date,
+            'analysis_summary': summary,
             'birth_info': {
                 'date': birth_data.date,
                 'time': birth_data.time
             }
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Full advanced timing analysis error: {str(e)}")
 
 
+# ============= ASTROCARTOGRAPHY ENDPOINTS =============
+
+@app.post("/calculate/astrocartography")
+@coalesce
+async def calculate_astrocartography(birth_data: BirthData, resolution: float = 1.0,
+                                     include_parans: bool = True, include_local_space: bool = True,
+                                     bbox: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ASC/DSC/MC/IC lines, parans and local space lines as GeoJSON
+    resolution: sampling step in degrees, at least 0.1, snapped to 0.1/0.25/0.5/1/2/5
+    bbox: "west,south,east,north" to clip the cached lines to a map tile
+    """
+    try:
+        tile = tuple(float(v) for v in bbox.split(',')) if bbox else None
+        if tile is not None and len(tile) != 4:
+            raise ValueError("bbox needs four values")
+        resolution = snap_resolution(resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid map parameters: {str(e)}")
+
+    try:
+        calculator = AstrologicalCalculator(
+            birth_date=birth_data.date,
+            birth_time=birth_data.time,
+            lat=birth_data.lat,
+            lon=birth_data.lon,
+            timezone_offset=birth_data.timezone_offset,
+            depth=birth_data.depth
+        )
+
+        engine = AstroCartographyEngine(calculator)
+        lines = engine.generate_lines(resolution, include_parans, include_local_space, tile)
+
+        return {
+            'astrocartography': lines,
+            'resolution': resolution,
+            'birth_info': {
+                'date': birth_data.date,
+                'time': birth_data.time
+            }
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Astrocartography calculation error: {str(e)}")
+
+
+class Location(BaseModel):
+    lat: float
+    lon: float
+
+
+class LocationGrid(BaseModel):
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+    step: float = 1.0
+
+
+class RelocationRequest(BaseModel):
+    birth_data: BirthData
+    locations: Optional[List[Location]] = None  # Explicit points (cities to compare)
+    grid: Optional[LocationGrid] = None         # Or a regular grid for heatmaps
+    house_system: str = "P"
+    stream: bool = False  # Newline-delimited JSON chunks instead of one response
+    chunk_size: int = 500
+
+
+@app.post("/calculate/relocation")
+async def calculate_relocation(request: RelocationRequest):
+    """Relocated houses and angles for one birth moment over many locations"""
+    try:
+        if request.grid is not None:
+            grid = request.grid
+            locations = grid_locations(grid.lat_min, grid.lat_max, grid.lon_min, grid.lon_max, grid.step)
+        else:
+            locations = [(loc.lat, loc.lon) for loc in request.locations or []]
+        if not locations:
+            raise ValueError("provide locations or a grid")
+        if request.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        # Checked here, not per chunk, so a streamed response never starts for a request that would fail
+        check_request(len(locations), request.house_system)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid relocation request: {str(e)}")
+
+    try:
+        calculator = AstrologicalCalculator(
+            birth_date=request.birth_data.date,
+            birth_time=request.birth_data.time,
+            lat=request.birth_data.lat,
+            lon=request.birth_data.lon,
+            timezone_offset=request.birth_data.timezone_offset,
+            depth=request.birth_data.depth
+        )
+
+        relocation = RelocationGrid(calculator, request.house_system)
+
+        if request.stream:
+            def ndjson_chunks():
+                for chunk in relocation.iter_location_chunks(locations, request.chunk_size):
+                    yield json.dumps({'locations': chunk}) + "\n"
+
+            return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
+
+        result = relocation.calculate_locations(locations)
+        result['birth_info'] = {
+            'date': request.birth_data.date,
+            'time': request.birth_data.time
+        }
+        return result
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Relocation calculation error: {str(e)}")
+
+
+# ============= SYNASTRY ENDPOINTS =============
+
+class SynastryRequest(BaseModel):
+    chart_a: BirthData
+    chart_b: BirthData
+
+
+class CandidateChart(BaseModel):
+    id: str
+    birth_data: BirthData
+
+
+class CompatibilityMatchRequest(BaseModel):
+    charts: List[BirthData]            # One chart for 1xN, several for NxM
+    candidates: List[CandidateChart]
+    top_k: int = 10
+
+
+@app.post("/calculate/synastry")
+@coalesce
+async def calculate_synastry(request: SynastryRequest) -> Dict[str, Any]:
+    """Cross-aspects, compatibility score, composite and Davison charts for two people"""
+    try:
+        engine = SynastryEngine()
+        synastry = engine.analyze_pair(_calculator_for(request.chart_a), _calculator_for(request.chart_b))
+
+        return {
+            'synastry': synastry,
+            'birth_info': {
+                'chart_a': {'date': request.chart_a.date, 'time': request.chart_a.time},
+                'chart_b': {'date': request.chart_b.date, 'time': request.chart_b.time}
+            }
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Synastry calculation error: {str(e)}")
+
+
+@app.post("/analyze/compatibility-matches")
+@coalesce
+async def compatibility_matches(request: CompatibilityMatchRequest) -> Dict[str, Any]:
+    """Top-K compatibility matches of each chart against a candidate pool"""
+    if not request.charts or request.top_k <= 0:
+        raise HTTPException(status_code=400, detail="Provide at least one chart and a positive top_k")
+
+    try:
+        engine = SynastryEngine()
+        for candidate in request.candidates:
+            engine.add_calculator(candidate.id, _calculator_for(candidate.birth_data))
+
+        queries = [chart_longitudes(_calculator_for(chart)) for chart in request.charts]
+        matches = engine.top_matches_many(queries, request.top_k)
+
+        return {
+            'matches': [
+                {
+                    'birth_info': {'date': chart.date, 'time': chart.time},
+                    'top_matches': top
+                }
+                for chart, top in zip(request.charts, matches)
+            ],
+            'candidate_count': len(request.candidates),
+            'top_k': request.top_k
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Compatibility matching error: {str(e)}")
+
+
+# ============= NATAL REVERSE INDEX ENDPOINTS =============
+
+# Stored natal points of every chart, kept in sync as birth_data rows change
+natal_index = NatalPointIndex()
+
+
+class SkyActivationRequest(BaseModel):
+    target_date: Optional[str] = None  # YYYY-MM-DD, defaults to today
+    bodies: Optional[List[str]] = None  # Transiting bodies, defaults to Mars-Pluto
+    orb: float = 2.0
+    detail: bool = False  # Per-hit detail instead of chart ids only
+
+
+@app.put("/index/charts/{chart_id}")
+async def index_chart(chart_id: str, birth_data: BirthData) -> Dict[str, Any]:
+    """Insert or replace a chart in the natal reverse index"""
+    try:
+        natal_index.upsert_calculator(chart_id, _calculator_for(birth_data))
+        return {'chart_id': chart_id, 'indexed_charts': len(natal_index)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chart indexing error: {str(e)}")
+
+
+@app.delete("/index/charts/{chart_id}")
+async def unindex_chart(chart_id: str) -> Dict[str, Any]:
+    """Remove a chart from the natal reverse index"""
+    if not natal_index.remove(chart_id):
+        raise HTTPException(status_code=404, detail=f"Chart not indexed: {chart_id}")
+    return {'chart_id': chart_id, 'indexed_charts': len(natal_index)}
+
+
+# Not coalesced: the result depends on this process's natal_index, not only on the request
+@app.post("/analyze/sky-activations")
+async def sky_activations(request: SkyActivationRequest) -> Dict[str, Any]:
+    """Indexed charts with a natal point aspected by today's (or a given day's) sky"""
+    try:
+        target_date = request.target_date or datetime.now().strftime("%Y-%m-%d")
+        julian_day = julian_day_for(target_date)
+
+        activations = natal_index.sky_activations(julian_day, request.bodies, request.orb,
+                                                  MAJOR_ASPECTS, request.detail)
+
+        return {
+            'activations': activations,
+            'target_date': target_date,
+            'orb': request.orb,
+            'indexed_charts': len(natal_index)
+        }
+
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown transiting body: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sky activation error: {str(e)}")
+
+
+class TimeSeriesRequest(BaseModel):
+    bodies: List[str]
+    start: str  # YYYY-MM-DD (UTC)
+    end: str    # YYYY-MM-DD (UTC)
+    step_days: float = 1.0
+    max_points: Optional[int] = None  # per body; stations and ingresses are always kept
+    format: str = 'json'  # json or npz
+
+
+@app.post("/ephemeris/time-series")
+async def ephemeris_time_series(request: TimeSeriesRequest):
+    """
+    Columnar longitude, speed and retrograde series for timeline charts
+    format='npz' returns one .npy array per '<body>.<column>' in a binary archive
+    """
+    try:
+        if request.format not in ('json', 'npz'):
+            raise HTTPException(status_code=400, detail="format must be json or npz")
+        if request.max_points is not None and request.max_points < 2:
+            raise HTTPException(status_code=400, detail="max_points must be at least 2")
+
+        time_series = TimeSeries(request.bodies, julian_day_for(request.start, 0.0),
+                                 julian_day_for(request.end, 0.0), request.step_days)
+        series = time_series.series(request.max_points)
+
+        if request.format == 'npz':
+            return Response(content=TimeSeries.to_npz(series), media_type="application/octet-stream",
+                            headers={"Content-Disposition": "attachment; filename=time_series.npz"})
+        return {
+            'start': request.start,
+            'end': request.end,
+            'step_days': request.step_days,
+            # max_points at or above the sample count returns the full grid
+            'downsampled': any((columns['point_type'] == SAMPLE).sum() < len(time_series.jds)
+                               for columns in series.values()),
+            'point_types': POINT_TYPES,
+            'series': TimeSeries.to_json(series)
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid time-series request: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Time series error: {str(e)}")
+
+
+@app.get("/events/catalog")
+async def event_catalog(start: str, end: str, kinds: Optional[str] = None,
+                        bodies: Optional[str] = None, void_of_course: bool = False) -> Dict[str, Any]:
+    """
+    Stations, sign ingresses and lunations between two dates (UTC, end exclusive)
+    kinds / bodies are comma-separated filters; void_of_course adds Moon VoC periods
+    """
+    try:
+        kind_list = [kind.strip() for kind in kinds.split(',')] if kinds else None
+        body_list = [body.strip() for body in bodies.split(',')] if bodies else None
+        unknown = [kind for kind in kind_list or [] if kind not in KIND_NAMES.values()]
+        unknown += [body for body in body_list or [] if body not in CATALOG_BODIES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown kinds/bodies: {', '.join(unknown)}")
+
+        jd_start = julian_day_for(start, 0.0)
+        jd_end = julian_day_for(end, 0.0)
+        if jd_end <= jd_start:
+            raise HTTPException(status_code=400, detail="end must be after start")
+
+        catalog = get_event_catalog()
+        result = {
+            'start': start,
+            'end': end,
+            'events': catalog.query(jd_start, jd_end, kind_list, body_list)
+        }
+        if void_of_course:
+            result['void_of_course'] = catalog.void_of_course(jd_start, jd_end)
+        return result
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Event catalog error: {str(e)}")
+
+
+@app.get("/calculate/planetary-hours")
+async def planetary_hours(lat: float, lon: float, start: str, end: Optional[str] = None,
+                          timezone_offset: float = -5, at: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Sunrise/sunset, moonrise/moonset and planetary hours for each local date in [start, end]
+    at: optional local 'YYYY-MM-DD HH:MM:SS' to also return the hour and sect in effect then
+    """
+    try:
+        hours = PlanetaryHours(lat, lon, timezone_offset)
+        result = {
+            'location': {'lat': lat, 'lon': lon, 'timezone_offset': timezone_offset},
+            'days': hours.days(start, end or start)
+        }
+        if at:
+            result['current_hour'] = hours.hour_at(at)
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid planetary hours request: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Planetary hours error: {str(e)}")
+
+
+class LifeEvent(BaseModel):
+    date: str  # YYYY-MM-DD
+    type: str = 'other'  # marriage, career, relocation, birth_of_child, death, accident, ...
+    weight: float = 1.0
+
+
+class RectificationRequest(BaseModel):
+    birth_data: BirthData  # time is ignored
+    events: List[LifeEvent]
+    start_time: str = "00:00"  # local HH:MM
+    end_time: str = "23:59"
+    resolution_minutes: float = 4.0
+    top_n: int = 10
+
+
+@app.post("/calculate/rectification")
+@coalesce
+async def rectify_birth_time(request: RectificationRequest) -> Dict[str, Any]:
+    """Rank candidate birth times by how well they time the given life events"""
+    try:
+        birth_data = request.birth_data
+        engine = RectificationEngine(birth_data.date, birth_data.lat, birth_data.lon, birth_data.timezone_offset)
+        result = engine.rectify([event.model_dump() for event in request.events], request.start_time,
+                                request.end_time, request.resolution_minutes, request.top_n)
+        result['birth_info'] = {'date': birth_data.date, 'time': None}
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rectification request: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rectification error: {str(e)}")
+
+
+@app.post("/analyze/time-unknown")
+@coalesce
+async def time_unknown_analysis(birth_data: BirthData, target_date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Unknown-birth-time report: each body's longitude range over the birth day, with
+    transits, critical degrees and dasha labelled certain / possible
+    """
+    try:
+        envelope = BirthDayEnvelope(birth_data.date, birth_data.lat, birth_data.lon, birth_data.timezone_offset)
+        result = envelope.report(target_date)
+        result['birth_info'] = {'date': birth_data.date, 'time': None}
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Time-unknown analysis error: {str(e)}")
+
+
+class ElectionConstraint(BaseModel):
+    type: str  # direct, retrograde, void_of_course, sign, lunar_phase, aspect, house, angular
+    body: Optional[str] = None
+    body2: Optional[str] = None
+    signs: Optional[List[str]] = None
+    phases: Optional[List[str]] = None
+    aspects: Optional[List[str]] = None
+    orb: float = 3.0
+    houses: Optional[List[int]] = None
+    negate: bool = False
+    required: bool = True
+    weight: float = 1.0
+
+
+class ElectionalSearchRequest(BaseModel):
+    start_date: str  # YYYY-MM-DD (UTC)
+    end_date: str    # YYYY-MM-DD (UTC, exclusive)
+    lat: float = 40.5387
+    lon: float = -80.1844
+    house_system: str = 'P'
+    constraints: List[ElectionConstraint]
+    min_duration_minutes: float = 30.0
+    limit: int = 20
+
+
+@app.post("/electional/search")
+@coalesce
+async def electional_search(request: ElectionalSearchRequest) -> Dict[str, Any]:
+    """
+    Ranked time windows where all required constraints hold
+    e.g. Mercury direct, Moon not void of course and Jupiter angular at a location
+    """
+    try:
+        constraints = [constraint.model_dump(exclude_none=True) for constraint in request.constraints]
+        for constraint in constraints:
+            for field in ('body', 'body2'):
+                if field in constraint and constraint[field] not in CATALOG_BODIES:
+                    raise HTTPException(status_code=400, detail=f"Unknown body: {constraint[field]}")
+
+        search = ElectionalSearch(request.lat, request.lon, request.house_system)
+        windows = search.search(julian_day_for(request.start_date, 0.0), julian_day_for(request.end_date, 0.0),
+                                constraints, request.min_duration_minutes, request.limit)
+
+        return {
+            'windows': windows,
+            'count': len(windows),
+            'start_date': request.start_date,
+            'end_date': request.end_date,
+            'location': {'lat': request.lat, 'lon': request.lon}
+        }
+
+    except HTTPException:
+        raise
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid election request: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Electional search error: {str(e)}")
+
+
+# ============= LIVE SKY =============
+
+def _sky_filter(bodies: Optional[str]) -> Optional[List[str]]:
+    return [body.strip() for body in bodies.split(',')] if bodies else None
+
+
+@app.websocket("/ws/sky")
+async def live_sky_socket(websocket: WebSocket, bodies: Optional[str] = None, aspects: bool = True):
+    """
+    Current positions, aspects and Moon phase pushed once per tick
+    bodies: optional comma-separated filter; aspects=false omits the aspect list
+    """
+    await websocket.accept()
+    try:
+        subscriber = sky_broadcaster.subscribe(_sky_filter(bodies), aspects)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    try:
+        async for frame in subscriber.frames():
+            await websocket.send_text(frame)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sky_broadcaster.unsubscribe(subscriber)
+
+
+@app.get("/stream/sky")
+async def live_sky_stream(bodies: Optional[str] = None, aspects: bool = True):
+    """Server-sent events version of /ws/sky"""
+    try:
+        body_filter = _sky_filter(bodies)
+        check_bodies(body_filter)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        # Subscribed on the first step, so a client gone before the body starts leaves nothing behind
+        subscriber = sky_broadcaster.subscribe(body_filter, aspects)
+        try:
+            async for frame in subscriber.frames():
+                yield f"data: {frame}\n\n"
+        finally:
+            sky_broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/stream/sky/stats")
+async def live_sky_stats() -> Dict[str, Any]:
+    """Subscriber count, distinct filters and frames dropped for slow consumers"""
+    return sky_broadcaster.stats()
+
+
+# ============= LUNISOLAR CALENDAR =============
+
+class LunarBulkRequest(BaseModel):
+    dates: List[str]  # YYYY-MM-DD
+
+
+@app.get("/calendar/lunar")
+async def gregorian_to_lunar(date: str) -> Dict[str, Any]:
+    """Chinese lunar date, year animal/element and that year's New Year date for a Gregorian date"""
+    try:
+        return get_lunisolar_calendar().to_lunar(date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {str(e)}")
+
+
+@app.get("/calendar/gregorian")
+async def lunar_to_gregorian(year: int, month: int, day: int, leap: bool = False) -> Dict[str, Any]:
+    """Gregorian date of a Chinese lunar date (leap=true for the intercalary month)"""
+    try:
+        calendar = get_lunisolar_calendar()
+        return {
+            'gregorian': calendar.to_gregorian(year, month, day, leap),
+            'lunar': {'year': year, 'month': month, 'day': day, 'leap_month': leap},
+            'year_months': calendar.year_months(year)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid lunar date: {str(e)}")
+
+
+@app.post("/calendar/lunar/bulk")
+async def gregorian_to_lunar_bulk(request: LunarBulkRequest) -> Dict[str, Any]:
+    """Vectorized Gregorian -> lunar conversion as columns, for imports"""
+    try:
+        found = get_lunisolar_calendar().to_lunar_many(request.dates)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid dates: {str(e)}")
+    return {
+        'dates': request.dates,
+        'lunar_year': found['lunar_year'].tolist(),
+        'month': found['month'].tolist(),
+        'day': found['day'].tolist(),
+        'leap_month': found['leap'].tolist()
+    }
+
+
+# ============= PLACES =============
+
+class PlaceQuery(BaseModel):
+    place: str
+    date: Optional[str] = None  # YYYY-MM-DD; with it the UTC offset in effect is returned
+    time: Optional[str] = None  # HH:MM[:SS], default noon
+
+
+class PlaceResolveRequest(BaseModel):
+    places: List[PlaceQuery]
+
+
+@app.get("/places/search")
+async def search_places(q: str, limit: int = 10) -> Dict[str, Any]:
+    """Offline place name lookup by prefix ("Port", "Portland, OR", "London, UK")"""
+    return {'query': q, 'places': get_gazetteer().search(q, max(1, min(limit, 100)))}
+
+
+@app.get("/places/nearest")
+async def nearest_places(lat: float, lon: float, k: int = 1) -> Dict[str, Any]:
+    """Places closest to a coordinate, with great-circle distance in km"""
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="Invalid coordinates")
+    return {'lat': lat, 'lon': lon, 'places': get_gazetteer().nearest(lat, lon, max(1, min(k, 100)))}
+
+
+@app.post("/places/resolve")
+async def resolve_places(request: PlaceResolveRequest) -> Dict[str, Any]:
+    """Bulk birth place resolution for imports: coordinates, zone and UTC offset per entry"""
+    results = []
+    for query in request.places:
+        found = resolve_place(query.place)
+        if found is None:
+            results.append({'place': query.place, 'found': False})
+            continue
+        result = dict(found, place=query.place, found=True)
+        if query.date:
+            try:
+                result['timezone_offset'] = local_utc_offset(found['timezone'], query.date, query.time)
+            except ValueError as e:
+                result['error'] = str(e)
+        results.append(result)
+    return {'results': results, 'resolved': sum(1 for r in results if r['found'])}
+
+
+@app.get("/single-flight/stats")
+async def single_flight_stats() -> Dict[str, Any]:
+    """Flights started and requests coalesced onto an identical in-flight one"""
+    return single_flight.stats()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
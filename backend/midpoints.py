@@ -0,0 +1,199 @@
+from datetime import datetime
+from itertools import combinations
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS
+from ephemeris_series import body_positions, julian_day_range, wrap180
+from forensic_scanner import jd_to_date
+
+
+MIDPOINT_POINTS = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn',
+                   'uranus', 'neptune', 'pluto', 'north_node', 'asc', 'mc']
+
+DIALS = (90.0, 45.0)
+
+HARMONIC_ASPECTS = {
+    'conjunction': 0, 'sextile': 60, 'square': 90, 'trine': 120, 'opposition': 180
+}
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+TRANSIT_BODIES = ['sun', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+
+def _dial_ranges(low: float, high: float, modulus: float) -> List[tuple]:
+    """Split a dial interval that may cross 0°"""
+    if high - low >= modulus:
+        return [(0.0, modulus)]
+    low %= modulus
+    high %= modulus
+    if low <= high:
+        return [(low, high)]
+    return [(low, modulus), (0.0, high)]
+
+
+class MidpointEngine:
+    """
+    Midpoints and harmonic charts for one natal chart
+    All midpoints (plus the points themselves) are computed once and kept
+    sorted by dial position, so "which midpoints does L hit" is a binary search
+    """
+
+    def __init__(self, natal_calculator, dial: float = 90.0):
+        """Initialize with a base AstrologicalCalculator instance"""
+        if dial not in DIALS:
+            raise ValueError(f"dial must be one of {DIALS}")
+        self.calc = natal_calculator
+        self.dial = dial
+
+        planets = self.calc.calculate_planets()
+        houses = self.calc.calculate_houses()
+        self.longitudes = {name: planets[name]['longitude'] for name in MIDPOINT_POINTS if name in planets}
+        self.longitudes['asc'] = houses['asc']
+        self.longitudes['mc'] = houses['mc']
+        self.points = list(self.longitudes.keys())
+
+        # every pair's near midpoint, plus each point on its own (A = A/A)
+        labels, lons = [], []
+        for first, second in combinations(self.points, 2):
+            a, b = self.longitudes[first], self.longitudes[second]
+            labels.append(f"{first}/{second}")
+            lons.append((a + wrap180(b - a) / 2.0) % 360.0)
+        for point in self.points:
+            labels.append(point)
+            lons.append(self.longitudes[point])
+
+        self.labels = np.array(labels)
+        self.midpoint_longitudes = np.array(lons)
+        dial_positions = self.midpoint_longitudes % self.dial
+        order = np.argsort(dial_positions)
+        self.dial_positions = dial_positions[order]
+        self.sorted_labels = self.labels[order]
+        self.sorted_longitudes = self.midpoint_longitudes[order]
+
+    # ============= MIDPOINT QUERIES =============
+
+    def _hit_indices(self, longitude: float, orb: float) -> np.ndarray:
+        position = longitude % self.dial
+        indices = []
+        for low, high in _dial_ranges(position - orb, position + orb, self.dial):
+            start = np.searchsorted(self.dial_positions, low, side='left')
+            stop = np.searchsorted(self.dial_positions, high, side='right')
+            indices.append(np.arange(start, stop))
+        return np.concatenate(indices) if indices else np.empty(0, dtype=int)
+
+    def hits(self, longitude: float, orb: float = 1.5) -> List[Dict[str, Any]]:
+        """Midpoints (and points) within `orb` of `longitude` on the dial"""
+        position = longitude % self.dial
+        results = []
+        for index in self._hit_indices(longitude, orb):
+            separation = (self.dial_positions[index] - position + self.dial / 2) % self.dial - self.dial / 2
+            results.append({
+                'midpoint': str(self.sorted_labels[index]),
+                'midpoint_longitude': float(self.sorted_longitudes[index]),
+                'orb': float(abs(separation))
+            })
+        results.sort(key=lambda hit: hit['orb'])
+        return results
+
+    def midpoint_tree(self, orb: float = 1.5) -> Dict[str, List[Dict[str, Any]]]:
+        """For each natal point, the midpoints it sits on (e.g. sun = moon/mars)"""
+        tree = {}
+        for point in self.points:
+            tree[point] = [hit for hit in self.hits(self.longitudes[point], orb)
+                           if hit['midpoint'] != point and point not in hit['midpoint'].split('/')]
+        return tree
+
+    def sorted_dial(self) -> List[Dict[str, Any]]:
+        return [{'midpoint': str(label), 'dial_position': float(position), 'longitude': float(lon)}
+                for label, position, lon in zip(self.sorted_labels, self.dial_positions, self.sorted_longitudes)]
+
+    def scan_transits(self, start_date: str, days: int = 365, bodies: Optional[Sequence[str]] = None,
+                      orb: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        Transits to midpoints over a span of days, merged into intervals
+        Each day is two binary searches per body against the sorted dial
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        jds = julian_day_range(swe.julday(start.year, start.month, start.day, 12), days)
+
+        intervals = []
+        for body in bodies or TRANSIT_BODIES:
+            lons, _ = body_positions(PLANET_IDS[body], jds)
+            positions = lons % self.dial
+
+            # per day: contiguous index ranges into the sorted dial (two when wrapping past 0)
+            low = (positions - orb) % self.dial
+            high = (positions + orb) % self.dial
+            starts = np.searchsorted(self.dial_positions, low, side='left')
+            stops = np.searchsorted(self.dial_positions, high, side='right')
+            wrapped = low > high
+
+            active = {}
+            for day in range(len(jds)):
+                if wrapped[day]:
+                    indices = list(range(starts[day], len(self.dial_positions))) + list(range(0, stops[day]))
+                else:
+                    indices = range(starts[day], stops[day])
+                for index in indices:
+                    separation = abs((self.dial_positions[index] - positions[day] + self.dial / 2)
+                                     % self.dial - self.dial / 2)
+                    run = active.get(index)
+                    if run and run['last_day'] == day - 1:
+                        run['last_day'] = day
+                        if separation < run['min_orb']:
+                            run['min_orb'], run['exact_day'] = separation, day
+                    else:
+                        if run:
+                            intervals.append(self._interval(body, index, run, jds))
+                        active[index] = {'first_day': day, 'last_day': day,
+                                         'exact_day': day, 'min_orb': separation}
+            intervals.extend(self._interval(body, index, run, jds) for index, run in active.items())
+
+        intervals.sort(key=lambda interval: (interval['start_date'], interval['transiting']))
+        return intervals
+
+    def _interval(self, body: str, index: int, run: Dict[str, Any], jds) -> Dict[str, Any]:
+        return {
+            'transiting': body,
+            'midpoint': str(self.sorted_labels[index]),
+            'start_date': jd_to_date(jds[run['first_day']]),
+            'end_date': jd_to_date(jds[run['last_day']]),
+            'exact_date': jd_to_date(jds[run['exact_day']]),
+            'min_orb': float(run['min_orb'])
+        }
+
+    # ============= HARMONICS =============
+
+    def harmonic_charts(self, harmonics: Sequence[int] = (5, 7, 9), orb: float = 3.0) -> Dict[str, Any]:
+        """Harmonic positions (longitude x n) and their aspects, all harmonics at once"""
+        names = self.points
+        natal = np.array([self.longitudes[name] for name in names])
+        numbers = np.array(list(harmonics), dtype=float)
+        positions = (natal[None, :] * numbers[:, None]) % 360.0              # (harmonics, points)
+
+        separation = np.abs(wrap180(positions[:, :, None] - positions[:, None, :]))
+        upper = np.triu(np.ones((len(names), len(names)), dtype=bool), k=1)
+
+        charts = {}
+        for h_index, harmonic in enumerate(harmonics):
+            aspects = []
+            for aspect_name, angle in HARMONIC_ASPECTS.items():
+                deviation = np.abs(separation[h_index] - angle)
+                for i, j in zip(*np.nonzero((deviation <= orb) & upper)):
+                    aspects.append({
+                        'point1': names[i],
+                        'point2': names[j],
+                        'aspect': aspect_name,
+                        'orb': float(deviation[i, j])
+                    })
+            aspects.sort(key=lambda aspect: aspect['orb'])
+            charts[f"H{harmonic}"] = {
+                'positions': {name: {'longitude': float(lon), 'sign': SIGNS[int(lon // 30)], 'degree': float(lon % 30)}
+                              for name, lon in zip(names, positions[h_index])},
+                'aspects': aspects
+            }
+        return charts
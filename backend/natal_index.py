@@ -0,0 +1,251 @@
+import bisect
+from typing import Dict, List, Any, Iterable, Optional, Sequence
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+
+
+# Points indexed for every chart
+INDEXED_POINTS = list(PLANET_IDS.keys()) + ['asc', 'mc']
+
+MAJOR_ASPECTS = {
+    'conjunction': 0, 'sextile': 60, 'square': 90, 'trine': 120, 'opposition': 180
+}
+
+# Pending inserts are merged into the sorted arrays once they grow past this
+COMPACT_THRESHOLD = 4096
+
+
+class _SortedPointColumn:
+    """
+    Sorted longitudes of one natal point across all charts
+    A sorted numpy base plus a small sorted insert buffer; deletions are
+    resolved through the owning index's liveness table
+    """
+
+    def __init__(self):
+        self.base_lons = np.empty(0)
+        self.base_rows = np.empty(0, dtype=np.int64)
+        self.pending: List[tuple] = []  # (longitude, row), kept sorted
+
+    def insert(self, longitude: float, row: int):
+        bisect.insort(self.pending, (longitude, row))
+
+    def compact(self, alive: np.ndarray):
+        """Merge pending inserts and drop deleted rows"""
+        if self.pending:
+            lons = np.concatenate([self.base_lons, [lon for lon, _ in self.pending]])
+            rows = np.concatenate([self.base_rows, np.array([row for _, row in self.pending], dtype=np.int64)])
+        else:
+            lons, rows = self.base_lons, self.base_rows
+
+        keep = alive[rows] if len(rows) else np.empty(0, dtype=bool)
+        lons, rows = lons[keep], rows[keep]
+        order = np.argsort(lons, kind='stable')
+        self.base_lons, self.base_rows = lons[order], rows[order]
+        self.pending = []
+
+    def range(self, low: float, high: float):
+        """Rows with low <= longitude <= high (no wrap, 0 <= low <= high < 360)"""
+        start = np.searchsorted(self.base_lons, low, side='left')
+        stop = np.searchsorted(self.base_lons, high, side='right')
+        lons = self.base_lons[start:stop]
+        rows = self.base_rows[start:stop]
+
+        if self.pending:
+            first = bisect.bisect_left(self.pending, (low, -1))
+            last = bisect.bisect_right(self.pending, (high, np.iinfo(np.int64).max))
+            extra = self.pending[first:last]
+            if extra:
+                lons = np.concatenate([lons, [lon for lon, _ in extra]])
+                rows = np.concatenate([rows, np.array([row for _, row in extra], dtype=np.int64)])
+
+        return lons, rows
+
+
+class NatalPointIndex:
+    """
+    Reverse index over stored natal longitudes
+    Answers "which charts have a point within orb of longitude L (or an
+    aspect to it)" with binary searches, O(log n + k) per query
+    """
+
+    def __init__(self, points: Optional[Sequence[str]] = None):
+        self.points = list(points or INDEXED_POINTS)
+        self.columns = {point: _SortedPointColumn() for point in self.points}
+
+        self._row_chart: List[Any] = []
+        self._alive = np.zeros(1024, dtype=bool)
+        self._chart_row: Dict[Any, int] = {}
+        self._pending_count = 0
+        # Removed rows stay in the columns until the next compaction, which
+        # purges them; only then are they free for reuse
+        self._dead_rows: List[int] = []
+        self._free_rows: List[int] = []
+
+    def __len__(self):
+        return len(self._chart_row)
+
+    # ============= MAINTENANCE =============
+
+    def _allocate_row(self, chart_id) -> int:
+        """Assign a row number to a chart, replacing any earlier row; purged rows are reused first"""
+        if chart_id in self._chart_row:
+            self.remove(chart_id)
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._row_chart[row] = chart_id
+        else:
+            row = len(self._row_chart)
+            self._row_chart.append(chart_id)
+        if row >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(len(self._alive), dtype=bool)])
+        self._alive[row] = True
+        self._chart_row[chart_id] = row
+        return row
+
+    def upsert(self, chart_id, longitudes: Dict[str, float]):
+        """Insert or replace the natal points of one chart"""
+        row = self._allocate_row(chart_id)
+
+        for point in self.points:
+            if point in longitudes:
+                self.columns[point].insert(float(longitudes[point]) % 360.0, row)
+                self._pending_count += 1
+
+        if self._pending_count > max(COMPACT_THRESHOLD, len(self._chart_row) // 8):
+            self.compact()
+
+    def upsert_calculator(self, chart_id, calculator):
+        """Index a chart straight from an AstrologicalCalculator"""
+        planets = calculator.calculate_planets()
+        houses = calculator.calculate_houses()
+        longitudes = {name: data['longitude'] for name, data in planets.items()}
+        longitudes['asc'] = houses['asc']
+        longitudes['mc'] = houses['mc']
+        self.upsert(chart_id, longitudes)
+
+    def remove(self, chart_id) -> bool:
+        """Delete a chart; its entries disappear from queries immediately"""
+        row = self._chart_row.pop(chart_id, None)
+        if row is None:
+            return False
+
+        self._alive[row] = False
+        self._row_chart[row] = None
+        self._dead_rows.append(row)
+        if len(self._dead_rows) > max(COMPACT_THRESHOLD, len(self._chart_row) // 4):
+            self.compact()
+        return True
+
+    def bulk_load(self, charts: Iterable[tuple]):
+        """Load many (chart_id, longitudes) pairs, then sort once"""
+        staged = {point: ([], []) for point in self.points}
+        for chart_id, longitudes in charts:
+            row = self._allocate_row(chart_id)
+            for point in self.points:
+                if point in longitudes:
+                    staged[point][0].append(float(longitudes[point]) % 360.0)
+                    staged[point][1].append(row)
+
+        for point, (lons, rows) in staged.items():
+            column = self.columns[point]
+            column.base_lons = np.concatenate([column.base_lons, lons])
+            column.base_rows = np.concatenate([column.base_rows, np.array(rows, dtype=np.int64)])
+        self.compact()
+
+    def compact(self):
+        """Fold pending inserts into the sorted arrays and purge deleted rows, freeing them for reuse"""
+        for column in self.columns.values():
+            column.compact(self._alive)
+        self._pending_count = 0
+        self._free_rows.extend(self._dead_rows)
+        self._dead_rows = []
+
+    # ============= QUERIES =============
+
+    def query(self, longitude: float, orb: float = 2.0,
+              aspects: Optional[Dict[str, float]] = None,
+              points: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Natal points within `orb` of `longitude` or of any aspect to it
+        aspects: name -> angle, defaults to conjunction only
+        """
+        hits = []
+        for point, aspect_name, target, lons, rows in self._matches(longitude, orb, aspects, points):
+            for natal_lon, row in zip(lons.tolist(), rows.tolist()):
+                hits.append({
+                    'chart_id': self._row_chart[row],
+                    'point': point,
+                    'natal_longitude': natal_lon,
+                    'aspect': aspect_name,
+                    'orb': abs((natal_lon - target + 180.0) % 360.0 - 180.0)
+                })
+        return hits
+
+    def activated_chart_ids(self, longitude: float, orb: float = 2.0,
+                            aspects: Optional[Dict[str, float]] = None,
+                            points: Optional[Sequence[str]] = None) -> List[Any]:
+        """Distinct charts hit by a query, without per-hit detail (notification fan-out)"""
+        matched = [rows for _, _, _, _, rows in self._matches(longitude, orb, aspects, points)]
+        if not matched:
+            return []
+        return [self._row_chart[row] for row in np.unique(np.concatenate(matched)).tolist()]
+
+    def _matches(self, longitude: float, orb: float, aspects: Optional[Dict[str, float]],
+                 points: Optional[Sequence[str]]):
+        """Yield (point, aspect, target, longitudes, rows) for every live match"""
+        aspects = aspects if aspects is not None else {'conjunction': 0}
+
+        for point in points or self.points:
+            column = self.columns[point]
+            for aspect_name, angle in aspects.items():
+                # both sides of the circle: L + angle and L - angle
+                targets = {round((longitude + angle) % 360.0, 9), round((longitude - angle) % 360.0, 9)}
+                for target in targets:
+                    for low, high in _wrapped_ranges(target - orb, target + orb):
+                        lons, rows = column.range(low, high)
+                        live = self._alive[rows]
+                        if live.any():
+                            yield point, aspect_name, target, lons[live], rows[live]
+
+    def sky_activations(self, julian_day: float, bodies: Optional[Sequence[str]] = None,
+                        orb: float = 2.0, aspects: Optional[Dict[str, float]] = None,
+                        detail: bool = True) -> Dict[str, List[Any]]:
+        """
+        Charts activated by each transiting body at a moment
+        detail=False returns only the distinct chart ids per body
+        """
+        aspects = aspects if aspects is not None else MAJOR_ASPECTS
+        activations = {}
+        for body in bodies or ['mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']:
+            transit_lon = calc_body(julian_day, PLANET_IDS[body])[0]
+            if not detail:
+                activations[body] = self.activated_chart_ids(transit_lon, orb, aspects)
+                continue
+
+            hits = self.query(transit_lon, orb, aspects)
+            for hit in hits:
+                hit['transiting'] = body
+                hit['transit_longitude'] = transit_lon
+            activations[body] = hits
+        return activations
+
+
+def _wrapped_ranges(low: float, high: float) -> List[tuple]:
+    """Split a longitude interval that may cross 0 degrees Aries"""
+    if high - low >= 360.0:
+        return [(0.0, 360.0)]
+    low %= 360.0
+    high %= 360.0
+    if low <= high:
+        return [(low, high)]
+    return [(low, 360.0), (0.0, high)]
+
+
+def julian_day_for(date: str, hour: float = 12.0) -> float:
+    """UT Julian Day for a YYYY-MM-DD date"""
+    year, month, day = (int(part) for part in date.split('-'))
+    return swe.julday(year, month, day, hour)
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
+import swisseph as swe
+
+from astrological_calculator import solar_altitude
+
+
+# Chaldean order, slowest to fastest; planetary hours cycle through it
+CHALDEAN_ORDER = ['saturn', 'jupiter', 'mars', 'sun', 'venus', 'mercury', 'moon']
+
+# Ruler of the first hour of each weekday, Monday first (datetime.weekday())
+DAY_RULERS = ['moon', 'mars', 'mercury', 'jupiter', 'venus', 'saturn', 'sun']
+
+# Cache key precision: 0.01° moves sunrise by well under a minute
+LOCATION_PRECISION = 2
+
+MAX_RANGE_DAYS = 366
+
+
+def _event_jd(jd_start: float, body: int, rsmi: int, lat: float, lon: float) -> Optional[float]:
+    """Next rise/set/transit after jd_start, or None when the body stays up or down"""
+    geopos = (lon, lat, 0.0)
+    try:
+        result, tret = swe.rise_trans(jd_start, body, rsmi, geopos, 0.0, 0.0, swe.FLG_SWIEPH)
+    except swe.Error:
+        result, tret = swe.rise_trans(jd_start, body, rsmi, geopos, 0.0, 0.0, swe.FLG_MOSEPH)
+    return tret[0] if result == 0 else None
+
+
+def _local_iso(jd: Optional[float], tz_offset: float) -> Optional[str]:
+    if jd is None:
+        return None
+    year, month, day, hour = swe.revjul(jd)
+    ut = datetime(year, month, day) + timedelta(hours=hour)
+    return (ut + timedelta(hours=tz_offset)).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _hours(start_jd: float, end_jd: float, first_ruler: str, period: str) -> List[Dict[str, Any]]:
+    """Twelve unequal hours between two horizon crossings"""
+    length = (end_jd - start_jd) / 12.0
+    first = CHALDEAN_ORDER.index(first_ruler)
+    return [{
+        'period': period,
+        'hour': i + 1,
+        'ruler': CHALDEAN_ORDER[(first + i) % 7],
+        'start_jd': start_jd + i * length,
+        'end_jd': start_jd + (i + 1) * length
+    } for i in range(12)]
+
+
+@lru_cache(maxsize=4096)
+def _day_table(lat: float, lon: float, date: str, tz_offset: float) -> Dict[str, Any]:
+    """
+    Rise/set times and planetary hours for one local civil date
+    Memoized per (rounded location, date), so repeated lookups are free
+    """
+    local_midnight = datetime.strptime(date, "%Y-%m-%d")
+    ut_midnight = local_midnight - timedelta(hours=tz_offset)
+    jd_midnight = swe.julday(ut_midnight.year, ut_midnight.month, ut_midnight.day,
+                             ut_midnight.hour + ut_midnight.minute / 60)
+
+    sunrise = _event_jd(jd_midnight, swe.SUN, swe.CALC_RISE, lat, lon)
+    sunset = _event_jd(sunrise or jd_midnight, swe.SUN, swe.CALC_SET, lat, lon)
+    next_sunrise = _event_jd(sunset, swe.SUN, swe.CALC_RISE, lat, lon) if sunset else None
+    solar_noon = _event_jd(jd_midnight, swe.SUN, swe.CALC_MTRANSIT, lat, lon)
+    moonrise = _event_jd(jd_midnight, swe.MOON, swe.CALC_RISE, lat, lon)
+    moonset = _event_jd(jd_midnight, swe.MOON, swe.CALC_SET, lat, lon)
+
+    # events found past the end of this local day belong to a later date
+    day_end = jd_midnight + 1.0
+    sunrise = sunrise if sunrise is not None and sunrise < day_end else None
+    moonrise = moonrise if moonrise is not None and moonrise < day_end else None
+    moonset = moonset if moonset is not None and moonset < day_end else None
+
+    table = {
+        'date': date,
+        'sunrise': sunrise,
+        'sunset': sunset if sunrise is not None else None,
+        'next_sunrise': next_sunrise if sunrise is not None else None,
+        'solar_noon': solar_noon,
+        'moonrise': moonrise,
+        'moonset': moonset,
+        'day_ruler': DAY_RULERS[local_midnight.weekday()],
+        'hours': [],
+        'polar': None
+    }
+
+    if sunrise is None or sunset is None or next_sunrise is None:
+        # no sunrise or sunset today: unequal hours are undefined
+        table['polar'] = 'polar_day' if solar_altitude(solar_noon or jd_midnight + 0.5, lat, lon) > 0 else 'polar_night'
+        return table
+
+    table['day_length_hours'] = (sunset - sunrise) * 24.0
+    table['night_length_hours'] = (next_sunrise - sunset) * 24.0
+    day_hours = _hours(sunrise, sunset, table['day_ruler'], 'day')
+    night_first = CHALDEAN_ORDER[(CHALDEAN_ORDER.index(table['day_ruler']) + 12) % 7]
+    table['hours'] = day_hours + _hours(sunset, next_sunrise, night_first, 'night')
+    return table
+
+
+class PlanetaryHours:
+    """
+    Sunrise, sunset, moonrise and planetary hours for one location
+    Tables are built from Swiss Ephemeris rise/transit searches and shared
+    across instances through the per-(location, date) cache
+    """
+
+    def __init__(self, lat: float, lon: float, timezone_offset: float = -5):
+        self.lat = round(lat, LOCATION_PRECISION)
+        self.lon = round(lon, LOCATION_PRECISION)
+        self.tz_offset = timezone_offset
+
+    def _table(self, date: str) -> Dict[str, Any]:
+        return _day_table(self.lat, self.lon, date, float(self.tz_offset))
+
+    def _format(self, table: Dict[str, Any]) -> Dict[str, Any]:
+        """Cached table with Julian Days rendered as local times"""
+        result = {key: table[key] for key in ('date', 'day_ruler', 'polar')}
+        for key in ('sunrise', 'sunset', 'next_sunrise', 'solar_noon', 'moonrise', 'moonset'):
+            result[key] = _local_iso(table[key], self.tz_offset)
+        if table['hours']:
+            result['day_length_hours'] = round(table['day_length_hours'], 4)
+            result['night_length_hours'] = round(table['night_length_hours'], 4)
+        result['planetary_hours'] = [{
+            'period': hour['period'],
+            'hour': hour['hour'],
+            'ruler': hour['ruler'],
+            'start': _local_iso(hour['start_jd'], self.tz_offset),
+            'end': _local_iso(hour['end_jd'], self.tz_offset)
+        } for hour in table['hours']]
+        return result
+
+    def day(self, date: str) -> Dict[str, Any]:
+        """Rise/set times and the 24 planetary hours starting at this date's sunrise"""
+        return self._format(self._table(date))
+
+    def days(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        if end < start:
+            raise ValueError("end_date must not be before start_date")
+        if (end - start).days + 1 > MAX_RANGE_DAYS:
+            raise ValueError(f"date range is limited to {MAX_RANGE_DAYS} days")
+        return [self.day((start + timedelta(days=i)).strftime("%Y-%m-%d"))
+                for i in range((end - start).days + 1)]
+
+    def hour_at(self, local_time: str) -> Dict[str, Any]:
+        """
+        Planetary hour in effect at a local 'YYYY-MM-DD HH:MM:SS'
+        Before sunrise the hour belongs to the previous date's night
+        """
+        local = datetime.strptime(local_time, "%Y-%m-%d %H:%M:%S")
+        ut = local - timedelta(hours=self.tz_offset)
+        jd = swe.julday(ut.year, ut.month, ut.day, ut.hour + ut.minute / 60 + ut.second / 3600)
+
+        for date in (local, local - timedelta(days=1)):
+            table = self._table(date.strftime("%Y-%m-%d"))
+            for hour in table['hours']:
+                if hour['start_jd'] <= jd < hour['end_jd']:
+                    return {
+                        'time': local_time,
+                        'period': hour['period'],
+                        'hour': hour['hour'],
+                        'ruler': hour['ruler'],
+                        'day_ruler': table['day_ruler'],
+                        'start': _local_iso(hour['start_jd'], self.tz_offset),
+                        'end': _local_iso(hour['end_jd'], self.tz_offset),
+                        'sect': self.sect(jd)
+                    }
+        return {'time': local_time, 'period': None, 'ruler': None, 'sect': self.sect(jd)}
+
+    def sect(self, julian_day: float) -> str:
+        """'day' when the Sun is above the horizon at this location, else 'night'"""
+        return 'day' if solar_altitude(julian_day, self.lat, self.lon) > 0 else 'night'
@@ -0,0 +1,214 @@
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+from ephemeris_series import body_positions, bisect_roots, boundary_crossings, wrap180
+from forensic_scanner import jd_to_date
+from relocation import angles_from_armc
+
+
+# One ephemeris day after birth corresponds to one tropical year of life
+TROPICAL_YEAR_DAYS = 365.24219
+
+PROGRESSED_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+PROGRESSED_ANGLES = ['asc', 'mc']
+STATION_BODIES = ['mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+PROGRESSION_ASPECTS = {
+    'conjunction': 0, 'sextile': 60, 'square': 90, 'trine': 120, 'opposition': 180
+}
+
+# Progressed Moon-Sun elongation in 45° steps
+LUNAR_PHASES = ['new', 'crescent', 'first_quarter', 'gibbous',
+                'full', 'disseminating', 'last_quarter', 'balsamic']
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+SIGN_EDGES = np.arange(0.0, 360.0, 30.0)
+PHASE_EDGES = np.arange(0.0, 360.0, 45.0)
+
+# Grid used to bracket events before refining them (monthly in real time)
+SAMPLES_PER_YEAR = 12
+
+
+def progressed_jd_for(natal_jd: float, target_jd: float) -> float:
+    """Progressed (ephemeris) JD for a real-time JD, day-for-a-year"""
+    return natal_jd + (target_jd - natal_jd) / TROPICAL_YEAR_DAYS
+
+
+def real_jd_for(natal_jd: float, progressed_jd):
+    """Real-time JD at which the progressed chart reaches progressed_jd"""
+    return natal_jd + (progressed_jd - natal_jd) * TROPICAL_YEAR_DAYS
+
+
+def right_ascension(longitudes, obliquity: float):
+    """RA of ecliptic longitudes (latitude 0), degrees"""
+    lam = np.radians(longitudes)
+    eps = np.radians(obliquity)
+    return np.degrees(np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam))) % 360.0
+
+
+class ProgressionEngine:
+    """
+    Secondary progressions for a whole life in one batch
+    A 100-year life is ~100 days of ephemeris, so every progressed body is
+    sampled once over that span; angles move by the solar arc in right
+    ascension (progressed ARMC = natal ARMC + progressed Sun RA - natal Sun RA)
+    """
+
+    def __init__(self, natal_calculator, house_system: str = 'P'):
+        """Initialize with a base AstrologicalCalculator instance"""
+        self.calc = natal_calculator
+        self.natal_jd = self.calc.julian_day
+        self.natal_planets = self.calc.calculate_planets()
+
+        houses = self.calc.calculate_houses(house_system)
+        self.house_system = house_system
+        self.cusps = np.array(list(houses['cusps'])[:12])
+        self.natal_armc = houses['armc']
+
+        nutation, _ = swe.calc_ut(self.natal_jd, swe.ECL_NUT)
+        self.obliquity = nutation[0]
+        self.natal_sun_ra = float(right_ascension(self.natal_planets['sun']['longitude'], self.obliquity))
+
+        self.natal_points = {name: self.natal_planets[name]['longitude'] for name in PROGRESSED_BODIES}
+        self.natal_points['asc'] = houses['asc']
+        self.natal_points['mc'] = houses['mc']
+
+    # ============= PROGRESSED POSITIONS =============
+
+    def _series(self, name: str) -> Callable:
+        """Vectorized progressed longitude of a body or angle as a function of progressed JD"""
+        if name in PROGRESSED_ANGLES:
+            index = PROGRESSED_ANGLES.index(name)
+            return lambda jds: self._angles(jds)[index]
+        planet_id = PLANET_IDS[name]
+        return lambda jds: body_positions(planet_id, jds)[0]
+
+    def _angles(self, progressed_jds):
+        """Progressed ASC and MC by solar arc in right ascension"""
+        sun_lons, _ = body_positions(swe.SUN, progressed_jds)
+        armc = (self.natal_armc + right_ascension(sun_lons, self.obliquity) - self.natal_sun_ra) % 360.0
+        return angles_from_armc(armc, np.full(len(armc), self.calc.lat), self.obliquity)
+
+    def _house_of(self, longitude: float) -> int:
+        offsets = (longitude - self.cusps) % 360.0
+        widths = (np.roll(self.cusps, -1) - self.cusps) % 360.0
+        return int(np.argmax(offsets < widths)) + 1
+
+    def chart_at(self, target_date: Optional[str] = None) -> Dict[str, Any]:
+        """Progressed chart (bodies, angles, lunar phase) for a calendar date"""
+        target_dt = datetime.strptime(target_date, "%Y-%m-%d") if target_date else datetime.now()
+        target_jd = swe.julday(target_dt.year, target_dt.month, target_dt.day, 12)
+        progressed_jd = progressed_jd_for(self.natal_jd, target_jd)
+
+        positions = {}
+        for name in PROGRESSED_BODIES:
+            pos = calc_body(progressed_jd, PLANET_IDS[name], swe.FLG_SPEED)
+            positions[name] = {
+                'longitude': pos[0],
+                'sign': SIGNS[int(pos[0] / 30)],
+                'degree': pos[0] % 30,
+                'speed': pos[3],
+                'retrograde': pos[3] < 0,
+                'natal_house': self._house_of(pos[0])
+            }
+
+        asc, mc = self._angles(np.array([progressed_jd]))
+        for name, lon in (('asc', float(asc[0])), ('mc', float(mc[0]))):
+            positions[name] = {'longitude': lon, 'sign': SIGNS[int(lon / 30)], 'degree': lon % 30}
+
+        elongation = (positions['moon']['longitude'] - positions['sun']['longitude']) % 360.0
+        return {
+            'target_date': target_dt.strftime("%Y-%m-%d"),
+            'progressed_jd': progressed_jd,
+            'age': (target_jd - self.natal_jd) / TROPICAL_YEAR_DAYS,
+            'positions': positions,
+            'lunar_phase': {'phase': LUNAR_PHASES[int(elongation / 45) % 8], 'elongation': elongation}
+        }
+
+    # ============= LIFETIME TIMELINE =============
+
+    def timeline(self, years: int = 100, aspects: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """
+        Every progressed event within `years` of birth, ordered by date:
+        sign and natal-house ingresses, exact aspects to natal points,
+        stations and lunar phase changes
+        """
+        aspects = aspects if aspects is not None else PROGRESSION_ASPECTS
+        grid = self.natal_jd + np.arange(years * SAMPLES_PER_YEAR + 1) / SAMPLES_PER_YEAR
+
+        events = []
+        for name in PROGRESSED_BODIES + PROGRESSED_ANGLES:
+            series = self._series(name)
+            values = series(grid)
+
+            lo, hi, boundary, entered = boundary_crossings(values, grid, SIGN_EDGES)
+            roots = bisect_roots(lambda jds, b=boundary, f=series: wrap180(f(jds) - b), lo, hi)
+            events += [self._event(root, 'sign_ingress', name, sign=SIGNS[sign])
+                       for root, sign in zip(roots, entered)]
+
+            events += self._aspects(name, series, values, grid, aspects)
+            if name in PROGRESSED_BODIES:
+                events += self._house_ingresses(name, series, values, grid)
+
+            if name in STATION_BODIES:
+                speed = lambda jds, p=PLANET_IDS[name]: body_positions(p, jds)[1]
+                speeds = speed(grid)
+                flips = np.nonzero(np.sign(speeds[1:]) != np.sign(speeds[:-1]))[0]
+                roots = bisect_roots(speed, grid[flips], grid[flips + 1])
+                events += [self._event(root, 'station', name, station='direct' if before < 0 else 'retrograde')
+                           for root, before in zip(roots, speeds[flips])]
+
+        events += self._lunar_phases(grid)
+        events.sort(key=lambda event: event['progressed_jd'])
+        return events
+
+    def _house_ingresses(self, name: str, series: Callable, values, grid) -> List[Dict[str, Any]]:
+        order = np.argsort(self.cusps)
+        lo, hi, boundary, entered = boundary_crossings(values, grid, self.cusps[order])
+        roots = bisect_roots(lambda jds, b=boundary: wrap180(series(jds) - b), lo, hi)
+        return [self._event(root, 'house_ingress', name, house=int(order[band]) + 1)
+                for root, band in zip(roots, entered)]
+
+    def _aspects(self, name: str, series: Callable, values, grid,
+                 aspects: Dict[str, float]) -> List[Dict[str, Any]]:
+        """Exact progressed-to-natal aspects, found as sign changes of the deviation"""
+        targets, labels = [], []
+        for natal_name, natal_lon in self.natal_points.items():
+            for aspect_name, angle in aspects.items():
+                for target in {(natal_lon + angle) % 360.0, (natal_lon - angle) % 360.0}:
+                    targets.append(target)
+                    labels.append((natal_name, aspect_name))
+        targets = np.array(targets)
+
+        deviation = wrap180(values[None, :] - targets[:, None])
+        left, right = deviation[:, :-1], deviation[:, 1:]
+        # ignore the birth moment itself, where a point sits exactly on its own natal place
+        crossing = ((left < 0) != (right < 0)) & (np.abs(left - right) < 180.0) & (np.abs(left) > 1e-4)
+        rows, samples = np.nonzero(crossing)
+
+        roots = bisect_roots(lambda jds, t=targets[rows]: wrap180(series(jds) - t),
+                             grid[samples], grid[samples + 1])
+        return [self._event(root, 'aspect', name, natal=labels[row][0], aspect=labels[row][1])
+                for root, row in zip(roots, rows)]
+
+    def _lunar_phases(self, grid) -> List[Dict[str, Any]]:
+        elongation = lambda jds: (body_positions(swe.MOON, jds)[0] - body_positions(swe.SUN, jds)[0]) % 360.0
+        lo, hi, boundary, entered = boundary_crossings(elongation(grid), grid, PHASE_EDGES)
+        roots = bisect_roots(lambda jds, b=boundary: wrap180(elongation(jds) - b), lo, hi)
+        return [self._event(root, 'lunar_phase', 'moon', phase=LUNAR_PHASES[phase])
+                for root, phase in zip(roots, entered)]
+
+    def _event(self, progressed_jd: float, event_type: str, point: str, **details) -> Dict[str, Any]:
+        event = {
+            'type': event_type,
+            'point': point,
+            'date': jd_to_date(float(real_jd_for(self.natal_jd, progressed_jd))),
+            'age': round(float(progressed_jd - self.natal_jd), 3),
+            'progressed_jd': float(progressed_jd)
+        }
+        event.update(details)
+        return event
@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+from date_chunks import CHUNK_WORKERS, map_chunks
+from ephemeris_series import body_positions, wrap180
+from progressions import TROPICAL_YEAR_DAYS, right_ascension
+from relocation import angles_from_armc
+
+
+NATAL_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+TRANSIT_BODIES = ['sun', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+# Traditional rulers by sign index, as in AdvancedTimingTechniques._get_sign_ruler
+SIGN_RULERS = ['mars', 'venus', 'mercury', 'moon', 'sun', 'mercury',
+               'venus', 'mars', 'jupiter', 'saturn', 'saturn', 'jupiter']
+
+# Houses (whole sign from the candidate ASC) that describe each kind of life event
+EVENT_HOUSES = {
+    'marriage': [7, 5], 'relationship': [7, 5], 'divorce': [7, 8],
+    'career': [10, 6], 'promotion': [10], 'job_loss': [10, 12],
+    'relocation': [4, 9], 'birth_of_child': [5], 'death': [8, 4], 'loss': [8, 12],
+    'illness': [6, 12, 1], 'accident': [1, 6, 8], 'surgery': [8, 6],
+    'education': [9, 3], 'travel': [9, 3], 'financial': [2, 8], 'other': [1, 10]
+}
+
+# angle -> weight; hard contacts to angles carry the most timing information
+ASPECT_WEIGHTS = {0: 1.0, 180: 0.8, 90: 0.8, 120: 0.5, 60: 0.4}
+
+TECHNIQUE_ORBS = {'transits': 2.0, 'rulers': 1.5, 'progressions': 1.0, 'solar_arc': 1.0, 'profections': 1.5}
+TECHNIQUE_WEIGHTS = {'transits': 1.0, 'rulers': 0.75, 'progressions': 1.5, 'solar_arc': 1.5, 'profections': 0.5}
+TECHNIQUES = list(TECHNIQUE_WEIGHTS.keys())
+
+# Softmax temperature turning scores into the candidate distribution
+DISTRIBUTION_TEMPERATURE = 1.0
+
+MAX_CANDIDATES = 1440
+
+# Below this many candidate x event evaluations the scan runs in-process;
+# vectorized scoring is faster than starting worker processes
+PARALLEL_MIN_WORK = 20000
+
+
+def _aspect_score(moving, fixed, orb: float):
+    """Sum over aspects of a linear closeness score (1 exact, 0 at the orb), broadcasting"""
+    separation = np.abs(wrap180(moving - fixed))
+    score = 0.0
+    for angle, weight in ASPECT_WEIGHTS.items():
+        score = score + weight * np.clip(1.0 - np.abs(separation - angle) / orb, 0.0, None)
+    return score
+
+
+def _score_candidates(lat: float, lon: float, events, candidate_jds) -> np.ndarray:
+    """
+    Technique scores for a chunk of candidate birth moments, shape (candidates, techniques)
+    Runs in the shared date_chunks pool; every step is vectorized over the chunk
+    """
+    candidate_jds = np.asarray(candidate_jds, dtype=float)
+    count = len(candidate_jds)
+
+    obliquity = swe.calc_ut(float(candidate_jds[0]), swe.ECL_NUT)[0][0]
+    armc = np.array([(swe.sidtime(float(jd)) * 15.0 + lon) % 360.0 for jd in candidate_jds])
+    asc, mc = angles_from_armc(armc, np.full(count, lat), obliquity)
+    angles = np.stack([asc, mc], axis=1)                                    # (n, 2)
+    asc_sign = (asc // 30).astype(int)
+
+    natal = np.stack([body_positions(PLANET_IDS[name], candidate_jds)[0] for name in NATAL_BODIES], axis=1)
+    natal_sun = natal[:, NATAL_BODIES.index('sun')]
+    ruler_index = np.array([NATAL_BODIES.index(ruler) for ruler in SIGN_RULERS])
+
+    scores = np.zeros((count, len(TECHNIQUES)))
+    for event_jd, houses, weight, transits in events:
+        transits = np.asarray(transits)                                     # (bodies,)
+        age = (event_jd - candidate_jds) / TROPICAL_YEAR_DAYS
+
+        # transits to the candidate angles
+        transit_score = _aspect_score(angles[:, :, None], transits[None, None, :],
+                                      TECHNIQUE_ORBS['transits']).sum(axis=(1, 2))
+
+        # transits to the rulers of the event's houses (whole sign)
+        house_signs = (asc_sign[:, None] + np.array(houses)[None, :] - 1) % 12
+        ruler_lons = np.take_along_axis(natal, ruler_index[house_signs], axis=1)
+        ruler_score = _aspect_score(ruler_lons[:, :, None], transits[None, None, :],
+                                    TECHNIQUE_ORBS['rulers']).sum(axis=(1, 2))
+
+        # secondary progressions: angles by solar arc in RA, progressed Moon to natal angles
+        progressed_jds = candidate_jds + age
+        progressed_sun, _ = body_positions(swe.SUN, progressed_jds)
+        progressed_moon, _ = body_positions(swe.MOON, progressed_jds)
+        progressed_armc = (armc + right_ascension(progressed_sun, obliquity)
+                           - right_ascension(natal_sun, obliquity)) % 360.0
+        p_asc, p_mc = angles_from_armc(progressed_armc, np.full(count, lat), obliquity)
+        progressed_angles = np.stack([p_asc, p_mc], axis=1)
+        progression_score = (
+            _aspect_score(progressed_angles[:, :, None], natal[:, None, :], TECHNIQUE_ORBS['progressions']).sum(axis=(1, 2)) +
+            _aspect_score(progressed_moon[:, None], angles, TECHNIQUE_ORBS['progressions']).sum(axis=1)
+        )
+
+        # solar arc: directed angles to natal planets and directed planets to natal angles
+        arc = (progressed_sun - natal_sun) % 360.0
+        directed_angles = angles + arc[:, None]
+        directed_planets = natal + arc[:, None]
+        solar_arc_score = (
+            _aspect_score(directed_angles[:, :, None], natal[:, None, :], TECHNIQUE_ORBS['solar_arc']).sum(axis=(1, 2)) +
+            _aspect_score(directed_planets[:, :, None], angles[:, None, :], TECHNIQUE_ORBS['solar_arc']).sum(axis=(1, 2))
+        )
+
+        # annual profections: the lord of the year (ruler of the sign profected from the
+        # candidate ASC) is transited, or rules one of the event's houses
+        year_lord = ruler_index[(asc_sign + np.floor(age).astype(int)) % 12]
+        year_lord_lon = natal[np.arange(count), year_lord]
+        profection_score = (
+            _aspect_score(year_lord_lon[:, None], transits[None, :], TECHNIQUE_ORBS['profections']).sum(axis=1) +
+            (ruler_index[house_signs] == year_lord[:, None]).any(axis=1)
+        )
+
+        technique_scores = np.stack([transit_score, ruler_score, progression_score,
+                                     solar_arc_score, profection_score], axis=1)
+        scores += weight * technique_scores
+
+    return scores * np.array([TECHNIQUE_WEIGHTS[name] for name in TECHNIQUES])[None, :]
+
+
+class RectificationEngine:
+    """
+    Birth-time rectification from dated life events
+    Scans candidate birth times across the day and scores how well
+    transits, progressions, solar arcs and profections to the candidate's
+    angles and house rulers explain each event
+    """
+
+    def __init__(self, birth_date: str, lat: float, lon: float, timezone_offset: float = -5,
+                 workers: Optional[int] = None):
+        self.birth_date = birth_date
+        self.lat = lat
+        self.lon = lon
+        self.tz_offset = timezone_offset
+        self.workers = workers or CHUNK_WORKERS
+
+    def candidate_times(self, start_time: str = "00:00", end_time: str = "23:59",
+                        resolution_minutes: float = 4.0) -> List[datetime]:
+        """Local candidate birth times between start_time and end_time"""
+        start = datetime.strptime(f"{self.birth_date} {start_time}", "%Y-%m-%d %H:%M")
+        end = datetime.strptime(f"{self.birth_date} {end_time}", "%Y-%m-%d %H:%M")
+        if resolution_minutes <= 0 or end < start:
+            raise ValueError("invalid candidate time range")
+
+        count = int((end - start).total_seconds() / 60 / resolution_minutes) + 1
+        if count > MAX_CANDIDATES:
+            raise ValueError(f"{count} candidate times requested, limit is {MAX_CANDIDATES}")
+        return [start + timedelta(minutes=i * resolution_minutes) for i in range(count)]
+
+    def _julian_day(self, local: datetime) -> float:
+        ut = local - timedelta(hours=self.tz_offset)
+        return swe.julday(ut.year, ut.month, ut.day, ut.hour + ut.minute / 60 + ut.second / 3600)
+
+    def rectify(self, events: Sequence[Dict[str, Any]], start_time: str = "00:00", end_time: str = "23:59",
+                resolution_minutes: float = 4.0, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Ranked candidate birth times and their probability distribution
+        events: [{'date': 'YYYY-MM-DD', 'type': one of EVENT_HOUSES, 'weight': 1.0}]
+        """
+        if not events:
+            raise ValueError("at least one life event is required")
+
+        prepared = []
+        for event in events:
+            event_type = event.get('type') or 'other'
+            if event_type not in EVENT_HOUSES:
+                raise ValueError(f"Unknown event type: {event_type}")
+            event_dt = datetime.strptime(event['date'], "%Y-%m-%d")
+            event_jd = swe.julday(event_dt.year, event_dt.month, event_dt.day, 12)
+            transits = [calc_body(event_jd, PLANET_IDS[name])[0] for name in TRANSIT_BODIES]
+            prepared.append((event_jd, EVENT_HOUSES[event_type], float(event.get('weight', 1.0)), transits))
+
+        times = self.candidate_times(start_time, end_time, resolution_minutes)
+        jds = np.array([self._julian_day(local) for local in times])
+
+        workers = self.workers if len(jds) * len(prepared) >= PARALLEL_MIN_WORK else 1
+        chunks = [chunk for chunk in np.array_split(jds, min(workers, len(jds))) if len(chunk)]
+        results = map_chunks(_score_candidates, [chunk.tolist() for chunk in chunks], self.lat, self.lon, prepared)
+        breakdown = np.concatenate(results)
+        scores = breakdown.sum(axis=1)
+
+        weights = np.exp((scores - scores.max()) / DISTRIBUTION_TEMPERATURE)
+        probabilities = weights / weights.sum()
+
+        obliquity = swe.calc_ut(float(jds[0]), swe.ECL_NUT)[0][0]
+        armc = np.array([(swe.sidtime(float(jd)) * 15.0 + self.lon) % 360.0 for jd in jds])
+        asc, mc = angles_from_armc(armc, np.full(len(jds), self.lat), obliquity)
+
+        candidates = []
+        for i, local in enumerate(times):
+            candidates.append({
+                'time': local.strftime("%H:%M"),
+                'score': round(float(scores[i]), 4),
+                'probability': float(probabilities[i]),
+                'asc': float(asc[i]),
+                'asc_sign': SIGNS[int(asc[i] // 30)],
+                'mc': float(mc[i]),
+                'techniques': {name: round(float(breakdown[i, j]), 4) for j, name in enumerate(TECHNIQUES)}
+            })
+
+        asc_signs = {}
+        for candidate in candidates:
+            asc_signs[candidate['asc_sign']] = asc_signs.get(candidate['asc_sign'], 0.0) + candidate['probability']
+
+        ranked = sorted(candidates, key=lambda candidate: -candidate['score'])
+        return {
+            'best_candidates': ranked[:top_n],
+            'distribution': [{'time': c['time'], 'probability': c['probability']} for c in candidates],
+            'asc_sign_distribution': dict(sorted(asc_signs.items(), key=lambda item: -item[1])),
+            'candidates_scanned': len(candidates),
+            'resolution_minutes': resolution_minutes,
+            'events_used': len(prepared)
+        }
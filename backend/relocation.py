@@ -0,0 +1,147 @@
+from typing import Dict, List, Any, Iterator, Sequence, Tuple
+import numpy as np
+import swisseph as swe
+from depth_tiers import HOUSE_SYSTEMS
+
+
+# Upper bound on locations evaluated in a single request
+MAX_LOCATIONS = 50000
+
+# Fallback when a quadrant system is undefined (polar latitudes)
+POLAR_FALLBACK_SYSTEM = 'O'  # Porphyry
+
+
+def angles_from_armc(armc, lats, obliquity: float) -> Tuple[Any, Any]:
+    """Closed-form ASC and MC (degrees) from ARMC, latitude and obliquity arrays"""
+    ramc = np.radians(armc)
+    eps = np.radians(obliquity)
+    phi = np.radians(np.clip(lats, -89.999, 89.999))
+
+    mc = np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps))) % 360.0
+    asc = np.degrees(np.arctan2(np.cos(ramc),
+                                -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)))) % 360.0
+    return asc, mc
+
+
+def check_request(count: int, house_system: str):
+    """ValueError for a location count or house system a relocation request cannot use"""
+    if count > MAX_LOCATIONS:
+        raise ValueError(f"{count} locations requested, limit is {MAX_LOCATIONS}")
+    if house_system not in HOUSE_SYSTEMS.values():
+        raise ValueError(f"Unknown house system: {house_system}")
+
+
+def grid_locations(lat_min: float, lat_max: float, lon_min: float, lon_max: float,
+                   step: float) -> List[Tuple[float, float]]:
+    """Expand a lat/lon bounding box into (lat, lon) grid points"""
+    if step <= 0:
+        raise ValueError("grid step must be positive")
+
+    lats = np.arange(lat_min, lat_max + step / 2, step)
+    lons = np.arange(lon_min, lon_max + step / 2, step)
+    if len(lats) * len(lons) > MAX_LOCATIONS:
+        raise ValueError(f"grid has {len(lats) * len(lons)} points, limit is {MAX_LOCATIONS}")
+
+    lat_grid, lon_grid = np.meshgrid(lats, lons, indexing='ij')
+    return list(zip(lat_grid.ravel().round(6).tolist(), lon_grid.ravel().round(6).tolist()))
+
+
+class RelocationGrid:
+    """
+    Relocated charts for one birth moment over many locations
+    Planets are computed once; only houses depend on location
+    """
+
+    def __init__(self, natal_calculator, house_system: str = 'P'):
+        """Initialize with a base AstrologicalCalculator instance"""
+        self.calc = natal_calculator
+        self.house_system = house_system
+        self.natal_planets = self.calc.calculate_planets()
+
+        self.planet_names = list(self.natal_planets.keys())
+        self.planet_longitudes = np.array([self.natal_planets[name]['longitude']
+                                           for name in self.planet_names])
+
+        # Everything location-independent: sidereal time and true obliquity
+        self.gst = swe.sidtime(self.calc.julian_day) * 15.0
+        nutation, _ = swe.calc_ut(self.calc.julian_day, swe.ECL_NUT)
+        self.obliquity = nutation[0]
+
+    def calculate_locations(self, locations: Sequence[Tuple[float, float]]) -> Dict[str, Any]:
+        """
+        Houses, angles and planet house placements for every location
+        locations: sequence of (lat, lon) in decimal degrees
+        """
+        check_request(len(locations), self.house_system)
+
+        coords = np.array(locations, dtype=float).reshape(-1, 2)
+        lats, lons = coords[:, 0], coords[:, 1]
+        armc = (self.gst + lons) % 360.0
+
+        cusps, systems = self._batch_cusps(armc, lats)
+        asc, mc = self._batch_angles(armc, lats)
+        placements = self._batch_planet_houses(cusps)
+
+        results = []
+        for i in range(len(coords)):
+            results.append({
+                'lat': float(lats[i]),
+                'lon': float(lons[i]),
+                'armc': float(armc[i]),
+                'asc': float(asc[i]),
+                'mc': float(mc[i]),
+                'cusps': cusps[i].tolist(),
+                'house_system': systems[i],
+                'planet_houses': dict(zip(self.planet_names, placements[i].tolist()))
+            })
+
+        return {
+            'planets': self.natal_planets,
+            'locations': results,
+            'house_system': self.house_system,
+            'count': len(results)
+        }
+
+    def iter_location_chunks(self, locations: Sequence[Tuple[float, float]],
+                             chunk_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Yield relocated charts in chunks for progressive heatmap rendering"""
+        for start in range(0, len(locations), chunk_size):
+            yield self.calculate_locations(locations[start:start + chunk_size])['locations']
+
+    def _batch_angles(self, armc, lats) -> Tuple[Any, Any]:
+        """Closed-form ASC and MC for all locations"""
+        return angles_from_armc(armc, lats, self.obliquity)
+
+    def _batch_cusps(self, armc, lats) -> Tuple[Any, List[str]]:
+        """House cusps for every location from its ARMC"""
+        count = len(armc)
+
+        if self.house_system in ('W', 'E'):
+            asc, _ = self._batch_angles(armc, lats)
+            start = np.floor(asc / 30.0) * 30.0 if self.house_system == 'W' else asc
+            cusps = (start[:, None] + 30.0 * np.arange(12)) % 360.0
+            return cusps, [self.house_system] * count
+
+        system = bytes(self.house_system, 'utf-8')
+        cusps = np.empty((count, 12))
+        systems = []
+        for i in range(count):
+            try:
+                houses, _ = swe.houses_armc(armc[i], lats[i], self.obliquity, system)
+                systems.append(self.house_system)
+            except swe.Error:
+                houses, _ = swe.houses_armc(armc[i], lats[i], self.obliquity,
+                                            bytes(POLAR_FALLBACK_SYSTEM, 'utf-8'))
+                systems.append(POLAR_FALLBACK_SYSTEM)
+            cusps[i] = houses[:12]
+
+        return cusps, systems
+
+    def _batch_planet_houses(self, cusps):
+        """House number of every natal planet for every location"""
+        # offset of each planet past each cusp, and each house's width, both mod 360
+        offsets = (self.planet_longitudes[None, :, None] - cusps[:, None, :]) % 360.0
+        widths = (np.roll(cusps, -1, axis=1) - cusps) % 360.0
+        inside = offsets < widths[:, None, :]
+        # argmax picks the first matching house; every planet falls in exactly one
+        return np.argmax(inside, axis=2) + 1
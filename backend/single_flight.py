@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Any, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+
+# Path of a SQLite file shared by the workers on one host; unset keeps
+# coalescing per process
+SINGLE_FLIGHT_STORE = os.getenv("SINGLE_FLIGHT_STORE")
+
+# A leader that has not published within this many seconds is presumed dead
+# (worker killed mid-request) and the next request takes over
+LEASE_SECONDS = 60.0
+
+# How long a published result stays readable for followers in other workers
+RESULT_TTL_SECONDS = 2.0
+
+POLL_SECONDS = 0.05
+
+
+def request_key(name: str, arguments: Dict[str, Any]) -> str:
+    """Endpoint name plus its parsed arguments in canonical JSON, hashed"""
+    payload = json.dumps([name, jsonable_encoder(arguments)], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SharedFlightStore:
+    """
+    Cross-worker single flight through a SQLite file: the first worker to claim
+    a key computes, the others poll for its published result
+    """
+
+    def __init__(self, path: str, lease_seconds: float = LEASE_SECONDS,
+                 result_ttl: float = RESULT_TTL_SECONDS, poll_seconds: float = POLL_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.result_ttl = result_ttl
+        self.poll_seconds = poll_seconds
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS inflight (key TEXT PRIMARY KEY, started REAL)")
+            db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL, payload TEXT)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _claim(self, key: str):
+        """(True, None) when this worker should compute, (False, payload) once a result exists, else (False, None)"""
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DELETE FROM results WHERE created < ?", (now - self.result_ttl,))
+            db.execute("DELETE FROM inflight WHERE started < ?", (now - self.lease_seconds,))
+            row = db.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                db.execute("COMMIT")
+                return False, json.loads(row[0])
+            claimed = db.execute("INSERT OR IGNORE INTO inflight VALUES (?, ?)", (key, now)).rowcount == 1
+            db.execute("COMMIT")
+            return claimed, None
+        finally:
+            db.close()
+
+    def _publish(self, key: str, payload: Optional[Dict[str, Any]]):
+        """Store the leader's outcome (None: failed without a shareable result) and release the claim"""
+        with self._connect() as db:
+            if payload is not None:
+                db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, time.time(), json.dumps(payload)))
+            db.execute("DELETE FROM inflight WHERE key = ?", (key,))
+
+    async def run(self, key: str, compute: Callable[[], Any]) -> Any:
+        while True:
+            claimed, payload = await run_in_threadpool(self._claim, key)
+            if payload is not None:
+                if 'error' in payload:
+                    raise HTTPException(**payload['error'])
+                return payload['result']
+            if claimed:
+                break
+            await asyncio.sleep(self.poll_seconds)
+
+        try:
+            result = await run_in_threadpool(compute)
+        except HTTPException as e:
+            await run_in_threadpool(self._publish, key, {'error': {'status_code': e.status_code, 'detail': e.detail}})
+            raise
+        except BaseException:
+            await run_in_threadpool(self._publish, key, None)
+            raise
+        await run_in_threadpool(self._publish, key, {'result': jsonable_encoder(result)})
+        return result
+
+
+class SingleFlight:
+    """
+    Identical requests already in flight share one computation: followers
+    await the leader's result (or error) instead of recomputing
+    The computation runs in the threadpool, so the event loop keeps accepting
+    the requests that coalesce onto it
+    """
+
+    def __init__(self, store_path: Optional[str] = None):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.store = SharedFlightStore(store_path) if store_path else None
+        self.flights = 0
+        self.coalesced = 0
+
+    def _finished(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here so a failure nobody awaited is not logged
+
+    async def _compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        self.flights += 1
+        if self.store is not None:
+            return await self.store.run(key, compute)
+        return await run_in_threadpool(compute)
+
+    async def do(self, key: str, compute: Callable[[], Any]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        else:
+            self.coalesced += 1
+        # shielded: a client that disconnects must not cancel the others' result
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': len(self._inflight),
+            'flights': self.flights,
+            'coalesced': self.coalesced,
+            'shared_store': self.store.path if self.store else None
+        }
+
+
+single_flight = SingleFlight(SINGLE_FLIGHT_STORE)
+
+
+def coalesce(endpoint):
+    """
+    Endpoint decorator: identical normalized requests in flight at the same time
+    run the endpoint once. Only for read-only endpoints whose result depends on
+    the request alone: with SINGLE_FLIGHT_STORE, results are shared across
+    processes, so an endpoint reading per-process mutable state must not use it
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(**arguments):
+        key = request_key(endpoint.__name__, arguments)
+        return await single_flight.do(key, lambda: asyncio.run(endpoint(**arguments)))
+    return wrapper
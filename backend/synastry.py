@@ -0,0 +1,251 @@
+import heapq
+import math
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import AstrologicalCalculator, PLANET_IDS, calc_body
+
+
+# Columns of the longitude matrix: every natal body plus the angles
+SYNASTRY_POINTS = list(PLANET_IDS.keys()) + ['asc', 'mc']
+
+# Aspect angle, orb and harmony weight (negative = tension)
+SYNASTRY_ASPECTS = {
+    'conjunction': (0, 8, 1.0),
+    'sextile': (60, 6, 0.8),
+    'square': (90, 7, -1.0),
+    'trine': (120, 8, 1.0),
+    'opposition': (180, 8, -0.6)
+}
+
+# Personal points dominate compatibility, generational planets barely register
+POINT_WEIGHTS = {
+    'sun': 1.5, 'moon': 1.5, 'mercury': 1.0, 'venus': 1.3, 'mars': 1.2,
+    'jupiter': 0.8, 'saturn': 0.8, 'uranus': 0.4, 'neptune': 0.4, 'pluto': 0.4,
+    'north_node': 0.6, 'chiron': 0.5, 'asc': 1.2, 'mc': 0.8
+}
+
+# Upper bound on pair-point cells evaluated at once when scoring N x M
+SCORING_CHUNK_CELLS = 4_000_000
+
+# Separations are scored through a lookup table sampled every 1/100 degree
+HARMONY_TABLE_STEPS = 100
+
+
+def _build_harmony_table() -> np.ndarray:
+    """Aspect harmony for every separation 0-180 degrees, orbs tapering linearly"""
+    separation = np.arange(0, 180 * HARMONY_TABLE_STEPS + 1) / HARMONY_TABLE_STEPS
+    table = np.zeros(separation.shape)
+    for angle, orb, weight in SYNASTRY_ASPECTS.values():
+        table += weight * np.clip(1.0 - np.abs(separation - angle) / orb, 0.0, None)
+    return table
+
+
+HARMONY_TABLE = _build_harmony_table()
+
+
+def chart_longitudes(calculator) -> np.ndarray:
+    """
+    One row of the longitude matrix for a natal chart
+    Every body in PLANET_IDS is computed whatever the calculator's depth tier,
+    so charts of different tiers share the same columns
+    """
+    houses = calculator.calculate_houses()
+    row = [calc_body(calculator.julian_day, planet_id)[0] for planet_id in PLANET_IDS.values()]
+    row.extend([houses['asc'], houses['mc']])
+    return np.array(row)
+
+
+def _separation(a, b):
+    """Circular distance in degrees (0-180), broadcasting over any shapes"""
+    return np.abs((a - b + 180.0) % 360.0 - 180.0)
+
+
+def _circular_midpoint(a, b):
+    """Midpoint on the shorter arc between two longitudes"""
+    return (a + ((b - a + 180.0) % 360.0 - 180.0) / 2.0) % 360.0
+
+
+class SynastryEngine:
+    """
+    Synastry and compatibility matching over a population of natal charts
+    Charts are held as a longitude matrix (charts x points) so cross-aspects
+    for 1xN and NxM pairs are a handful of array operations
+    """
+
+    def __init__(self):
+        self.chart_ids: List[Any] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+        weights = np.array([POINT_WEIGHTS.get(p, 1.0) for p in SYNASTRY_POINTS])
+        self.pair_weights = np.outer(weights, weights)
+
+    # ============= POPULATION =============
+
+    def add_chart(self, chart_id, longitudes: Sequence[float]):
+        """Add one chart given its longitudes in SYNASTRY_POINTS order"""
+        row = np.asarray(longitudes, dtype=float)
+        if row.shape != (len(SYNASTRY_POINTS),):
+            raise ValueError(f"expected {len(SYNASTRY_POINTS)} longitudes, got {row.shape}")
+        self.chart_ids.append(chart_id)
+        self._rows.append(row)
+        self._matrix = None
+
+    def add_calculator(self, chart_id, calculator):
+        """Add one chart from an AstrologicalCalculator"""
+        self.add_chart(chart_id, chart_longitudes(calculator))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Longitude matrix of every chart held by the engine"""
+        if self._matrix is None:
+            if self._rows:
+                self._matrix = np.vstack(self._rows)
+            else:
+                self._matrix = np.empty((0, len(SYNASTRY_POINTS)))
+        return self._matrix
+
+    # ============= SCORING =============
+
+    def score_matrix(self, queries, candidates=None) -> np.ndarray:
+        """
+        Weighted compatibility scores for every query x candidate pair
+        queries: (M, points) longitudes; candidates default to the whole population
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=float))
+        candidates = self.matrix if candidates is None else np.atleast_2d(np.asarray(candidates, dtype=float))
+
+        points = len(SYNASTRY_POINTS)
+        scores = np.empty((len(queries), len(candidates)))
+        chunk = max(1, SCORING_CHUNK_CELLS // (max(1, len(queries)) * points * points))
+
+        for start in range(0, len(candidates), chunk):
+            block = candidates[start:start + chunk]
+            # (M, N, points, points) separation of every point of A against every point of B
+            separation = _separation(queries[:, None, :, None], block[None, :, None, :])
+            harmony = HARMONY_TABLE[np.rint(separation * HARMONY_TABLE_STEPS).astype(np.intp)]
+            scores[:, start:start + chunk] = np.tensordot(harmony, self.pair_weights, axes=([2, 3], [0, 1]))
+
+        return scores
+
+    def top_matches(self, query, k: int = 10, exclude: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Best K candidates for one chart, kept in a bounded min-heap so the
+        full ranking is never materialized
+        """
+        excluded = set(exclude or [])
+        matrix = self.matrix
+        points = len(SYNASTRY_POINTS)
+        chunk = max(1, SCORING_CHUNK_CELLS // (points * points))
+
+        heap: List[Tuple[float, int]] = []
+        for start in range(0, len(matrix), chunk):
+            scores = self.score_matrix(query, matrix[start:start + chunk])[0]
+            if excluded:
+                skip = [chart_id in excluded for chart_id in self.chart_ids[start:start + chunk]]
+                scores[np.array(skip, dtype=bool)] = -np.inf
+
+            # only the chunk's own top K can enter the global top K
+            if len(scores) > k:
+                candidates = np.argpartition(scores, -k)[-k:]
+            else:
+                candidates = np.arange(len(scores))
+
+            for local in candidates:
+                if np.isneginf(scores[local]):
+                    continue
+                index = start + int(local)
+                entry = (float(scores[local]), -index)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        ranked = sorted(heap, reverse=True)
+        return [{'chart_id': self.chart_ids[-neg_index], 'score': round(score, 4)}
+                for score, neg_index in ranked]
+
+    def top_matches_many(self, queries, k: int = 10) -> List[List[Dict[str, Any]]]:
+        """Top K candidates for each of several charts (N x M matching)"""
+        return [self.top_matches(row, k) for row in np.atleast_2d(np.asarray(queries, dtype=float))]
+
+    # ============= PAIR ANALYSIS =============
+
+    def cross_aspects(self, longitudes_a, longitudes_b) -> List[Dict[str, Any]]:
+        """Every aspect between the points of chart A and chart B"""
+        a = np.asarray(longitudes_a, dtype=float)
+        b = np.asarray(longitudes_b, dtype=float)
+        separation = _separation(a[:, None], b[None, :])
+
+        found = []
+        for aspect_name, (angle, orb, weight) in SYNASTRY_ASPECTS.items():
+            deviation = np.abs(separation - angle)
+            for i, j in zip(*np.nonzero(deviation <= orb)):
+                found.append({
+                    'point_a': SYNASTRY_POINTS[i],
+                    'point_b': SYNASTRY_POINTS[j],
+                    'aspect': aspect_name,
+                    'angle': float(separation[i, j]),
+                    'orb': float(deviation[i, j]),
+                    'harmony': weight
+                })
+
+        found.sort(key=lambda aspect: aspect['orb'])
+        return found
+
+    def composite_chart(self, longitudes_a, longitudes_b) -> Dict[str, Dict[str, Any]]:
+        """Composite chart: shorter-arc midpoint of each pair of like points"""
+        midpoints = _circular_midpoint(np.asarray(longitudes_a, dtype=float),
+                                       np.asarray(longitudes_b, dtype=float))
+        return {
+            name: {
+                'longitude': float(lon),
+                'sign': AstrologicalCalculator.get_zodiac_sign(lon),
+                'degree': float(lon % 30)
+            }
+            for name, lon in zip(SYNASTRY_POINTS, midpoints)
+        }
+
+    @staticmethod
+    def davison_calculator(calc_a, calc_b) -> AstrologicalCalculator:
+        """
+        Davison relationship chart: a real chart cast for the midpoint in
+        time and the geographic midpoint in space
+        """
+        julian_day = (calc_a.julian_day + calc_b.julian_day) / 2.0
+
+        # geographic midpoint via the mean of unit vectors
+        vectors = []
+        for lat, lon in ((calc_a.lat, calc_a.lon), (calc_b.lat, calc_b.lon)):
+            phi, lam = math.radians(lat), math.radians(lon)
+            vectors.append((math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)))
+        x, y, z = (sum(axis) / 2.0 for axis in zip(*vectors))
+        mid_lat = math.degrees(math.atan2(z, math.hypot(x, y)))
+        mid_lon = math.degrees(math.atan2(y, x))
+
+        year, month, day, hours = swe.revjul(julian_day)
+        seconds = int(round(hours * 3600))
+        seconds = min(seconds, 86399)
+        return AstrologicalCalculator(
+            birth_date=f"{year:04d}-{month:02d}-{day:02d}",
+            birth_time=f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}",
+            lat=mid_lat,
+            lon=mid_lon,
+            timezone_offset=0,
+            depth=calc_a.depth
+        )
+
+    def analyze_pair(self, calc_a, calc_b) -> Dict[str, Any]:
+        """Full synastry report for two charts"""
+        longitudes_a = chart_longitudes(calc_a)
+        longitudes_b = chart_longitudes(calc_b)
+        davison = self.davison_calculator(calc_a, calc_b)
+
+        return {
+            'compatibility_score': round(float(self.score_matrix(longitudes_a, longitudes_b[None, :])[0, 0]), 4),
+            'cross_aspects': self.cross_aspects(longitudes_a, longitudes_b),
+            'composite_chart': self.composite_chart(longitudes_a, longitudes_b),
+            'davison_chart': davison.generate_full_natal_chart()
+        }
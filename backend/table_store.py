@@ -0,0 +1,46 @@
+import os
+import tempfile
+import threading
+from typing import Callable, TypeVar
+import numpy as np
+
+
+T = TypeVar('T')
+
+# One lock for every lazily built table: a build is CPU-bound, so concurrent
+# first requests are better off waiting for it than running it again
+# Reentrant, since one table's build may load another (lunisolar months use the solar terms)
+_build_lock = threading.RLock()
+
+
+def save_arrays(path: str, **arrays: np.ndarray):
+    """
+    np.savez_compressed into a temporary file beside `path`, then renamed over
+    it: other processes see either the previous file or the complete new one
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.npz.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.chmod(temp_path, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_or_build(path: str, load: Callable[[str], T], build: Callable[[], T]) -> T:
+    """
+    Table loaded from `path`, or built and saved there when missing
+    Deploys build the tables ahead of time (python <module>.py), so the build
+    here is a fallback for development; concurrent callers wait for one build
+    and then load its file
+    """
+    with _build_lock:
+        if os.path.exists(path):
+            return load(path)
+        table = build()
+        table.save(path)
+        return table
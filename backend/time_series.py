@@ -0,0 +1,101 @@
+import io
+from typing import Dict, Any, Optional, Sequence
+import numpy as np
+
+from astrological_calculator import PLANET_IDS
+from ephemeris_series import body_positions, bisect_roots, boundary_crossings, wrap180
+
+
+SIGN_EDGES = np.arange(0.0, 360.0, 30.0)
+
+# point_type column: why each point is in the series
+SAMPLE = 0
+STATION = 1
+INGRESS = 2
+POINT_TYPES = ['sample', 'station', 'ingress']
+
+# bodies x samples evaluated per request, before any downsampling
+MAX_SAMPLES = 2_000_000
+
+COLUMNS = ['jd', 'longitude', 'speed', 'retrograde', 'point_type']
+
+
+def _exact_events(planet_id: int, jds: np.ndarray, lons: np.ndarray, speeds: np.ndarray):
+    """Refined JDs of stations and sign ingresses inside the sampled range"""
+    flips = np.nonzero(np.sign(speeds[1:]) != np.sign(speeds[:-1]))[0]
+    stations = bisect_roots(lambda t: body_positions(planet_id, t)[1], jds[flips], jds[flips + 1])
+
+    lo, hi, boundary, _ = boundary_crossings(lons, jds, SIGN_EDGES)
+    ingresses = bisect_roots(lambda t, b=boundary: wrap180(body_positions(planet_id, t)[0] - b), lo, hi)
+    return stations, ingresses
+
+
+class TimeSeries:
+    """
+    Longitude / speed / retrograde curves for several bodies over a date range,
+    as columns; optional downsampling keeps every station and sign ingress
+    """
+
+    def __init__(self, bodies: Sequence[str], jd_start: float, jd_end: float, step_days: float = 1.0):
+        unknown = [body for body in bodies if body not in PLANET_IDS]
+        if unknown:
+            raise ValueError(f"Unknown bodies: {unknown}")
+        if jd_end <= jd_start or step_days <= 0:
+            raise ValueError("invalid time range")
+        count = int((jd_end - jd_start) / step_days + 1e-9) + 1
+        if count * len(bodies) > MAX_SAMPLES:
+            raise ValueError(f"{count * len(bodies)} samples requested, limit is {MAX_SAMPLES}")
+
+        self.bodies = list(bodies)
+        self.jds = jd_start + np.arange(count) * step_days
+
+    def series(self, max_points: Optional[int] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Per-body columns; with max_points, a thinned uniform grid plus exact stations and ingresses"""
+        result = {}
+        for body in self.bodies:
+            planet_id = PLANET_IDS[body]
+            lons, speeds = body_positions(planet_id, self.jds)
+            if max_points is None or len(self.jds) <= max_points:
+                jds, point_type = self.jds, np.full(len(self.jds), SAMPLE, dtype=np.int8)
+            else:
+                stations, ingresses = _exact_events(planet_id, self.jds, lons, speeds)
+                # the events are always kept; whatever budget remains goes to a uniform grid
+                budget = max(max_points - len(stations) - len(ingresses), 2)
+                grid = self.jds[np.unique(np.linspace(0, len(self.jds) - 1, budget).round().astype(int))]
+                jds = np.concatenate([grid, stations, ingresses])
+                point_type = np.concatenate([np.full(len(grid), SAMPLE), np.full(len(stations), STATION),
+                                             np.full(len(ingresses), INGRESS)]).astype(np.int8)
+                order = np.argsort(jds, kind='stable')
+                jds, point_type = jds[order], point_type[order]
+                lons, speeds = body_positions(planet_id, jds)
+
+            result[body] = {
+                'jd': jds,
+                'longitude': lons,
+                'speed': speeds,
+                'retrograde': speeds < 0,
+                'point_type': point_type
+            }
+        return result
+
+    @staticmethod
+    def to_json(series: Dict[str, Dict[str, np.ndarray]], decimals: int = 6) -> Dict[str, Any]:
+        encoded = {}
+        for body, columns in series.items():
+            encoded[body] = {
+                'jd': np.round(columns['jd'], decimals).tolist(),
+                'longitude': np.round(columns['longitude'], decimals).tolist(),
+                'speed': np.round(columns['speed'], decimals).tolist(),
+                'retrograde': columns['retrograde'].tolist(),
+                'point_type': columns['point_type'].tolist()
+            }
+        return encoded
+
+    @staticmethod
+    def to_npz(series: Dict[str, Dict[str, np.ndarray]]) -> bytes:
+        """One .npy array per column, named '<body>.<column>', in a single .npz archive"""
+        arrays = {f"{body}.{name}": columns[name] for body, columns in series.items() for name in COLUMNS}
+        arrays['point_types'] = np.array(POINT_TYPES)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
@@ -0,0 +1,186 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import swisseph as swe
+
+from astrological_calculator import PLANET_IDS, calc_body
+from advanced_timing import vimshottari_mahadashas, LAHIRI_AYANAMSA, NAKSHATRA_SPAN
+from ephemeris_series import body_positions
+
+
+# Samples across the local birth day (every 10 minutes, both midnights included)
+DAY_SAMPLES = 145
+
+ENVELOPE_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn',
+                   'uranus', 'neptune', 'pluto', 'north_node']
+
+TRANSIT_BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn',
+                  'uranus', 'neptune', 'pluto']
+TRANSIT_ASPECTS = {'conjunction': (0, 8), 'opposition': (180, 8), 'square': (90, 8),
+                   'trine': (120, 8), 'sextile': (60, 6)}
+
+# Same table as AstrologicalCalculator.critical_degree_analysis, by sign index
+CRITICAL_DEGREES = {
+    'cardinal': [0, 13, 26],
+    'fixed': [8, 9, 21, 22],
+    'mutable': [4, 17]
+}
+MODALITIES = ['cardinal', 'fixed', 'mutable']
+CRITICAL_ORB = 1.0
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+CERTAIN = 'certain'
+POSSIBLE = 'possible'
+IMPOSSIBLE = 'impossible'
+
+
+def classify_arc(arc_start: float, arc_width: float, low: float, high: float) -> str:
+    """
+    Compare a body's possible-longitude arc [arc_start, arc_start + arc_width]
+    with a target interval [low, high] (both may wrap past 360)
+    """
+    width = high - low if high >= low else (high - low) % 360.0
+    offset = (arc_start - low) % 360.0
+    if offset + arc_width <= width:
+        return CERTAIN
+    # overlap: arc starts inside the target, or the target starts inside the arc
+    if offset <= width or (low - arc_start) % 360.0 <= arc_width:
+        return POSSIBLE
+    return IMPOSSIBLE
+
+
+def _combine(statuses: List[str]) -> str:
+    """Status of "any of these targets": certain beats possible beats impossible"""
+    if CERTAIN in statuses:
+        return CERTAIN
+    if POSSIBLE in statuses:
+        return POSSIBLE
+    return IMPOSSIBLE
+
+
+class BirthDayEnvelope:
+    """
+    Time-unknown mode: where each body could have been across the local birth day
+    Positions for every body are sampled in one batched pass; hits are then
+    reported as certain / possible / impossible by interval overlap
+    """
+
+    def __init__(self, birth_date: str, lat: float, lon: float, timezone_offset: float = -5):
+        self.birth_date = birth_date
+        self.lat = lat
+        self.lon = lon
+        self.tz_offset = timezone_offset
+
+        local_midnight = datetime.strptime(birth_date, "%Y-%m-%d")
+        ut_midnight = local_midnight - timedelta(hours=timezone_offset)
+        jd_start = swe.julday(ut_midnight.year, ut_midnight.month, ut_midnight.day,
+                              ut_midnight.hour + ut_midnight.minute / 60)
+        self.birth_datetime = local_midnight
+        self.jds = jd_start + np.linspace(0.0, 1.0, DAY_SAMPLES)
+
+        self.samples = {}
+        self.envelopes = {}
+        for name in ENVELOPE_BODIES:
+            lons, _ = body_positions(PLANET_IDS[name], self.jds)
+            self.samples[name] = lons
+            unwrapped = np.degrees(np.unwrap(np.radians(lons)))
+            low, high = unwrapped.min(), unwrapped.max()
+            self.envelopes[name] = {
+                'min_longitude': float(low % 360.0),
+                'max_longitude': float(high % 360.0),
+                'range': float(high - low),
+                'noon_longitude': float(lons[DAY_SAMPLES // 2]),
+                'signs': sorted({SIGNS[int(lon // 30)] for lon in lons}, key=SIGNS.index)
+            }
+
+    def _arc(self, name: str) -> Tuple[float, float]:
+        envelope = self.envelopes[name]
+        return envelope['min_longitude'], envelope['range']
+
+    # ============= TRANSITS =============
+
+    def transits(self, target_date: str) -> List[Dict[str, Any]]:
+        """Transits to the natal envelopes, each labelled certain or possible"""
+        target_dt = datetime.strptime(target_date, "%Y-%m-%d")
+        target_jd = swe.julday(target_dt.year, target_dt.month, target_dt.day, 12)
+
+        hits = []
+        for transit_name in TRANSIT_BODIES:
+            transit_lon = calc_body(target_jd, PLANET_IDS[transit_name])[0]
+            for natal_name in ENVELOPE_BODIES:
+                arc_start, arc_width = self._arc(natal_name)
+                for aspect, (angle, orb) in TRANSIT_ASPECTS.items():
+                    # natal longitudes that make this aspect: transit ± angle, within orb
+                    statuses = [classify_arc(arc_start, arc_width, target - orb, target + orb)
+                                for target in {(transit_lon + angle) % 360.0, (transit_lon - angle) % 360.0}]
+                    status = _combine(statuses)
+                    if status != IMPOSSIBLE:
+                        hits.append({
+                            'transiting': transit_name,
+                            'natal': natal_name,
+                            'aspect': aspect,
+                            'certainty': status,
+                            'date': target_date
+                        })
+        return hits
+
+    # ============= CRITICAL DEGREES =============
+
+    def critical_degrees(self) -> List[Dict[str, Any]]:
+        """Critical-degree placements by interval overlap with the day's envelope"""
+        results = []
+        for name in ENVELOPE_BODIES:
+            arc_start, arc_width = self._arc(name)
+            for sign_index, sign in enumerate(SIGNS):
+                for crit_deg in CRITICAL_DEGREES[MODALITIES[sign_index % 3]]:
+                    # within the sign only, as in critical_degree_analysis
+                    low = sign_index * 30 + max(crit_deg - CRITICAL_ORB, 0)
+                    high = sign_index * 30 + min(crit_deg + CRITICAL_ORB, 30)
+                    status = classify_arc(arc_start, arc_width, low, high)
+                    if status != IMPOSSIBLE:
+                        results.append({
+                            'planet': name,
+                            'sign': sign,
+                            'critical_degree': crit_deg,
+                            'certainty': status
+                        })
+        return results
+
+    # ============= DASHA =============
+
+    def vimshottari(self, current_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Mahadasha at current_date for every Moon position across the birth day
+        Shares are fractions of the day, since the Moon moves almost uniformly
+        """
+        current = datetime.strptime(current_date, "%Y-%m-%d") if current_date else datetime.now()
+        moon = self.samples['moon']
+        nakshatras = (((moon - LAHIRI_AYANAMSA) % 360.0) // NAKSHATRA_SPAN).astype(int)
+
+        rulers = []
+        for moon_lon in moon:
+            dashas = vimshottari_mahadashas(float(moon_lon), self.birth_datetime, current + timedelta(days=1))
+            rulers.append(next((d['mahadasha'] for d in dashas if d['start'] <= current < d['end']), None))
+
+        counts = Counter(rulers)
+        candidates = [{'mahadasha': ruler, 'share': count / len(rulers)}
+                      for ruler, count in counts.most_common()]
+        return {
+            'date': current.strftime("%Y-%m-%d"),
+            'certainty': CERTAIN if len(counts) == 1 else POSSIBLE,
+            'mahadasha_candidates': candidates,
+            'birth_nakshatras': sorted({int(n) + 1 for n in nakshatras})
+        }
+
+    def report(self, target_date: Optional[str] = None) -> Dict[str, Any]:
+        target_date = target_date or datetime.now().strftime("%Y-%m-%d")
+        return {
+            'envelopes': self.envelopes,
+            'transits': self.transits(target_date),
+            'critical_degrees': self.critical_degrees(),
+            'vimshottari': self.vimshottari(target_date),
+            'target_date': target_date
+        }
@@ -219,6 +219,7 @@ export const FullBirthInput: React.FC<FullBirthInputProps> = ({ onBirthDataSubmi
             onChange={(e) => setDepth(e.target.value)}
             className="input-field"
           >
+            <option value="Quick">Quick</option>
             <option value="Standard">Standard</option>
             <option value="Advanced">Advanced</option>
             <option value="All systems (Deep Dive)">All systems (Deep Dive)</option>
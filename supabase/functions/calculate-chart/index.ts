@@ -83,24 +83,37 @@ Deno.serve(async (req) => {
       tz: birthData.birth_timezone || null,
     };
 
-    // Fetch planetary positions
+    // Fetch planetary positions in one batched request
     const planets = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto", "Chiron"];
     const planetaryData: Record<string, any> = {};
 
-    for (const planet of planets) {
-      try {
-        const response = await fetch(`${ASTRO_API_URL}/planet/${planet}`, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(when),
-        });
-
-        if (response.ok) {
-          planetaryData[planet] = await response.json();
+    try {
+      const response = await fetch(`${ASTRO_API_URL}/positions`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ bodies: planets, times: [when] }),
+      });
+
+      if (response.ok) {
+        const { jd, bodies, missing } = await response.json();
+        for (const planet of planets) {
+          const columns = bodies[planet.toUpperCase()];
+          if (!columns) {
+            console.error(`No ephemeris coverage for ${planet}:`, missing[planet.toUpperCase()]);
+            continue;
+          }
+          planetaryData[planet] = {
+            jd: jd[0],
+            name: planet.toUpperCase(),
+            lon: columns.lon[0],
+            lat: columns.lat[0],
+            dist: columns.dist[0],
+            speed_lon: columns.speed_lon[0],
+          };
         }
-      } catch (error) {
-        console.error(`Error fetching ${planet}:`, error);
       }
+    } catch (error) {
+      console.error("Error fetching planetary positions:", error);
     }
 
     // Calculate houses (simplified - would need more complex calc)
@@ -10,8 +10,9 @@ const corsHeaders = {
 };
 
 interface EphemerisRequest {
-  endpoint: string; // "planet/Chiron" or "asteroid/1"
-  when: {
+  endpoint: string; // "planet/Chiron", "asteroid/1" or "positions"
+  body?: Record<string, unknown>; // request body for "positions" (bodies, times or start/end/step_hours)
+  when?: {
     year: number;
     month: number;
     day: number;
@@ -27,9 +28,9 @@ Deno.serve(async (req) => {
   }
 
   try {
-    const { endpoint, when }: EphemerisRequest = await req.json();
+    const { endpoint, when, body }: EphemerisRequest = await req.json();
 
-    if (!endpoint || !when) {
+    if (!endpoint || !(when || body)) {
       return new Response(
         JSON.stringify({ error: "Missing endpoint or when parameter" }),
         { status: 400, headers: { ...corsHeaders, "Content-Type": "application/json" } }
@@ -43,7 +44,7 @@ Deno.serve(async (req) => {
     const response = await fetch(url, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify(when),
+      body: JSON.stringify(body ?? when),
     });
 
     if (!response.ok) {
@@ -0,0 +1,21 @@
+-- Nightly forecast precomputation (backend/forecast_job.py)
+-- Checkpoints let an interrupted run resume after the last finished batch
+
+CREATE TABLE public.forecast_job_runs (
+    run_id TEXT PRIMARY KEY,
+    last_birth_data_id TEXT,
+    horizon_days INTEGER NOT NULL,
+    records_done INTEGER DEFAULT 0,
+    completed BOOLEAN DEFAULT false,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Job bookkeeping only: RLS with no policies hides it from the anon and
+-- authenticated roles; the job connects with a role that bypasses RLS
+ALTER TABLE public.forecast_job_runs ENABLE ROW LEVEL SECURITY;
+
+-- Incremental runs look up the latest stored forecast day per record
+CREATE INDEX idx_chart_snapshots_forecast
+    ON public.chart_snapshots(birth_data_id, chart_type, calculation_date);
+
+COMMENT ON TABLE public.forecast_job_runs IS 'Progress checkpoints of the nightly forecast precomputation job';